@@ -23,12 +23,17 @@ bl_info = {
 # ------------------------------------------------------------------------
 
 
-import bpy
 import os
 import sys
 
 from importlib import reload
 
+try:
+    import bpy
+except ImportError:
+    # Without Blender (e.g. in worker processes or tests) only the NumPy core (roadGen.core) can be imported
+    bpy = None
+
 
 # Make sure imports work even when main folder is named differently
 if __name__ != "roadGen":
@@ -45,58 +50,100 @@ if dir not in sys.path:
     sys.path.append(dir)
 
 
-from roadGen.generators import crossroad_generator, data_generator, geometry_generator, kerb_generator, road_generator, road_net_generator
-from roadGen.utils import collection_management, curve_management, mesh_management
-
-reload(collection_management)
-reload(curve_management)
-reload(mesh_management)
-reload(crossroad_generator)
-reload(data_generator)
-reload(geometry_generator)
-reload(kerb_generator)
-reload(road_generator)
-reload(road_net_generator)
-
-from roadGen.operators import RG_CreateAll, RG_DeleteAll
-
-
-# ------------------------------------------------------------------------
-#    Panel in Object Mode
-# ------------------------------------------------------------------------
-
-
-class RG_RoadPanel(bpy.types.Panel):
-    bl_label = "Road Generation"
-    bl_idname = "roadGen_road_panel"
-    bl_space_type = "VIEW_3D"
-    bl_region_type = "UI"
-    bl_category = "RoadGen"
-    bl_context = "objectmode"
-
-    def draw(self, context):
-        layout = self.layout
-        layout.operator("rg.create_all")
-        layout.operator("rg.delete_all")
-
-
-# ------------------------------------------------------------------------
-#    Registration of Operators and Panel
-# ------------------------------------------------------------------------
-
-
-classes = (
-    RG_CreateAll,
-    RG_DeleteAll,
-    RG_RoadPanel
-)
-
-
-def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
-
-
-def unregister():
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
+# Everything else needs Blender
+if bpy is not None:
+    from roadGen.core import bezier, geometry, junction, lane, lot, spline
+    from roadGen.generators import crossroad_generator, data_generator, geometry_generator, kerb_generator, road_generator, road_net_generator
+    from roadGen.utils import (
+        bezier_management, centreline_management, collection_management, curve_management, intersection_management,
+        mesh_management, polygon_management, profile_management, regeneration_management)
+
+    reload(geometry)
+    reload(bezier)
+    reload(spline)
+    reload(junction)
+    reload(lane)
+    reload(lot)
+    reload(profile_management)
+    reload(bezier_management)
+    reload(centreline_management)
+    reload(collection_management)
+    reload(curve_management)
+    reload(regeneration_management)
+    reload(polygon_management)
+    reload(mesh_management)
+    reload(intersection_management)
+    reload(crossroad_generator)
+    reload(data_generator)
+    reload(geometry_generator)
+    reload(kerb_generator)
+    reload(road_generator)
+    reload(road_net_generator)
+
+    from roadGen.operators import RG_CreateAll, RG_DeleteAll, RG_ExportProfile, RG_UpdateAll
+    from roadGen.utils.profile_management import get_last_profiler
+
+
+    # ------------------------------------------------------------------------
+    #    Panel in Object Mode
+    # ------------------------------------------------------------------------
+
+
+    class RG_RoadPanel(bpy.types.Panel):
+        bl_label = "Road Generation"
+        bl_idname = "roadGen_road_panel"
+        bl_space_type = "VIEW_3D"
+        bl_region_type = "UI"
+        bl_category = "RoadGen"
+        bl_context = "objectmode"
+
+        def draw(self, context):
+            layout = self.layout
+            layout.prop(context.scene, "rg_instanced_furniture")
+            layout.operator("rg.create_all")
+            layout.operator("rg.update_all")
+            layout.operator("rg.delete_all")
+
+            # Show the summary of the measured stages, roads and crossroads of the last generation
+            profiler = get_last_profiler()
+
+            if profiler is not None:
+                box = layout.box()
+                box.label(text="Last Generation")
+
+                for line in profiler.get_summary():
+                    box.label(text=line)
+
+                box.operator("rg.export_profile")
+
+
+    # ------------------------------------------------------------------------
+    #    Registration of Operators and Panel
+    # ------------------------------------------------------------------------
+
+
+    classes = (
+        RG_CreateAll,
+        RG_UpdateAll,
+        RG_DeleteAll,
+        RG_ExportProfile,
+        RG_RoadPanel
+    )
+
+
+    def register():
+        for cls in classes:
+            bpy.utils.register_class(cls)
+
+        bpy.types.Scene.rg_instanced_furniture = bpy.props.BoolProperty(
+            name="Instanced Furniture",
+            description="Add the road furniture as one point cloud per object that instances the templates "
+                        "instead of one empty per object",
+            default=False)
+
+
+    def unregister():
+        del bpy.types.Scene.rg_instanced_furniture
+
+        for cls in reversed(classes):
+            bpy.utils.unregister_class(cls)
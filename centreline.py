@@ -0,0 +1,139 @@
+import numpy as np
+
+from roadGen.core.geometry import normalize
+
+
+class RG_Centreline:
+    def __init__(self, vertices: np.ndarray, vertex_tangents: np.ndarray = None, distances: np.ndarray = None):
+        # The (global) vertices of the polyline along the curve, the tangents of its segments and at its vertices
+        # and the cumulative distances of the vertices (only calculated if they are not known from the evaluation)
+        self.vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+
+        segments = np.diff(self.vertices, axis=0)
+
+        if distances is None:
+            self.segment_lengths = np.linalg.norm(segments, axis=1)
+            self.distances = np.concatenate([[0.0], np.cumsum(self.segment_lengths)])
+        else:
+            self.distances = np.asarray(distances, dtype=np.float64)
+            self.segment_lengths = np.diff(self.distances)
+
+        self.length = float(self.distances[-1])
+        self.tangents = calculate_tangents(segments, self.segment_lengths)
+
+        if vertex_tangents is None:
+            self.vertex_tangents = calculate_vertex_tangents(self.tangents)
+        else:
+            self.vertex_tangents = np.asarray(vertex_tangents, dtype=np.float64).reshape(-1, 3)
+
+    def deform(self, coordinates):
+        # Bend coordinates along the centreline like a Curve modifier (x is the distance along the centreline,
+        # y the distance to its left and z the height), beyond its ends the centreline is extended linearly
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 3)
+        distances = coordinates[:, 0]
+        tangents = self.smooth_tangents_at(distances)
+        overshoots = distances - np.clip(distances, 0.0, self.length)
+        points = self.points_at(distances) + tangents * overshoots[:, np.newaxis]
+
+        normals = np.stack([-tangents[:, 1], tangents[:, 0], np.zeros(len(tangents))], axis=1)
+        normal_lengths = np.linalg.norm(normals, axis=1)
+        normals[normal_lengths > 0.0] /= normal_lengths[normal_lengths > 0.0, np.newaxis]
+
+        return points + normals * coordinates[:, 1:2] + np.array([0.0, 0.0, 1.0]) * coordinates[:, 2:3]
+
+    def locate(self, distances):
+        # Find for each distance the index of its segment (binary search) and the distance within this segment
+        distances = np.clip(np.asarray(distances, dtype=np.float64), 0.0, self.length)
+        segments_number = max(len(self.segment_lengths), 1)
+        indices = np.clip(np.searchsorted(self.distances, distances, side="right") - 1, 0, segments_number - 1)
+
+        return indices, distances - self.distances[indices]
+
+    def normals_at(self, distances):
+        # The (horizontal) normals point to the left of the tangents
+        tangents = self.tangents_at(distances)
+
+        return np.stack([-tangents[..., 1], tangents[..., 0], np.zeros(tangents.shape[:-1])], axis=-1)
+
+    def points_at(self, distances):
+        if len(self.tangents) == 0:
+            return np.repeat(self.vertices[:1], np.size(distances), axis=0).reshape(np.shape(distances) + (3,))
+
+        indices, remaining_distances = self.locate(distances)
+
+        return self.vertices[indices] + self.tangents[indices] * remaining_distances[..., np.newaxis]
+
+    def project(self, points, vertex_indices):
+        # Project the points onto the two segments around their (nearest) vertices of the centreline
+        # and return the distances of the closest projections along the centreline
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+        if len(self.tangents) == 0:
+            return np.zeros(len(points))
+
+        segment_indices = np.stack([np.asarray(vertex_indices) - 1, np.asarray(vertex_indices)], axis=1)
+        segment_indices = np.clip(segment_indices, 0, len(self.segment_lengths) - 1)
+        vectors = points[:, np.newaxis] - self.vertices[segment_indices]
+        tangents = self.tangents[segment_indices]
+
+        remaining_distances = np.clip(np.sum(vectors * tangents, axis=2), 0.0, self.segment_lengths[segment_indices])
+        squared_distances = np.sum((vectors - tangents * remaining_distances[..., np.newaxis]) ** 2, axis=2)
+        closest = np.argmin(squared_distances, axis=1)
+        rows = np.arange(len(points))
+
+        return self.distances[segment_indices[rows, closest]] + remaining_distances[rows, closest]
+
+    def smooth_tangents_at(self, distances):
+        # Interpolate the tangents between the vertices to avoid kinks (e.g. for deformed meshes)
+        if len(self.tangents) == 0:
+            return np.zeros(np.shape(distances) + (3,))
+
+        indices, remaining_distances = self.locate(distances)
+        segment_lengths = self.segment_lengths[indices]
+        factors = np.divide(
+            remaining_distances, segment_lengths, out=np.zeros_like(remaining_distances), where=segment_lengths > 0.0)
+        factors = factors[..., np.newaxis]
+
+        return normalize(self.vertex_tangents[indices] * (1.0 - factors) + self.vertex_tangents[indices + 1] * factors)
+
+    def tangents_at(self, distances):
+        if len(self.tangents) == 0:
+            return np.zeros(np.shape(distances) + (3,))
+
+        indices, _ = self.locate(distances)
+
+        return self.tangents[indices]
+
+    def transform(self, rotation: np.ndarray, translation: np.ndarray):
+        # Return a rotated and moved copy of the centreline (its distances stay the same)
+        return RG_Centreline(
+            self.vertices @ rotation.T + translation, self.vertex_tangents @ rotation.T, self.distances)
+
+
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def calculate_tangents(segments: np.ndarray, segment_lengths: np.ndarray):
+    tangents = np.zeros_like(segments)
+    non_zero = segment_lengths > 0.0
+    tangents[non_zero] = segments[non_zero] / segment_lengths[non_zero, np.newaxis]
+
+    # Use the tangent of the previous segment (or the next one at the begin) for segments without a length
+    if not non_zero.all() and non_zero.any():
+        indices = np.where(non_zero, np.arange(len(segments)), 0)
+        np.maximum.accumulate(indices, out=indices)
+        indices[:np.argmax(non_zero)] = np.argmax(non_zero)
+        tangents = tangents[indices]
+
+    return tangents
+
+
+def calculate_vertex_tangents(tangents: np.ndarray):
+    # Average the tangents of the segments around each vertex
+    if len(tangents) == 0:
+        return np.zeros((1, 3))
+
+    return normalize(np.concatenate([tangents[:1], tangents[:-1] + tangents[1:], tangents[-1:]]))
+
@@ -0,0 +1,66 @@
+import numpy as np
+
+from roadGen.core.geometry import normalize
+
+
+def evaluate_bezier_splines(
+        points: np.ndarray, handles_left: np.ndarray, handles_right: np.ndarray, point_counts: np.ndarray,
+        cyclic: np.ndarray = None, resolution: int = 32):
+    # Evaluate many bezier splines (whose points and handles are packed one after the other) at once
+    # like Blender does it (with the same number of uniform steps for each segment between two bezier points)
+    point_counts = np.asarray(point_counts, dtype=np.int64)
+    cyclic = np.zeros(len(point_counts), dtype=bool) if cyclic is None else np.asarray(cyclic, dtype=bool)
+    point_starts = np.concatenate([[0], np.cumsum(point_counts)[:-1]]).astype(np.int64)
+
+    # Find the start and end point of each segment (cyclic splines have an additional segment to their first point)
+    segment_counts = np.where(cyclic, point_counts, np.maximum(point_counts - 1, 0))
+    spline_indices = np.repeat(np.arange(len(point_counts)), segment_counts)
+    segment_indices = np.arange(segment_counts.sum()) - np.repeat(np.cumsum(segment_counts) - segment_counts, segment_counts)
+    starts = point_starts[spline_indices] + segment_indices
+    ends = point_starts[spline_indices] + (segment_indices + 1) % np.maximum(point_counts[spline_indices], 1)
+
+    p0, p1, p2, p3 = points[starts], handles_right[starts], handles_left[ends], points[ends]
+
+    # Calculate the positions and derivatives of all segments for all steps (without the end of the segments)
+    t = (np.arange(resolution) / resolution)[np.newaxis, :, np.newaxis]
+    s = 1.0 - t
+    p0, p1, p2, p3 = (p[:, np.newaxis] for p in (p0, p1, p2, p3))
+    positions = s ** 3 * p0 + 3 * s ** 2 * t * p1 + 3 * s * t ** 2 * p2 + t ** 3 * p3
+    derivatives = 3 * (s ** 2 * (p1 - p0) + 2 * s * t * (p2 - p1) + t ** 2 * (p3 - p2))
+
+    # Add the last point of each open spline (the end of its last segment)
+    last_points = point_starts + point_counts - 1
+    is_open = ~cyclic & (point_counts > 0)
+    insert_indices = np.cumsum(segment_counts)[is_open] * resolution
+    end_derivatives = 3 * (points[last_points] - handles_left[last_points])
+
+    positions = np.insert(positions.reshape(-1, 3), insert_indices, points[last_points][is_open], axis=0)
+    derivatives = np.insert(derivatives.reshape(-1, 3), insert_indices, end_derivatives[is_open], axis=0)
+    sample_counts = segment_counts * resolution + is_open
+
+    # Calculate the unit tangents (along the samples if a handle lies on its point),
+    # the (horizontal) normals to their left and the distances along each spline
+    has_no_derivative = np.linalg.norm(derivatives, axis=1) == 0.0
+
+    if has_no_derivative.any() and len(positions) > 1:
+        derivatives[has_no_derivative] = np.gradient(positions, axis=0)[has_no_derivative]
+
+    tangents = normalize(derivatives)
+    normals = normalize(np.stack([-tangents[:, 1], tangents[:, 0], np.zeros(len(tangents))], axis=1))
+    distances = calculate_cumulative_distances(positions, sample_counts)
+
+    return positions, tangents, normals, distances, sample_counts
+
+
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def calculate_cumulative_distances(positions: np.ndarray, sample_counts: np.ndarray):
+    # Sum up the distances between the samples but start again at 0 for each spline
+    segment_lengths = np.linalg.norm(np.diff(positions, axis=0), axis=1)
+    distances = np.concatenate([[0.0], np.cumsum(segment_lengths)])[:len(positions)]
+    spline_starts = np.repeat(np.cumsum(sample_counts) - sample_counts, sample_counts)
+
+    return distances - distances[spline_starts] if len(positions) else distances
@@ -0,0 +1,288 @@
+import math
+import numpy as np
+
+
+def calculate_segment_intersections(starts: np.ndarray, ends: np.ndarray, pairs: np.ndarray, threshold: float = 1e-12):
+    # Calculate the 2D intersections of all pairs of segments at once (parallel segments do not intersect),
+    # the intersections are returned in 3D (with z = 0) like the intersections of mathutils
+    p, r = starts[pairs[:, 0], :2], ends[pairs[:, 0], :2] - starts[pairs[:, 0], :2]
+    q, s = starts[pairs[:, 1], :2], ends[pairs[:, 1], :2] - starts[pairs[:, 1], :2]
+
+    denominators = cross(r, s)
+    is_parallel = np.abs(denominators) <= threshold
+    denominators[is_parallel] = 1.0
+
+    t = cross(q - p, s) / denominators
+    u = cross(q - p, r) / denominators
+
+    is_intersecting = ~is_parallel & (t >= 0.0) & (t <= 1.0) & (u >= 0.0) & (u <= 1.0)
+    intersections = np.zeros((len(pairs), 3))
+    intersections[:, :2] = p + t[:, np.newaxis] * r
+
+    return is_intersecting, intersections
+
+
+def get_candidate_box_pairs(minimums: np.ndarray, maximums: np.ndarray):
+    # Find all pairs of overlapping axis-aligned bounding boxes (with 2 or 3 axes) by sorting them along the axis
+    # with the larger extent of all boxes (sweep and prune), so that e.g. vertical polylines are not sorted along
+    # their short side (empty boxes with infinite minimums and negative infinite maximums never overlap)
+    minimums = np.asarray(minimums, dtype=np.float64)
+    maximums = np.asarray(maximums, dtype=np.float64)
+    is_valid = np.all(minimums <= maximums, axis=1)
+
+    if not is_valid.any():
+        return np.empty((0, 2), dtype=np.int64)
+
+    extents = maximums[is_valid].max(axis=0) - minimums[is_valid].min(axis=0)
+    axis = int(np.argmax(extents))
+    order = np.argsort(minimums[:, axis], kind="stable")
+
+    # Each box is paired with all boxes that start after it along the sweep axis but before it ends
+    stops = np.searchsorted(minimums[order, axis], maximums[order, axis], side="right")
+    counts = np.maximum(stops - np.arange(1, len(order) + 1), 0)
+
+    # Use a uniform grid instead if the boxes overlap too often along the sweep axis (e.g. along a diagonal line)
+    if counts.sum() > 8 * len(order) + 64:
+        first, second = get_candidate_box_pairs_in_grid(minimums, maximums, np.flatnonzero(is_valid))
+    else:
+        first_positions = np.repeat(np.arange(len(order)), counts)
+        second_positions = get_range_positions(np.arange(1, len(order) + 1), counts)
+        first, second = order[first_positions], order[second_positions]
+
+    # Keep only the pairs whose boxes overlap along all axes
+    is_overlapping = np.all((minimums[first] <= maximums[second]) & (minimums[second] <= maximums[first]), axis=1)
+    first, second = first[is_overlapping], second[is_overlapping]
+
+    return np.stack([np.minimum(first, second), np.maximum(first, second)], axis=1)
+
+
+def get_candidate_segment_pairs(starts: np.ndarray, ends: np.ndarray):
+    # Find all pairs of segments with overlapping (horizontal) bounding boxes
+    return get_candidate_box_pairs(np.minimum(starts[:, :2], ends[:, :2]), np.maximum(starts[:, :2], ends[:, :2]))
+
+
+def get_closest_point_indices(points: np.ndarray, query_points: np.ndarray, number: int, cell_size: float):
+    # Find the indices of the closest points of each query point with a grid (spatial hash) of the horizontal positions
+    # of the points, so that each query point is only compared with the points in its and its neighbouring cells
+    # (query points whose closest points are not all closer than the cell size are compared with all points)
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    query_points = np.asarray(query_points, dtype=np.float64).reshape(-1, 3)
+    number = min(number, len(points))
+
+    if number == 0 or len(query_points) == 0:
+        return np.empty((len(query_points), number), dtype=np.int64)
+
+    cells = np.floor(points[:, :2] / cell_size).astype(np.int64)
+    query_cells = np.floor(query_points[:, :2] / cell_size).astype(np.int64)
+    all_cells = np.concatenate([cells, query_cells])
+    origin = all_cells.min(axis=0) - 1
+    span = all_cells[:, 1].max() - origin[1] + 2
+
+    keys = get_cell_keys(cells, origin, span)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    # Get the ranges of the sorted points in the 3 x 3 cells around each query point
+    offsets = np.array([(x, y) for x in (-1, 0, 1) for y in (-1, 0, 1)])
+    neighbour_keys = get_cell_keys((query_cells[:, np.newaxis] + offsets).reshape(-1, 2), origin, span)
+    starts = np.searchsorted(sorted_keys, neighbour_keys, side="left")
+    counts = np.searchsorted(sorted_keys, neighbour_keys, side="right") - starts
+
+    query_indices = np.repeat(np.repeat(np.arange(len(query_points)), len(offsets)), counts)
+    positions = get_range_positions(starts, counts)
+    candidates = order[positions]
+    distances = np.linalg.norm(points[candidates] - query_points[query_indices], axis=1)
+
+    # Keep the closest candidates of each query point
+    sorted_candidates = np.lexsort((distances, query_indices))
+    sorted_query_indices = query_indices[sorted_candidates]
+    ranks = np.arange(len(sorted_candidates)) - np.searchsorted(sorted_query_indices, sorted_query_indices, side="left")
+    is_closest = ranks < number
+    closest_indices = np.full((len(query_points), number), -1, dtype=np.int64)
+    closest_distances = np.full((len(query_points), number), np.inf)
+    closest_indices[sorted_query_indices[is_closest], ranks[is_closest]] = candidates[sorted_candidates[is_closest]]
+    closest_distances[sorted_query_indices[is_closest], ranks[is_closest]] = distances[sorted_candidates[is_closest]]
+
+    # A closer point outside of the neighbouring cells is only possible if a candidate is farther than the cell size
+    is_uncertain = (closest_distances > cell_size).any(axis=1)
+
+    if is_uncertain.any():
+        all_distances = np.linalg.norm(query_points[is_uncertain][:, np.newaxis] - points[np.newaxis], axis=2)
+        indices = np.argpartition(all_distances, number - 1, axis=1)[:, :number]
+        indices_order = np.argsort(np.take_along_axis(all_distances, indices, axis=1), axis=1)
+        closest_indices[is_uncertain] = np.take_along_axis(indices, indices_order, axis=1)
+
+    return closest_indices
+
+
+def get_distinct_point_indices(points: np.ndarray, threshold: float):
+    # Keep only one point per cell of a grid (spatial hash) of the horizontal positions of the points
+    # and remove also the points that are closer than the threshold to the kept point of a previous neighbouring cell
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+    if len(points) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    cells = np.floor(points[:, :2] / threshold).astype(np.int64)
+    _, indices = np.unique(cells, axis=0, return_index=True)
+    indices = np.sort(indices)
+
+    cells = cells[indices]
+    origin = cells.min(axis=0) - 1
+    span = cells[:, 1].max() - origin[1] + 2
+    keys = get_cell_keys(cells, origin, span)
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+    is_kept = np.ones(len(indices), dtype=bool)
+
+    for offset in [(-1, -1), (-1, 0), (-1, 1), (0, -1)]:
+        neighbour_keys = get_cell_keys(cells + offset, origin, span)
+        positions = np.minimum(np.searchsorted(sorted_keys, neighbour_keys), len(sorted_keys) - 1)
+        has_neighbour = sorted_keys[positions] == neighbour_keys
+        neighbours = indices[order[positions]]
+        distances = np.linalg.norm(points[indices, :2] - points[neighbours, :2], axis=1)
+        is_kept &= ~(has_neighbour & (distances < threshold))
+
+    return indices[is_kept]
+
+
+def get_intersection_with_circle(
+        first_point: np.ndarray, second_point: np.ndarray, circle_midpoint: np.ndarray, circle_radius: float):
+    vec = np.asarray(second_point, dtype=np.float64)[:2] - np.asarray(first_point, dtype=np.float64)[:2]
+    offset = np.asarray(first_point, dtype=np.float64)[:2] - np.asarray(circle_midpoint, dtype=np.float64)[:2]
+
+    # Coefficients of the quadratic equation for intersection calculation
+    A = vec @ vec
+    B = 2 * (vec @ offset)
+    C = offset @ offset - circle_radius**2
+    discriminant = B**2 - 4 * A * C
+
+    # There are two intersections of a vector with a circle (also with t = (-B - sqrt_discriminant) / (2 * A))
+    # but only the first is relevant
+    sqrt_discriminant = math.sqrt(discriminant)
+    t = (-B + sqrt_discriminant) / (2 * A)
+
+    return np.array((first_point[0] + t * vec[0], first_point[1] + t * vec[1], 0.0))
+
+
+def get_polyline_intersections(points: np.ndarray, other_starts: np.ndarray = None, other_ends: np.ndarray = None):
+    # Find all intersections between the segments of a polyline (without neighbouring segments)
+    # and between its segments and other segments in one sweep, the indices of the other segments
+    # follow the indices of the segments of the polyline (segment i goes from point i to point i + 1)
+    segments_number = max(len(points) - 1, 0)
+    starts, ends = points[:segments_number], points[1:segments_number + 1]
+
+    if other_starts is not None:
+        starts = np.concatenate([starts, np.asarray(other_starts, dtype=np.float64).reshape(-1, 3)])
+        ends = np.concatenate([ends, np.asarray(other_ends, dtype=np.float64).reshape(-1, 3)])
+
+    pairs = get_candidate_segment_pairs(starts, ends)
+
+    # Other segments are never neighbours of the segments of the polyline
+    is_neighbour = (pairs[:, 1] - pairs[:, 0] < 2) & (pairs[:, 1] < segments_number)
+    pairs = pairs[~is_neighbour]
+
+    is_intersecting, intersections = calculate_segment_intersections(starts, ends, pairs)
+    pairs, intersections = pairs[is_intersecting], intersections[is_intersecting]
+
+    # Sort the intersections by their segments
+    order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+
+    return pairs[order], intersections[order]
+
+
+def get_rotation_matrix(angle: float):
+    # The 3x3 matrix of a rotation around the z-axis
+    cos, sin = math.cos(angle), math.sin(angle)
+
+    return np.array(((cos, -sin, 0.0), (sin, cos, 0.0), (0.0, 0.0, 1.0)))
+
+
+def normalize(vectors: np.ndarray):
+    # Normalize the vectors along the last axis (vectors without a length stay zero vectors)
+    vectors = np.asarray(vectors, dtype=np.float64)
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0.0)
+
+
+def remove_points_from_polyline_intersections(
+        points: np.ndarray, segment_pairs: np.ndarray, intersections: np.ndarray, index_before: int, removed_number: int):
+    # Update the self-intersections of a polyline after removing the points behind the passed index (the points are
+    # the remaining points) without searching all of them again: the segments of the removed points are removed,
+    # the following segments are moved and only the new segment over the gap is checked against all other segments
+    last_removed_segment_index = index_before + removed_number
+    is_kept = ~((segment_pairs >= index_before) & (segment_pairs <= last_removed_segment_index)).any(axis=1)
+    segment_pairs = segment_pairs[is_kept]
+    segment_pairs = np.where(segment_pairs > last_removed_segment_index, segment_pairs - removed_number, segment_pairs)
+    intersections = intersections[is_kept]
+
+    # The new segment is not checked against itself and its neighbouring segments
+    other_segment_indices = np.arange(max(len(points) - 1, 0))
+    other_segment_indices = other_segment_indices[np.abs(other_segment_indices - index_before) >= 2]
+    new_pairs = np.stack([np.minimum(other_segment_indices, index_before),
+                          np.maximum(other_segment_indices, index_before)], axis=1)
+
+    is_intersecting, new_intersections = calculate_segment_intersections(points[:-1], points[1:], new_pairs)
+    segment_pairs = np.concatenate([segment_pairs, new_pairs[is_intersecting]])
+    intersections = np.concatenate([intersections, new_intersections[is_intersecting]])
+
+    # Sort the intersections by their segments
+    order = np.lexsort((segment_pairs[:, 1], segment_pairs[:, 0]))
+
+    return segment_pairs[order], intersections[order]
+
+
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def cross(a: np.ndarray, b: np.ndarray):
+    return a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+
+
+def get_candidate_box_pairs_in_grid(minimums: np.ndarray, maximums: np.ndarray, indices: np.ndarray):
+    # Pair the boxes that share a cell of a uniform grid (of the first two axes) with about one box per cell
+    sizes = (maximums[indices, :2] - minimums[indices, :2]).max(axis=1)
+    origin = minimums[indices, :2].min(axis=0)
+    area = np.prod(np.maximum(maximums[indices, :2].max(axis=0) - origin, 1e-9))
+    cell_size = max(float(np.median(sizes)), math.sqrt(area / len(indices)), 1e-9)
+
+    # Add an entry for each cell that a box covers
+    first_cells = np.floor((minimums[indices, :2] - origin) / cell_size).astype(np.int64)
+    last_cells = np.floor((maximums[indices, :2] - origin) / cell_size).astype(np.int64)
+    widths = last_cells - first_cells + 1
+    counts = widths[:, 0] * widths[:, 1]
+    entries = np.repeat(np.arange(len(indices)), counts)
+    local_indices = get_range_positions(np.zeros(len(indices), dtype=np.int64), counts)
+    cells = first_cells[entries] + np.stack(
+        [local_indices // widths[entries, 1], local_indices % widths[entries, 1]], axis=1)
+    keys = get_cell_keys(cells, np.zeros(2, dtype=np.int64), int(last_cells[:, 1].max()) + 1)
+
+    # Pair each entry with the following entries of its cell
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    stops = np.searchsorted(sorted_keys, sorted_keys, side="right")
+    pair_counts = stops - np.arange(1, len(order) + 1)
+    first_positions = np.repeat(np.arange(len(order)), pair_counts)
+    second_positions = get_range_positions(np.arange(1, len(order) + 1), pair_counts)
+
+    # Boxes that share more than one cell are paired only once
+    first, second = indices[entries[order[first_positions]]], indices[entries[order[second_positions]]]
+    pair_keys = np.unique(np.minimum(first, second) * len(minimums) + np.maximum(first, second))
+
+    return pair_keys // len(minimums), pair_keys % len(minimums)
+
+
+def get_cell_keys(cells: np.ndarray, origin: np.ndarray, span: int):
+    # Encode the (2D) cells of a grid as one integer (the cells must not be smaller than the origin
+    # and their second index must be smaller than the origin plus the span)
+    return (cells[:, 0] - origin[0]) * span + (cells[:, 1] - origin[1])
+
+
+def get_range_positions(starts: np.ndarray, counts: np.ndarray):
+    # Get the consecutive positions of all ranges (each range begins at its start and has its count of positions)
+    counts = np.asarray(counts, dtype=np.int64)
+
+    return np.repeat(starts, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
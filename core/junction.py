@@ -0,0 +1,56 @@
+import numpy as np
+
+from roadGen.core.geometry import get_rotation_matrix
+
+
+def calculate_crossroad_curve_handles(points: np.ndarray, directions: np.ndarray):
+    # Both handles of each end point of a crossroad curve lie in the direction of its road curve
+    # (in a distance dependent on the distance between both end points)
+    points = np.asarray(points, dtype=np.float64)
+    distance = np.linalg.norm(points[1] - points[0])
+
+    return points + distance / 2 * np.asarray(directions, dtype=np.float64)
+
+
+def calculate_crossroad_signature(
+        side_curve_names: list, points: np.ndarray, directions: np.ndarray, centre: np.ndarray, template_names: tuple):
+    # Describe the outer points of the crossroad and the directions of its curves there (relative to the crossroad point)
+    # and whether the next point belongs to the same curve
+    vectors = np.asarray(points, dtype=np.float64) - centre
+    directions = np.asarray(directions, dtype=np.float64)
+    points_number = len(vectors)
+    same_curves = [is_same_curve(side_curve_names[i], side_curve_names[j]) for i, j in get_neighbour_indices(points_number)]
+
+    # Rotate the crossroad so that each of the points is once the first one on the x-axis
+    # and take the smallest description as signature (it is the same for rotated crossroads)
+    signatures = []
+
+    for start_index in range(points_number):
+        angle = float(np.arctan2(vectors[start_index, 1], vectors[start_index, 0]))
+        rotation = get_rotation_matrix(-angle)
+        indices = np.roll(np.arange(points_number), -start_index)
+        description = np.round(np.column_stack([vectors[indices] @ rotation.T, directions[indices] @ rotation.T]), 3) + 0.0
+        signature = tuple((*row, same_curves[i]) for row, i in zip(description.tolist(), indices))
+        signatures.append((signature, start_index, angle))
+
+    signature, start_index, angle = min(signatures, key=lambda item: item[0])
+
+    return (template_names, signature), start_index, angle
+
+
+def get_neighbour_indices(points_number: int):
+    # Get the indices of all pairs of neighbouring points (the last point is the neighbour of the first one)
+    return [(i, (i + 1) % points_number) for i in range(points_number)]
+
+
+def is_same_curve(side_curve_name_0: str, side_curve_name_1: str):
+    # Check whether both side curves belong to the same (original) curve
+    return side_curve_name_0.rpartition('_')[0] == side_curve_name_1.rpartition('_')[0]
+
+
+def sort_outer_points(side_curve_names: list, points: list, centre: np.ndarray):
+    # Sort the outer points of the side curves once (counter-clockwise) by their angles around the crossroad point
+    vectors = np.array([tuple(point) for point in points], dtype=np.float64) - np.asarray(centre, dtype=np.float64)
+    order = np.argsort(np.arctan2(vectors[:, 1], vectors[:, 0]), kind="stable")
+
+    return [side_curve_names[i] for i in order], [points[i] for i in order]
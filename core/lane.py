@@ -0,0 +1,225 @@
+import math
+import numpy as np
+
+from roadGen.core.geometry import get_polyline_intersections, normalize, remove_points_from_polyline_intersections
+from roadGen.core.spline import RG_Spline
+
+
+def calculate_offset_spline(
+        original: RG_Spline, turning_lane_distance: float, lane_width: float, lane_number: int, reverse: bool):
+    points_number = len(original.points)
+
+    # "widening" means the part of the turning lane that is evenly widened until the turning lane is as wide as a road lane
+    first_widening_index = None
+    last_widening_index = None
+    widening_distance = 10
+
+    # The order in which the points are walked along (the right side is walked backwards/reversed)
+    order = np.arange(points_number)[::-1] if reverse else np.arange(points_number)
+
+    # The length along the points up to the next point for each point in this order (the last point has no next point)
+    vector_lengths = np.linalg.norm(np.diff(original.points[order], axis=0), axis=1)
+    lengths = np.cumsum(vector_lengths)
+    total_curve_length = float(vector_lengths.sum())
+
+    # Calculate the offsets of all points at once
+    offsets = np.full(points_number, float(lane_width * lane_number))
+
+    if turning_lane_distance == 0:
+        # No turning lane
+        pass
+    elif total_curve_length < turning_lane_distance + widening_distance:
+        # Turning lane for the whole curve if the curve is smaller than a turning lane with widening
+        offsets[:] = lane_width * (lane_number + 1)
+    else:
+        # Calculate the offsets of the turning lane and of the widening (depending on the position in the widening)
+        is_turning_lane = (lengths < turning_lane_distance) | (lengths - vector_lengths < turning_lane_distance)
+        is_widening = ~is_turning_lane & (lengths < turning_lane_distance + widening_distance)
+        interpolation_factors = (lengths - turning_lane_distance) / widening_distance
+
+        offsets[:-1] = np.where(
+            is_turning_lane, lane_width * (lane_number + 1),
+            np.where(is_widening, lane_width * (lane_number + 1) - interpolation_factors * lane_width,
+                     lane_width * lane_number))
+
+        # Remember only the first indices of the widening
+        widening_starts = np.flatnonzero(lengths >= turning_lane_distance)
+
+        if len(widening_starts):
+            last_widening_position = widening_starts[0]
+            last_widening_index = int(order[last_widening_position])
+            widening_ends = np.flatnonzero(
+                lengths[last_widening_position + 1:] >= turning_lane_distance + widening_distance)
+
+            if len(widening_ends):
+                first_widening_index = int(order[last_widening_position + 1 + widening_ends[0]])
+
+    # Remember the indices of "sharp" vertices (i.e. the angle between the handle vectors of a vertex is smaller then 135°)
+    left_vecs = original.handles_left - original.points
+    right_vecs = original.handles_right - original.points
+    vec_lengths = np.linalg.norm(left_vecs, axis=1) * np.linalg.norm(right_vecs, axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        angles = np.arccos(np.clip(np.einsum("ij,ij->i", left_vecs, right_vecs) / vec_lengths, -1.0, 1.0))
+
+    is_sharp = (vec_lengths > 0.0) & (angles < math.radians(135))
+    sharp_vertex_indices = [int(i) for i in order if is_sharp[i]]
+
+    # Shift each bezier point and its handles orthogonal to its handle (left and right sides have the same order as original)
+    vecs = normalize(left_vecs if reverse else right_vecs)
+    shifts = np.stack([-vecs[:, 1], vecs[:, 0], np.zeros(points_number)], axis=1)
+    shifts[order] *= offsets[:, np.newaxis]
+
+    return original.shift(shifts), first_widening_index, last_widening_index, sharp_vertex_indices
+
+
+def calculate_side_spline(
+        original: RG_Spline, turning_lane_distance: float, lane_width: float, lane_number: int, reverse: bool):
+    # Calculate the final points of the side curve of a road lane (with the handle types that Blender has to apply)
+    # Calculate the shifted points and handles of all bezier points at once
+    spline, first_widening_index, last_widening_index, sharp_vertex_indices = calculate_offset_spline(
+        original, turning_lane_distance, lane_width, lane_number, reverse)
+
+    # All changes below are made on the spline (a handle type of None keeps the default type)
+    spline.handle_left_types = [None] * len(spline.points)
+    spline.handle_right_types = [None] * len(spline.points)
+
+    end = original.points[-1]
+    last_vec = original.handles_left[-1] - end if reverse else original.handles_right[-1] - end
+
+    end_shift_offset = lane_width * lane_number + 15.0
+    road_lane_end = get_road_lane_end(end, last_vec, end_shift_offset, reverse)
+
+    # Find all self-intersections of the shifted points and their intersections with the road lane end in one sweep
+    segment_pairs, intersections = get_polyline_intersections(spline.points, *road_lane_end)
+
+    intersection_at_end, last_intersection_index = get_intersection_at_end_with_point_index(
+        spline.points, segment_pairs, intersections)
+
+    # Cut the curve at the intersection with the future road lane end (if there is one)
+    if intersection_at_end is not None:
+        spline = spline.select(np.arange(last_intersection_index + 1))
+        spline.handle_left_types = ['AUTO'] * len(spline.points)
+        spline.handle_right_types = ['AUTO'] * len(spline.points)
+
+        # The new last point gets handles in the direction of the original last handle
+        end_vec = -last_vec if reverse else last_vec
+        spline = spline.append(
+            intersection_at_end, intersection_at_end - end_vec, intersection_at_end + end_vec, 'FREE', 'FREE')
+
+    # Delete the unnecessary points if there are points between the begin and the end point of widening
+    if (first_widening_index and
+            (last_widening_index or last_widening_index == 0) and
+            abs(last_widening_index - first_widening_index) > 1):
+        # Keep only points that are not part of the widening
+        indices = np.arange(len(spline.points))
+        is_not_part_of_widening = ((indices <= first_widening_index) | (indices >= last_widening_index) if reverse
+                                   else (indices >= first_widening_index) | (indices <= last_widening_index))
+        spline = spline.select(np.flatnonzero(is_not_part_of_widening))
+        new_points_number = len(spline.points)
+
+        # Update the handles of the new points (only the last point keeps its handles at an intersection)
+        automatic_number = new_points_number - 1 if intersection_at_end is not None else new_points_number
+        spline.handle_left_types[:automatic_number] = ['AUTO'] * automatic_number
+        spline.handle_right_types[:automatic_number] = ['AUTO'] * automatic_number
+
+        # Change only the type of the correct handle
+        correct_index = first_widening_index if reverse else last_widening_index
+
+        if correct_index < new_points_number:
+            spline.handle_left_types[correct_index] = 'VECTOR'
+        if correct_index + 1 < new_points_number:
+            spline.handle_right_types[correct_index + 1] = 'VECTOR'
+
+    # The self-intersections have to be found again only if points were removed
+    if len(spline.points) != len(original.points) or intersection_at_end is not None:
+        segment_pairs, intersections = get_polyline_intersections(spline.points)
+
+    # Find the self-intersection of the current curve (if there is one) and correct its points
+    for start_index in sharp_vertex_indices:
+        point_indices = get_bezier_point_indices_in_distance(spline.points, start_index, lane_width * lane_number)
+
+        self_intersection, index_before_self_intersection, number_of_points_to_remove = get_self_intersection(
+            segment_pairs, intersections, point_indices)
+
+        if self_intersection is not None:
+            # Remove the points of the loop but keep the points, handles and handle types of all other points
+            indices = np.arange(len(spline.points) - number_of_points_to_remove)
+            spline = spline.select(
+                np.where(indices <= index_before_self_intersection, indices, indices + number_of_points_to_remove))
+            segment_pairs, intersections = remove_points_from_polyline_intersections(
+                spline.points, segment_pairs, intersections, index_before_self_intersection, number_of_points_to_remove)
+        else:
+            # Update the same points on the other side (the side without a self-intersection) to obtain a smoother curve
+            for i in point_indices:
+                spline.handle_left_types[i] = 'AUTO'
+                spline.handle_right_types[i] = 'AUTO'
+
+    return spline
+
+
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def get_bezier_point_indices_in_distance(points: np.ndarray, start_index: int, distance: float):
+    points_number = len(points)
+
+    # Find the first point after the start point whose distance (along the points) is larger than the distance
+    lengths = np.cumsum(np.linalg.norm(np.diff(points[start_index:], axis=0), axis=1))
+    end_index = start_index + min(int(np.searchsorted(lengths, distance, side="right")) + 1, len(lengths))
+
+    if start_index >= points_number - 1:
+        end_index = 0
+
+    start = start_index - (end_index - start_index) if start_index - (end_index - start_index) >= 0 else 0
+    stop = end_index + 1 if end_index + 1 <= points_number else points_number
+
+    return [i for i in range(start, stop)]
+
+
+def get_intersection_at_end_with_point_index(points: np.ndarray, segment_pairs: np.ndarray, intersections: np.ndarray):
+    # The road lane end is the segment after the segments of the points
+    is_at_end = segment_pairs[:, 1] == len(points) - 1
+    point_indices = segment_pairs[is_at_end, 0]
+    intersections = intersections[is_at_end]
+
+    # It is only a correct intersection if the intersection found is not at (or very close to) the points of its segment
+    threshold = 0.0001
+    is_correct = ((np.linalg.norm(points[point_indices] - intersections, axis=1) > threshold) &
+                  (np.linalg.norm(points[point_indices + 1] - intersections, axis=1) > threshold))
+
+    if not is_correct.any():
+        return None, 0
+
+    # Take the last intersection along the points
+    last = np.flatnonzero(is_correct)[np.argmax(point_indices[is_correct])]
+
+    return intersections[last], int(point_indices[last])
+
+
+def get_road_lane_end(end: np.ndarray, last_vec: np.ndarray, end_shift_offset: float, reverse: bool):
+    last_orthogonal_vector = (np.array((-last_vec[1], last_vec[0], 0.0)) if reverse
+                              else np.array((last_vec[1], -last_vec[0], 0.0)))
+
+    # Find another point (far enough) to check if there is an intersection between the current curve and the road lane end
+    end_shift = last_orthogonal_vector / max(np.linalg.norm(last_orthogonal_vector), 1e-12) * end_shift_offset
+
+    return end, end + end_shift
+
+
+def get_self_intersection(segment_pairs: np.ndarray, intersections: np.ndarray, point_indices: list):
+    if len(point_indices) < 2:
+        return None, None, None
+
+    # Take the first intersection (the pairs are sorted by their segments) of two segments between the points
+    is_between_points = (segment_pairs[:, 0] >= point_indices[0]) & (segment_pairs[:, 1] < point_indices[-1])
+
+    if not is_between_points.any():
+        return None, None, None
+
+    first = np.flatnonzero(is_between_points)[0]
+    segment_index, other_segment_index = segment_pairs[first]
+
+    return intersections[first], int(segment_index), int(other_segment_index - segment_index)
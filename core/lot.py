@@ -0,0 +1,65 @@
+import numpy as np
+
+from dataclasses import dataclass
+
+
+@dataclass
+class RG_LotStep:
+    # A side curve along a lot and the crossroad curve to the next side curve (if there is one)
+    road_name: str
+    side: str
+    crossroad_curve_name: str = None
+
+
+def remove_close_vertices(vertices: list, threshold: float = 0.01):
+    # Keep only the vertices that are not too close to their next vertex (the last vertex is always removed)
+    vertices = np.array([tuple(vertex) for vertex in vertices], dtype=np.float64).reshape(-1, 3)
+    distances = np.linalg.norm(np.diff(vertices, axis=0), axis=1)
+
+    return vertices[:-1][distances > threshold]
+
+
+def sort_vertex_indices(indices: np.ndarray, coordinates: np.ndarray, direction: np.ndarray):
+    # Sort the indices by the dot products of their vertices with the reference direction vector
+    dot_products = coordinates[indices] @ np.array(direction)
+
+    return indices[np.argsort(dot_products, kind="stable")]
+
+
+def walk_lot(start_road_name: str, side: str, right_neighbours: dict, road_names):
+    # Find the roads that belong to a lot (a closed area between roads), beginning at the passed start road,
+    # by always following the right neighbour of the current side curve (the right neighbours are side curve names
+    # by the road names and sides of the side curves)
+    lot_road_names = {"Left": [], "Right": []}
+    steps = []
+    road_name = start_road_name
+
+    while True:
+        right_neighbour = right_neighbours.get((road_name, side))
+        step = RG_LotStep(road_name, side)
+        steps.append(step)
+
+        if right_neighbour and road_name not in lot_road_names[side]:
+            lot_road_names[side].append(road_name)
+            road_name_of_right_neighbour = right_neighbour.rpartition('_')[0]
+
+            if road_name_of_right_neighbour in road_names:
+                # Continue for the crossroad if there is a next right neighbour
+                step.crossroad_curve_name = f"Crossroad_Curve_{road_name}_{side}_{right_neighbour}"
+                road_name = road_name_of_right_neighbour
+
+                if road_name == start_road_name:
+                    # Break if we reached the start road
+                    break
+
+                side = "Left" if "Left" in right_neighbour else "Right"
+        else:
+            # Break if there is no right neighbour or if we reached a already visited road
+            break
+
+    # Only return the found roads and steps if the start road has been reached again
+    # and more than 2 roads belong to the lot
+    if road_name == start_road_name and len(lot_road_names["Left"]) + len(lot_road_names["Right"]) > 2:
+        return lot_road_names, steps
+
+    return None, None
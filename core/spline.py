@@ -0,0 +1,59 @@
+import numpy as np
+
+from dataclasses import dataclass, field
+
+
+@dataclass(eq=False)
+class RG_Spline:
+    # The points and handles of a bezier spline as arrays (a handle type of None keeps the default type)
+    points: np.ndarray = field(default_factory=lambda: np.empty((0, 3)))
+    handles_left: np.ndarray = field(default_factory=lambda: np.empty((0, 3)))
+    handles_right: np.ndarray = field(default_factory=lambda: np.empty((0, 3)))
+    handle_left_types: list = None
+    handle_right_types: list = None
+    cyclic: bool = False
+
+    def append(self, point: np.ndarray, handle_left: np.ndarray, handle_right: np.ndarray,
+               handle_left_type: str = None, handle_right_type: str = None):
+        # Return a copy of the spline with an additional point at its end
+        spline = self.select(np.arange(len(self.points)))
+        spline.points = np.concatenate([spline.points, [point]])
+        spline.handles_left = np.concatenate([spline.handles_left, [handle_left]])
+        spline.handles_right = np.concatenate([spline.handles_right, [handle_right]])
+
+        if spline.handle_left_types is not None or handle_left_type is not None or handle_right_type is not None:
+            spline.handle_left_types = (spline.handle_left_types or [None] * len(self.points)) + [handle_left_type]
+            spline.handle_right_types = (spline.handle_right_types or [None] * len(self.points)) + [handle_right_type]
+
+        return spline
+
+    def select(self, indices: np.ndarray):
+        # Return a copy of the spline with only the points (and their handles and handle types) at the indices
+        spline = type(self)()
+        spline.points = self.points[indices]
+        spline.handles_left = self.handles_left[indices]
+        spline.handles_right = self.handles_right[indices]
+        spline.cyclic = self.cyclic
+
+        if self.handle_left_types is not None:
+            spline.handle_left_types = [self.handle_left_types[i] for i in indices]
+            spline.handle_right_types = [self.handle_right_types[i] for i in indices]
+
+        return spline
+
+    def shift(self, shifts: np.ndarray):
+        # Return a copy of the spline with each point moved together with its handles
+        spline = self.select(np.arange(len(self.points)))
+        spline.points = self.points + shifts
+        spline.handles_left = self.handles_left + shifts
+        spline.handles_right = self.handles_right + shifts
+
+        return spline
+
+    def transform(self, matrix: np.ndarray):
+        # Return a copy of the spline with all points and handles transformed by a 4x4 matrix
+        spline = self.select(np.arange(len(self.points)))
+        spline.points, spline.handles_left, spline.handles_right = (
+            vectors @ matrix[:3, :3].T + matrix[:3, 3] for vectors in (self.points, self.handles_left, self.handles_right))
+
+        return spline
@@ -0,0 +1,47 @@
+import bpy
+import numpy as np
+
+from mathutils import Vector
+
+
+class RG_FurnitureTemplate:
+    def __init__(self, collection: bpy.types.Collection):
+        self.collection = collection
+        self.name = collection.name
+
+        # Read the global vertices of all meshes of the template collection once
+        translations = []
+        vertices = []
+
+        for obj in collection.objects:
+            if obj.type == 'MESH':
+                m = np.array(obj.matrix_world)
+                coordinates = np.empty(len(obj.data.vertices) * 3, dtype=np.float64)
+                obj.data.vertices.foreach_get("co", coordinates)
+
+                translations.append(m[:3, 3])
+                vertices.append(coordinates.reshape(-1, 3) @ m[:3, :3].T + m[:3, 3])
+
+        # The directions to the object furthest away from the origin (by its location or by its furthest vertex),
+        # e.g. the arm of a street lamp
+        self.direction = get_furthest_translation(translations, [np.linalg.norm(t) for t in translations])
+        self.direction_by_vertex = get_furthest_translation(
+            translations, [np.linalg.norm(v[:, :2], axis=1).max(initial=0.0) for v in vertices])
+
+    def get_direction(self, by_vertex: bool = False):
+        direction = self.direction_by_vertex if by_vertex else self.direction
+
+        return direction.copy() if direction else None
+
+
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def get_furthest_translation(translations: list, distances: list):
+    # Get the translation with the largest distance (the first one if there are several, None if all are 0)
+    if not distances or max(distances) <= 0.0:
+        return None
+
+    return Vector(translations[int(np.argmax(distances))])
@@ -8,6 +8,7 @@ from mathutils import Vector
 from roadGen.generators.geometry_generator import RG_GeometryGenerator
 from roadGen.utils.collection_management import link_to_collection
 from roadGen.utils.mesh_management import apply_transform
+from roadGen.utils.regeneration_management import tag_objects_like
 
 
 class RG_BuildingGenerator(RG_GeometryGenerator):
@@ -33,6 +34,7 @@ class RG_BuildingGenerator(RG_GeometryGenerator):
 
             # Link the new object to its collection and append it to the class list
             link_to_collection(new_building_obj, "Buildings")
+            tag_objects_like([new_building_obj], building_area)
             self.buildings.append(new_building_obj)
 
             # Write the BMesh data to the new mesh
@@ -1,146 +1,171 @@
 import bpy
+import numpy as np
 
 from mathutils import Vector
 
+from roadGen.core.geometry import get_rotation_matrix
+from roadGen.core.junction import (
+    calculate_crossroad_curve_handles, calculate_crossroad_signature, get_neighbour_indices, is_same_curve,
+    sort_outer_points)
 from roadGen.generators.geometry_generator import RG_GeometryGenerator
+from roadGen.generators.kerb_generator import RG_KerbGenerator
+from roadGen.generators.sidewalk_generator import RG_SidewalkGenerator
+from roadGen.utils.centreline_management import add_centreline, add_centrelines, get_centreline
 from roadGen.utils.curve_management import get_closest_curve_point, get_closest_point
 from roadGen.utils.collection_management import link_to_collection
-from roadGen.utils.mesh_management import create_mesh_from_vertices, curve_to_mesh, set_origin
+from roadGen.utils.mesh_management import copy_object_with_transform, create_mesh_from_vertices, set_origin
+from roadGen.utils.regeneration_management import tag_object, tag_objects_like
 
 
 class RG_CrossroadGenerator(RG_GeometryGenerator):
-    def __init__(self):
+    def __init__(self, kerb_generator: RG_KerbGenerator = None, sidewalk_generator: RG_SidewalkGenerator = None):
         self.crossroads = {}
+        self.kerb_generator = kerb_generator
+        self.sidewalk_generator = sidewalk_generator
+
+        # Generated crossroads by their signature (repeated crossroads are copied and moved instead of generated again)
+        self.junctions = {}
+        self.copied_crossroads_number = 0
 
     def add_geometry(self, curves: list, crossroad_point: bpy.types.Object):
-        crossroad_mesh, crossroad_curves = add_crossroad(curves, crossroad_point)
-        self.crossroads[crossroad_mesh.name] = crossroad_curves
+        side_curve_names, points = get_sorted_outer_points(curves, crossroad_point)
+        signature, start_index, angle = get_crossroad_signature(
+            side_curve_names, points, crossroad_point, self.get_template_names())
+        junction = self.junctions.get(signature)
+        curve_names = {curve.name for curve in curves}
+
+        if junction:
+            crossroad_mesh, crossroad_curves = self.add_junction_copy(
+                junction, side_curve_names, start_index, angle, crossroad_point, curve_names)
+            self.copied_crossroads_number += 1
+        else:
+            crossroad_mesh, crossroad_curves = add_crossroad(side_curve_names, points, crossroad_point)
 
+            # Remember for all generated objects of the crossroad that they depend on all its curves
+            tag_object(crossroad_mesh, curve_names)
 
-# ------------------------------------------------------------------------
-#    Helper Methods
-# ------------------------------------------------------------------------
+            for crossroad_curve in crossroad_curves:
+                tag_object(crossroad_curve, curve_names)
 
+            self.add_kerbs_and_sidewalks(crossroad_curves)
 
-def add_crossroad(curves: list, crossroad_point: bpy.types.Object, height: float = 0.1):
-    road_vertices = {}
-    vertices_to_remove = []
+            # Only crossroads whose sidewalks are one mesh can be copied
+            if not self.sidewalk_generator or self.sidewalk_generator.segmented:
+                curve_indices = [
+                    index_0 for index_0, index_1 in get_neighbour_indices(len(points))
+                    if not is_same_curve(side_curve_names[index_0], side_curve_names[index_1])]
 
-    # Mark one point as a reference for sorting the vertices
-    reference_point = crossroad_point.location
+                self.junctions[signature] = {
+                    "angle": angle,
+                    "centre": get_centre(crossroad_point),
+                    "crossroad_curves": list(zip(curve_indices, crossroad_curves)),
+                    "crossroad_mesh": crossroad_mesh,
+                    "points_number": len(points),
+                    "start_index": start_index}
 
-    for curve in curves:
-        outer_vertices = []
+        self.crossroads[crossroad_mesh.name] = crossroad_curves
 
-        # Get the outer vertices of the side curves of a curve
-        for side in ["Left", "Right"]:
-            side_curve = bpy.data.objects.get(f"{curve.name}_{side}")
-            point_co = get_closest_curve_point(side_curve, reference_point, True)
-            outer_vertices.append(point_co)
+    def add_junction_copy(
+            self, junction: dict, side_curve_names: list, start_index: int, angle: float,
+            crossroad_point: bpy.types.Object, curve_names: set):
+        # Calculate the rigid transformation (rotation around the z-axis and translation) from the cached crossroad
+        rotation = get_rotation_matrix(angle - junction["angle"])
+        translation = get_centre(crossroad_point) - rotation @ junction["centre"]
+        points_number = junction["points_number"]
 
-            # Add the vertex and its curve to a dictionary
-            road_vertices[side_curve.name] = point_co
+        crossroad_mesh = copy_object_with_transform(
+            junction["crossroad_mesh"], f"Crossroad_{crossroad_point.name}", rotation, translation, "Crossroads")
+        tag_object(crossroad_mesh, curve_names)
 
-            # Update the reference point to the correct side curve point (the "right" one) for the first curve
-            if reference_point == crossroad_point.location:
-                left_first_point = side_curve.matrix_world @ side_curve.data.splines[0].bezier_points[0].co
-                right_first_point = side_curve.matrix_world @ side_curve.data.splines[0].bezier_points[-1].co
+        crossroad_curves = []
 
-                if side == "Left" and point_co == left_first_point or side == "Right" and point_co == right_first_point:
-                    reference_point = point_co
+        for cached_index, cached_curve in junction["crossroad_curves"]:
+            # Find the side curves of this crossroad that correspond to the side curves of the cached crossroad curve
+            index = (cached_index - junction["start_index"] + start_index) % points_number
+            name = f"Crossroad_Curve_{side_curve_names[index]}_{side_curve_names[(index + 1) % points_number]}"
 
-        # Sort the vertices (clockwise) with respect to the reference point
-        vertex = get_closest_point([outer_vertices[0], outer_vertices[1]], reference_point)
-        other_vertex = outer_vertices[0] if vertex == outer_vertices[1] else outer_vertices[1]
-        outer_vertices = [vertex, other_vertex]
+            crossroad_curve = copy_object_with_transform(cached_curve, name, rotation, translation, "Crossroad Curves")
+            tag_object(crossroad_curve, curve_names)
+            crossroad_curves.append(crossroad_curve)
 
-        # Add the ordered vertices to a list to work through them one after the other
-        vertices_to_remove.extend(outer_vertices)
+            # Move the already evaluated centreline as well
+            add_centreline(name, get_centreline(cached_curve.name).transform(rotation, translation))
 
-        # Update the reference point for the other curves
-        if reference_point != crossroad_point.location and reference_point not in outer_vertices:
-            reference_point = other_vertex
+            # Copy the kerb and the sidewalk of the crossroad curve
+            copied_objects = []
 
-    # Check whether the first two vertices are in the correct order; if not, swap them
-    vertex = get_closest_point([vertices_to_remove[0], vertices_to_remove[1]], vertices_to_remove[2])
+            for prefix, collection_name in [("Kerb", "Kerbs"), ("Sidewalk", "Sidewalks")]:
+                cached_object = bpy.data.objects.get(f"{prefix}_{cached_curve.name}")
 
-    if vertex != vertices_to_remove[1]:
-        v = vertices_to_remove[1]
-        vertices_to_remove[1] = vertices_to_remove[0]
-        vertices_to_remove[0] = v
+                if cached_object:
+                    copied_objects.append(copy_object_with_transform(
+                        cached_object, f"{prefix}_{name}", rotation, translation, collection_name))
 
-    crossroad_curves = []
-    vertices = []
-    first_vertex = None
-    number_of_vertices = len(vertices_to_remove)
+            tag_objects_like(copied_objects, crossroad_curve)
 
-    # Convert the dictionary keys and values into lists
-    curves_list = list(road_vertices.keys())
-    vertices_list = [value for value in road_vertices.values()]
+            if self.sidewalk_generator and bpy.data.objects.get(f"Sidewalk_{name}"):
+                if name not in self.sidewalk_generator.sidewalks:
+                    self.sidewalk_generator.sidewalks[name] = []
+                self.sidewalk_generator.sidewalks[name].append(f"Sidewalk_{name}")
 
-    # Iterate over all vertices and collect the vertices for the crossroad plane
-    # Assumption: All vertices are in the correct order
-    for i in range(number_of_vertices):
-        vertex_0 = vertices_to_remove[0]
+        return crossroad_mesh, crossroad_curves
 
-        # Remember the first vertex in order to connect the remaining (last) vertex to it
-        if i == 0:
-            first_vertex = vertex_0
+    def add_kerbs_and_sidewalks(self, crossroad_curves: list):
+        for crossroad_curve in crossroad_curves:
+            if self.kerb_generator:
+                self.kerb_generator.add_geometry(curve=crossroad_curve)
+            if self.sidewalk_generator:
+                self.sidewalk_generator.add_geometry(curve=crossroad_curve)
 
-        if i < number_of_vertices - 1:
-            vertex_1 = vertices_to_remove[1]
-        else:
-            vertex_1 = first_vertex
+    def get_template_names(self):
+        # The crossroads can only be copied if their kerbs and sidewalks are made of the same templates
+        kerb_template = self.kerb_generator.mesh_template if self.kerb_generator else None
+        sidewalk_template = self.sidewalk_generator.mesh_template if self.sidewalk_generator else None
+        offset = self.sidewalk_generator.offset if self.sidewalk_generator else 0.0
+
+        return (
+            kerb_template.name if kerb_template else "",
+            sidewalk_template.name if sidewalk_template else "",
+            round(offset, 3))
 
-        # Get the correct curves depending on the current vertices
-        position_0 = vertices_list.index(vertex_0)
-        position_1 = vertices_list.index(vertex_1)
-        curve_0 = curves_list[position_0]
-        curve_1 = curves_list[position_1]
 
-        if curve_0.rpartition('_')[0] != curve_1.rpartition('_')[0]:
-            # Add a curve between two different curves
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def add_crossroad(side_curve_names: list, points: list, crossroad_point: bpy.types.Object, height: float = 0.1):
+    crossroad_curves = []
+    vertices = []
+
+    # Iterate over all pairs of neighbouring vertices and collect the vertices for the crossroad plane
+    for index_0, index_1 in get_neighbour_indices(len(points)):
+        curve_0, curve_1 = side_curve_names[index_0], side_curve_names[index_1]
+        vertex_0, vertex_1 = points[index_0], points[index_1]
+
+        if not is_same_curve(curve_0, curve_1):
+            # Add a curve between two different curves (the second one is the right neighbour of the first one)
             crossroad_curve = add_crossroad_curve([curve_0, curve_1], [vertex_0, vertex_1], crossroad_point.location)
             crossroad_curves.append(crossroad_curve)
 
-            line_mesh = bpy.data.objects.get(f"Line_Mesh_Crossroad_Curve_{curve_0}_{curve_1}")
-            m = line_mesh.matrix_world
-
-            # Add all vertices of the created line mesh to the crossroad vertices
-            for vertex in line_mesh.data.vertices:
-                vertex_vec = m @ Vector((vertex.co.x, vertex.co.y, 0.0))
-                vertices.append(vertex_vec)
+            # Add the vertices of the centreline of the created crossroad curve to the crossroad vertices
+            # (without its last vertex, which is the first vertex of the next pair)
+            vertices.extend(get_centreline(crossroad_curve.name).vertices[:-1])
         else:
-            vertex_vec = Vector((vertex_0.x, vertex_0.y, 0.0))
-            vertices.append(vertex_vec)
+            vertices.append(vertex_0)
 
-        # Remove the closest vertex from the list
-        vertex_to_remove = vertex_0
-        vertices_to_remove.remove(vertex_to_remove)
+    # Create the crossroad as a flat, triangulated slab
+    vertices = np.array([tuple(vertex) for vertex in vertices])
+    vertices[:, 2] = 0.0
 
-    crossroad_mesh = create_mesh_from_vertices(vertices, "Crossroad", f"{crossroad_point.name}", height)
+    crossroad_mesh = create_mesh_from_vertices(vertices, "Crossroad", f"{crossroad_point.name}", height, triangulate=True)
 
     return crossroad_mesh, crossroad_curves
 
 
 def add_crossroad_curve(curve_names: list, points: list, crossroad_point: Vector):
-    direction_unit_vectors = []
-    for curve_name in curve_names:
-        road_curve = bpy.data.objects.get(curve_name)
-        curve_point = get_closest_curve_point(road_curve, crossroad_point)
-
-        # Find the closest handle of the curve point with respect to the crossing point
-        left_handle = curve_point.handle_left + road_curve.location
-        right_handle = curve_point.handle_right + road_curve.location
-        closest_handle = get_closest_point([left_handle, right_handle], crossroad_point)
-
-        # Calculate the direction of the curve point and its handle as unit vector
-        # for later calculation of the start/end point of the crossroad curve
-        direction = closest_handle - (curve_point.co + road_curve.location)
-        direction.normalize()
-
-        # Append the normalized direction vector to the list
-        direction_unit_vectors.append(direction)
+    # Get the directions of the curves at the points for later calculation of the start/end point of the crossroad curve
+    direction_unit_vectors = [get_end_direction(curve_name, crossroad_point) for curve_name in curve_names]
 
     # Create a new curve and change its curve type to 3D and increase its resolution
     crv = bpy.data.curves.new("curve", 'CURVE')
@@ -157,23 +182,60 @@ def add_crossroad_curve(curve_names: list, points: list, crossroad_point: Vector
     for bezier_point, point in zip(spline.bezier_points, points):
         bezier_point.co = point
 
-    # Calculate the distance between the kerb points
-    vector = points[1] - points[0]
+    # Set both bezier point handles to a point in direction of its road curve (dependent on the distance between the kerbs)
+    handles = calculate_crossroad_curve_handles(points, direction_unit_vectors)
 
-    for i in range(len(spline.bezier_points)):
-        # Use the vector length to obtain an offset dependent on the kerbs in direction of its road curve
-        # and add it to the point
-        new_co = points[i] + vector.length / 2 * direction_unit_vectors[i]
-        # Set both bezier point handles to the new coordinate
-        crv.splines[0].bezier_points[i].handle_left = new_co
-        crv.splines[0].bezier_points[i].handle_right = new_co
+    for bezier_point, handle in zip(spline.bezier_points, handles):
+        bezier_point.handle_left = handle
+        bezier_point.handle_right = handle
 
     # Create a new object based on the curve and link it to its collection
     crossroad_curve = bpy.data.objects.new(f"Crossroad_Curve_{curve_names[0]}_{curve_names[1]}", crv)
     link_to_collection(crossroad_curve, "Crossroad Curves")
     set_origin(crossroad_curve)
 
-    # Create a line mesh from the curve (needed for crossroad plane) and link it to its collection
-    curve_to_mesh(crossroad_curve)
+    # Evaluate the curve (needed for crossroad plane) and keep its centreline in the store
+    add_centrelines([crossroad_curve])
 
     return crossroad_curve
+
+
+def get_centre(crossroad_point: bpy.types.Object):
+    # The crossroads are only moved in the xy-plane
+    return np.array((crossroad_point.location.x, crossroad_point.location.y, 0.0))
+
+
+def get_crossroad_signature(side_curve_names: list, points: list, crossroad_point: bpy.types.Object, template_names: tuple):
+    directions = np.array([get_end_direction(curve_name, crossroad_point.location) for curve_name in side_curve_names])
+
+    return calculate_crossroad_signature(side_curve_names, points, directions, get_centre(crossroad_point), template_names)
+
+
+def get_end_direction(curve_name: str, crossroad_point: Vector):
+    road_curve = bpy.data.objects.get(curve_name)
+    curve_point = get_closest_curve_point(road_curve, crossroad_point)
+
+    # Find the closest handle of the curve point with respect to the crossing point
+    left_handle = curve_point.handle_left + road_curve.location
+    right_handle = curve_point.handle_right + road_curve.location
+    closest_handle = get_closest_point([left_handle, right_handle], crossroad_point)
+
+    # Calculate the direction of the curve point and its handle as unit vector
+    direction = closest_handle - (curve_point.co + road_curve.location)
+    direction.normalize()
+
+    return direction
+
+
+def get_sorted_outer_points(curves: list, crossroad_point: bpy.types.Object):
+    side_curve_names = []
+    points = []
+
+    # Get the outer vertices of the side curves of all curves (the end points closest to the crossroad point)
+    for curve in curves:
+        for side in ["Left", "Right"]:
+            side_curve = bpy.data.objects.get(f"{curve.name}_{side}")
+            side_curve_names.append(side_curve.name)
+            points.append(get_closest_curve_point(side_curve, crossroad_point.location, True))
+
+    return sort_outer_points(side_curve_names, points, np.array(crossroad_point.location))
@@ -1,11 +1,14 @@
 import bpy
 import bmesh
-import math
+import numpy as np
 
 from mathutils import Vector
 
+from roadGen.core.geometry import get_intersection_with_circle
+from roadGen.snapshot import RG_SplineSnapshot
 from roadGen.utils.curve_management import sort_curves
 from roadGen.utils.mesh_management import set_origin
+from roadGen.utils.profile_management import call_operator
 
 
 class RG_GraphToNetGenerator:
@@ -22,24 +25,6 @@ class RG_GraphToNetGenerator:
 # ------------------------------------------------------------------------
 
 
-def get_intersection_with_circle(
-        first_point: Vector, second_point: Vector, circle_midpoint: Vector, circle_radius: float):
-    vec = second_point - first_point
-
-    # Coefficients of the quadratic equation for intersection calculation
-    A = vec[0]**2 + vec[1]**2
-    B = 2 * (vec[0] * (first_point[0] - circle_midpoint[0]) + vec[1] * (first_point[1] - circle_midpoint[1]))
-    C = (first_point[0] - circle_midpoint[0])**2 + (first_point[1] - circle_midpoint[1])**2 - circle_radius**2
-    discriminant = B**2 - 4 * A * C
-
-    # There are two intersections of a vector with a circle (also with t = (-B - sqrt_discriminant) / (2 * A))
-    # but only the first is relevant
-    sqrt_discriminant = math.sqrt(discriminant)
-    t = (-B + sqrt_discriminant) / (2 * A)
-
-    return Vector((first_point[0] + t * vec[0], first_point[1] + t * vec[1], 0.0))
-
-
 def visualize_crossing_points(graph):
     # Create a default cube as a mesh for a crossing point
     cube_mesh = bpy.data.meshes.new("Crossing_Point")
@@ -89,12 +74,12 @@ def visualize_curves(graph):
     try:
         # Try to get the Curves collection and delete all objects in it to have a clear start
         curves_collection = bpy.data.collections["Curves"]
-        bpy.ops.object.select_all(action='DESELECT')
+        call_operator(bpy.ops.object.select_all, action='DESELECT')
 
         for curve in curves_collection.objects:
             curve.select_set(True)
 
-        bpy.ops.object.delete()
+        call_operator(bpy.ops.object.delete)
     except Exception:
         # Create a new Curves collection and link it to the scene if there is none
         curves_collection = bpy.data.collections.new("Curves")
@@ -158,7 +143,7 @@ def visualize_curves(graph):
                                 # Add a new point with updated coordinates
                                 # when a point is reached that is far enough away from the first/last point
                                 # and when it is not too close to the last added point
-                                new_co = get_intersection_with_circle(previous_edge_point, edge_point, point, crossroad_size)
+                                new_co = Vector(get_intersection_with_circle(previous_edge_point, edge_point, point, crossroad_size))
 
                                 last_added_point = edge_points_copy[0] if x == 0 else edge_points_copy[-1]
 
@@ -199,18 +184,19 @@ def visualize_curves(graph):
 
 def visualize_one_curve(points: list, curves_collection: bpy.types.Collection, curve_name: str):
     curve = bpy.data.curves.new("Curve", 'CURVE')
-    curve.splines.new('BEZIER')
-    curve_spline = curve.splines.active
-    curve_spline.bezier_points.add(len(points) - 1)
+
+    # Write all points at once (the vector handles are calculated by Blender)
+    snapshot = RG_SplineSnapshot()
+    snapshot.points = np.array([point.to_3d() for point in points])
+    snapshot.handles_left = snapshot.points
+    snapshot.handles_right = snapshot.points
+    snapshot.handle_left_types = ['VECTOR'] * len(points)
+    snapshot.handle_right_types = ['VECTOR'] * len(points)
+    snapshot.create_spline(curve)
 
     obj = bpy.data.objects.new(curve_name, curve)
     curves_collection.objects.link(obj)
 
-    for i in range(len(points)):
-        curve_spline.bezier_points[i].co = points[i].to_3d()
-        curve_spline.bezier_points[i].handle_right_type = 'VECTOR'
-        curve_spline.bezier_points[i].handle_left_type = 'VECTOR'
-
     set_origin(obj)
 
     return obj
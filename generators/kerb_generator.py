@@ -3,6 +3,7 @@ import bpy
 from roadGen.generators.geometry_generator import RG_GeometryGenerator
 from roadGen.road import RG_Road
 from roadGen.utils.mesh_management import add_mesh_to_curve, edit_mesh_at_positions
+from roadGen.utils.regeneration_management import tag_objects_like
 
 
 class RG_KerbGenerator(RG_GeometryGenerator):
@@ -28,6 +29,7 @@ class RG_KerbGenerator(RG_GeometryGenerator):
 
         name = curve.name
         mesh = add_mesh_to_curve(self.mesh_template, curve, f"Kerb_{name}", index)
+        tag_objects_like([mesh], curve)
 
         if road:
             road.kerbs.append(mesh)
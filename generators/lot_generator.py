@@ -1,40 +1,61 @@
 import bpy
+import numpy as np
 
 from mathutils import Vector
 
+from roadGen.core.lot import remove_close_vertices, sort_vertex_indices, walk_lot
 from roadGen.generators.geometry_generator import RG_GeometryGenerator
 from roadGen.road import RG_Road
-from roadGen.utils.collection_management import get_objects_from_collection
-from roadGen.utils.mesh_management import create_mesh_from_vertices
+from roadGen.topology import RG_Topology
+from roadGen.utils.mesh_management import (
+    create_mesh_from_vertices,
+    get_object_coordinates,
+    get_outside_indices,
+    get_sidewalk_meshes,
+    get_vertex_segments)
+from roadGen.utils.regeneration_management import tag_object
 
 
 class RG_LotGenerator(RG_GeometryGenerator):
-    def __init__(self, roads: list):
+    def __init__(self, roads: list, topology: RG_Topology = None, roads_to_update: list = None):
         self.roads = roads
+        self.roads_to_update = roads_to_update if roads_to_update is not None else roads
         self.lots = []
+        self.topology = topology if topology else RG_Topology()
+
+        for road in self.roads:
+            self.topology.add_road(road)
 
     def add_geometry(self):
         lot_counter = 0
-        roads_copy = {"Left": self.roads.copy(), "Right": self.roads.copy()}
+        roads_copy = {"Left": set(self.roads_to_update), "Right": set(self.roads_to_update)}
+        right_neighbours = get_right_neighbours(self.roads)
 
-        for road in self.roads:
+        for road in self.roads_to_update:
             for side in ["Left", "Right"]:
                 if road in roads_copy[side]:
-                    roads, lot_vertices = get_lot_roads_and_vertices(self.roads, road, side)
+                    roads, lot_vertices = get_lot_roads_and_vertices(self.topology, road, side, right_neighbours)
 
                     if roads and lot_vertices:
                         unique_lot_vertices = remove_close_vertices(lot_vertices)
 
+                        # Skip the indices of lots that still exist (and are not regenerated)
+                        while bpy.data.objects.get(f"Lot_{lot_counter}"):
+                            lot_counter += 1
+
                         lot = create_mesh_from_vertices(unique_lot_vertices, "Lot", f"{lot_counter}", reverse=True)
 
                         if lot:
+                            # The lot depends on the curves of its roads and of the crossroads between them
+                            curve_names = {lot_road.curve.name for lot_roads in roads.values() for lot_road in lot_roads}
+                            tag_object(lot, self.topology.get_dependent_curve_names(curve_names))
+
                             self.lots.append(lot)
                             lot_counter += 1
 
                         for side in roads:
                             for road in roads[side]:
-                                if road in roads_copy[side]:
-                                    roads_copy[side].remove(road)
+                                roads_copy[side].discard(road)
 
 
 # ------------------------------------------------------------------------
@@ -43,131 +64,97 @@ class RG_LotGenerator(RG_GeometryGenerator):
 
 
 def append_sidewalk_vertices_to_lot(sidewalk_meshes: list, lot_vertices: list, curve: bpy.types.Object, side: str = "Right"):
-    indices = range(len(sidewalk_meshes))
-
-    if side == "Left":
-        indices = list(reversed(indices))
-
     direction_for_vertices_order = (curve.data.splines[0].bezier_points[0].handle_right -
                                     curve.data.splines[0].bezier_points[0].co)
 
-    # Find for each sidewalk mesh its outside top vertex indices and append their global coordinates to the passed list
-    for i in indices:
-        mesh = sidewalk_meshes[i]
+    # Find for each sidewalk segment its outside top vertex indices (a separated sidewalk mesh is one segment)
+    segments = []
+    for mesh in sidewalk_meshes:
+        coordinates = get_object_coordinates(mesh)
 
-        if i < 2 or i == len(sidewalk_meshes) - 1 and side == "Left":
-            outside_indices = get_outside_top_indices(mesh, side, direction_for_vertices_order)
+        for outside_indices in get_outside_top_indices(mesh, side, direction_for_vertices_order, coordinates):
+            segments.append((mesh, coordinates, outside_indices))
+
+    if side == "Left":
+        segments.reverse()
 
+    # Append the global coordinates of the outside top vertices to the passed list
+    for mesh, coordinates, outside_indices in segments:
         for index in outside_indices:
-            global_vertex_co = mesh.matrix_world @ mesh.data.vertices[index].co
+            global_vertex_co = mesh.matrix_world @ Vector(coordinates[index])
             lot_vertices.append(global_vertex_co)
 
 
-def get_lot_roads_and_vertices(roads: list, start_road: RG_Road, side: str):
-    lot_roads = {"Left": [], "Right": []}
-    lot_vertices = []
-    road = start_road
-
-    # Find the roads that belong to a lot (a closed area between roads), beginning at the passed start road
-    while True:
-        right_neighbour = None
-
-        # Get the correct curve and right neighbour of the current road
-        if side == "Left" and road.left_curve:
-            curve = road.left_curve
+def get_lot_roads_and_vertices(topology: RG_Topology, start_road: RG_Road, side: str, right_neighbours: dict):
+    lot_road_names, steps = walk_lot(start_road.curve.name, side, right_neighbours, topology.roads)
 
-            if road.right_neighbour_of_left_curve:
-                right_neighbour = bpy.data.objects.get(road.right_neighbour_of_left_curve)
-        elif side == "Right" and road.right_curve:
-            curve = road.right_curve
+    if steps is None:
+        return None, None
 
-            if road.right_neighbour_of_right_curve:
-                right_neighbour = bpy.data.objects.get(road.right_neighbour_of_right_curve)
-
-        # Get the sidewalks of the road
-        sidewalk_meshes = road.sidewalks[side]
-
-        # Append the outside vertices of the sidewalk meshes to a list
-        append_sidewalk_vertices_to_lot(sidewalk_meshes, lot_vertices, curve, side)
-
-        if right_neighbour and road not in lot_roads[side]:
-            lot_roads[side].append(road)
-            road_of_right_neighbour = get_road_by_curve(roads, right_neighbour)
-
-            if road_of_right_neighbour:
-                # Continue for the crossroad if there is a next right neighbour
-                crossroad_curve_name = "Crossroad_Curve_" + curve.name + "_" + right_neighbour.name
-                crossroad_curve = bpy.data.objects.get(crossroad_curve_name)
-                sidewalk_meshes = get_objects_from_collection(f"Sidewalk_{crossroad_curve_name}")
-
-                append_sidewalk_vertices_to_lot(sidewalk_meshes, lot_vertices, crossroad_curve)
-
-                road = road_of_right_neighbour
-
-                if road == start_road:
-                    # Break if we reached the start road
-                    break
-
-                side = "Left" if "Left" in right_neighbour.name else "Right"
-        else:
-            # Break if there is no right neighbour or if we reached a already visited road
-            break
-
-    # Only return the found roads and vertices if the start road has been reached again
-    # and more than 2 roads belong to the lot
-    if road == start_road and len(lot_roads["Left"]) + len(lot_roads["Right"]) > 2:
-        return lot_roads, lot_vertices
+    # Append the outside vertices of the sidewalk meshes of the side curves and crossroad curves along the lot to a list
+    lot_vertices = []
 
-    return None, None
+    for step in steps:
+        road = topology.roads[step.road_name]
+        curve = road.left_curve if step.side == "Left" else road.right_curve
 
+        if curve:
+            append_sidewalk_vertices_to_lot(road.sidewalks[step.side], lot_vertices, curve, step.side)
 
-def get_outside_top_indices(mesh: bpy.types.Object, side: str, direction_for_vertices_order: Vector):
-    outside_indices = []
+        if step.crossroad_curve_name:
+            crossroad_curve = bpy.data.objects.get(step.crossroad_curve_name)
+            sidewalk_meshes = get_sidewalk_meshes(f"Sidewalk_{step.crossroad_curve_name}")
 
-    vertex_group = mesh.vertex_groups.get(f"Outside_{side}")
+            append_sidewalk_vertices_to_lot(sidewalk_meshes, lot_vertices, crossroad_curve)
 
-    if vertex_group:
-        for vertex in mesh.data.vertices:
-            for group in vertex.groups:
-                # Check whether the vertex is part of the vertex group
-                if group.group == vertex_group.index:
-                    outside_indices.append(vertex.index)
+    lot_roads = {side: [topology.roads[road_name] for road_name in road_names] for side, road_names in lot_road_names.items()}
 
-    outside_vertices = [mesh.data.vertices[index] for index in outside_indices]
+    return lot_roads, lot_vertices
 
-    outside_indices = sort_vertex_indices(outside_vertices, direction_for_vertices_order)
 
-    # Return the reversed order of indices for the left side
-    return list(reversed(outside_indices)) if side == "Left" else outside_indices
+def get_right_neighbours(roads: list):
+    # Get the (existing) right neighbours of the side curves of all roads by their road names and sides
+    right_neighbours = {}
 
-
-def get_road_by_curve(roads: list, curve: bpy.types.Object):
     for road in roads:
-        if road.curve.name == curve.name.rpartition('_')[0]:
-            return road
+        for side, curve, right_neighbour in [
+                ("Left", road.left_curve, road.right_neighbour_of_left_curve),
+                ("Right", road.right_curve, road.right_neighbour_of_right_curve)]:
+            if curve and right_neighbour and bpy.data.objects.get(right_neighbour):
+                right_neighbours[(road.curve.name, side)] = right_neighbour
+
+    return right_neighbours
 
-    return None
 
+def get_outside_top_indices(
+        mesh: bpy.types.Object, side: str, direction_for_vertices_order: Vector, coordinates: np.ndarray = None):
+    # Read the outside vertices at once from their attribute
+    outside_indices = get_outside_indices(mesh, side)
 
-def remove_close_vertices(vertices: list):
-    threshold = 0.01
-    unique_vertices = []
+    if outside_indices is None:
+        vertex_group = mesh.vertex_groups.get(f"Outside_{side}")
 
-    for i in range(len(vertices) - 1):
-        distance = (vertices[i] - vertices[i + 1]).length
+        if not vertex_group:
+            return []
 
-        if distance > threshold:
-            unique_vertices.append(vertices[i])
+        # Check for each vertex whether it is part of the vertex group (for meshes without the attribute)
+        outside_indices = np.array([
+            vertex.index for vertex in mesh.data.vertices
+            if any(group.group == vertex_group.index for group in vertex.groups)], dtype=np.int64)
 
-    return unique_vertices
+    if coordinates is None:
+        coordinates = get_object_coordinates(mesh)
 
+    outside_indices = sort_vertex_indices(outside_indices, coordinates, direction_for_vertices_order)
 
-def sort_vertex_indices(vertices: list, direction: Vector):
-    # Save all vertices in a list with their indices and their calculated dot product with the reference direction vector
-    vertices = [(v.index, v.co.dot(direction)) for v in vertices]
+    # Split the indices by the segments of the mesh (if it has any)
+    vertex_segments = get_vertex_segments(mesh)
 
-    # Sort the list by the dot products
-    vertices.sort(key=lambda x: x[1])
+    if vertex_segments is None:
+        segments = [outside_indices]
+    else:
+        outside_segments = vertex_segments[outside_indices]
+        segments = [outside_indices[outside_segments == segment] for segment in np.unique(outside_segments)]
 
-    # Return only the indices of the vertices
-    return [v[0] for v in vertices]
+    # Return the reversed order of indices for the left side
+    return [segment[::-1].tolist() if side == "Left" else segment.tolist() for segment in segments]
@@ -1,14 +1,47 @@
+import numpy as np
+
 from roadGen.road import RG_Road
-from roadGen.utils.mesh_management import add_objects_to_road
+from roadGen.topology import RG_Topology
+from roadGen.utils.mesh_management import add_objects_to_road, add_points_to_collection, get_object_placements
+from roadGen.utils.regeneration_management import tag_object
 
 
 class RG_RoadFurnitureGenerator():
-    def __init__(self, road_furniture_object_names: list):
+    def __init__(self, road_furniture_object_names: list, topology: RG_Topology = None, instanced: bool = False):
         self.road_furniture_object_names = road_furniture_object_names
+        self.topology = topology if topology else RG_Topology()
+        # Add the road furniture as one point cloud per object that instances the templates instead of one empty per object
+        self.instanced = instanced
+        # The collections, points, angles and source curves of the instanced road furniture by object and road names
+        self.placements = {}
 
     def add_geometry(self, road: RG_Road = None, side: str = None):
         offset = road.sidewalk_mesh_template.dimensions[1]
         height = road.sidewalk_mesh_template.dimensions[2]
 
+        # The road furniture depends also on the crossroads (and so on the neighbour curves) of the road
+        curve_names = self.topology.get_dependent_curve_names({road.curve.name})
+
         for road_furniture_object_name in self.road_furniture_object_names:
-            add_objects_to_road(road_furniture_object_name, road, side, offset, height)
+            if self.instanced:
+                # Collect the placements of both sides and add them later as one point cloud of the road
+                collections, points, angles = get_object_placements(road_furniture_object_name, road, side, offset, height)
+                placements = self.placements.setdefault(
+                    (road_furniture_object_name, road.curve.name), ([], [], [], set()))
+                placements[0].extend(collections)
+                placements[1].append(points)
+                placements[2].append(angles)
+                placements[3].update(curve_names)
+            else:
+                for road_furniture_object in add_objects_to_road(road_furniture_object_name, road, side, offset, height):
+                    tag_object(road_furniture_object, curve_names)
+
+    def add_points(self):
+        # Add one point cloud per road furniture object and road with the collected placements of the road
+        # (tagged with the curves the road furniture depends on, so that it is only regenerated with them)
+        for (road_furniture_object_name, road_name), (collections, points, angles, curve_names) in self.placements.items():
+            points_object = add_points_to_collection(
+                road_furniture_object_name, road_name, collections, np.concatenate(points), np.concatenate(angles))
+            tag_object(points_object, curve_names)
+
+        self.placements.clear()
@@ -1,5 +1,3 @@
-from time import time
-
 from roadGen.generators.building_generator import RG_BuildingGenerator
 from roadGen.generators.crossroad_generator import RG_CrossroadGenerator
 from roadGen.generators.data_generator import RG_DataGenerator
@@ -9,148 +7,252 @@ from roadGen.generators.lot_generator import RG_LotGenerator
 from roadGen.generators.road_furniture_generator import RG_RoadFurnitureGenerator
 from roadGen.generators.road_generator import RG_RoadGenerator
 from roadGen.generators.sidewalk_generator import RG_SidewalkGenerator
-from roadGen.utils.collection_management import count_objects_in_collections, get_crossing_curves, get_crossing_points
+from roadGen.topology import RG_Topology
+from roadGen.utils.centreline_management import clear_centrelines, export_line_meshes
+from roadGen.utils.collection_management import count_objects_in_collections, link_queued_objects
 from roadGen.utils.curve_management import get_visible_curves
+from roadGen.utils.mesh_management import clear_furniture_templates, clear_mesh_templates
+from roadGen.utils.profile_management import profile, start_profiler, stop_profiler
+from roadGen.utils.regeneration_management import (
+    delete_objects_with_source_curves,
+    get_changed_curves,
+    get_removed_curve_dependencies,
+    is_generated,
+    store_curve_fingerprints)
 
 
 class RG_RoadNetGenerator:
-    def __init__(self, graph=None):
+    def __init__(
+            self, graph=None, incremental: bool = False, with_line_meshes: bool = False, segmented_sidewalks: bool = True,
+            instanced_furniture: bool = False, trace_filepath: str = None):
         self.graph = graph
+        self.incremental = incremental
+        self.with_line_meshes = with_line_meshes
+        self.segmented_sidewalks = segmented_sidewalks
+        self.instanced_furniture = instanced_furniture
+        self.trace_filepath = trace_filepath
 
     def generate(self):
-        # Visualize the graph in Blender
-        if self.graph:
-            graph_to_net_generator = RG_GraphToNetGenerator(self.graph)
-            graph_to_net_generator.generate()
+        # Measure the stages, roads and crossroads of the run (the summary is shown in the panel)
+        profiler = start_profiler()
 
-        curves = get_visible_curves()
+        try:
+            # Visualize the graph in Blender
+            if self.graph:
+                with profile("Graph"):
+                    graph_to_net_generator = RG_GraphToNetGenerator(self.graph)
+                    graph_to_net_generator.generate()
 
-        start = time()
+            # Ignore curves that have been generated by a previous run (e.g. the side curves of the roads)
+            curves = [curve for curve in get_visible_curves() if not is_generated(curve)]
 
-        print("\n\n--- Starting road net generation ---")
+            # Start without any cached centrelines and templates of a previous run
+            clear_centrelines()
+            clear_furniture_templates()
+            clear_mesh_templates()
 
-        # Create road data
-        print("\n- Starting generation of road data -")
+            print("\n\n--- Starting road net generation ---")
 
-        t = time()
+            # Create road data
+            print("\n- Starting generation of road data -")
 
-        datamanager = RG_DataGenerator(curves)
-        datamanager.create_road_data()
+            with profile("Road data") as span:
+                datamanager = RG_DataGenerator(curves)
+                datamanager.create_road_data()
 
-        print(f"Road data generation completed in {time() - t:.2f}s")
+            print(f"Road data generation completed in {span['duration']:.2f}s")
 
-        # Visualize roads in Blender
-        print("\n- Starting generation of roads -")
+            # Index the crossroad points and their curves once for all following stages
+            topology = RG_Topology()
 
-        t = time()
+            # Find the curves whose roads have to be (re)generated and delete all objects that depend on them
+            curves_to_update = get_curves_to_update(curves, topology) if self.incremental else curves
+            curve_names_to_update = {curve.name for curve in curves_to_update}
 
-        road_generator = RG_RoadGenerator()
-        for curve in curves:
-            road_generator.add_geometry(curve)
+            if self.incremental:
+                delete_objects_with_source_curves(curve_names_to_update)
 
-        roads = road_generator.roads
+                print(f"\n{len(curves_to_update)} of {len(curves)} roads have to be regenerated")
 
-        print(f"Road generation ({len(roads)} in total) completed in {time() - t:.2f}s")
+            # Visualize roads in Blender
+            print("\n- Starting generation of roads -")
 
-        # Visualize kerbs in Blender
-        kerb_generator = RG_KerbGenerator()
-        add_geometry_with_roads_and_measure_time(kerb_generator, roads, "kerb")
+            with profile("Roads") as span:
+                road_generator = RG_RoadGenerator(topology)
 
-        # Visualize sidewalks in Blender
-        offset = kerb_generator.mesh_template.dimensions[1]
-        sidewalk_generator = RG_SidewalkGenerator(offset=offset)
-        add_geometry_with_roads_and_measure_time(sidewalk_generator, roads, "sidewalk")
+                # Prepare and evaluate all curves to update at once (their names might change during the preparation)
+                road_generator.prepare_curves(curves_to_update)
+                curve_names_to_update = {curve.name for curve in curves_to_update}
 
-        # Visualize crossroads in Blender
-        crossroad_points = get_crossing_points()
+                for curve in curves:
+                    with profile(curve.name, "road", stage="road"):
+                        if curve.name in curve_names_to_update:
+                            road_generator.add_geometry(curve)
+                        else:
+                            road_generator.reuse_geometry(curve)
 
-        if crossroad_points:
-            print("\n- Starting generation of crossroads -")
+                # Evaluate the side curves of all roads at once and add the lanes of the roads
+                road_generator.add_lanes()
 
-            counter = 0
-            t = time()
+            roads = road_generator.roads
+            roads_to_update = [road for road in roads if road.curve.name in curve_names_to_update]
 
-            crossroad_generator = RG_CrossroadGenerator()
+            # The road furniture and lots of roads at the crossroads of regenerated roads have to be regenerated as well
+            dependent_curve_names = topology.get_dependent_curve_names(curve_names_to_update)
+            dependent_roads = [road for road in roads if road.curve.name in dependent_curve_names]
 
-            for crossroad_point in crossroad_points:
-                # Get the original curves to generate the crossroad as such to check if there are more than one
-                curves = get_crossing_curves(crossroad_point)
+            print(f"Road generation ({len(roads)} in total) completed in {span['duration']:.2f}s")
 
-                if len(curves) > 1:
-                    crossroad_generator.add_geometry(curves, crossroad_point)
+            # Visualize kerbs in Blender
+            kerb_generator = RG_KerbGenerator()
+            add_geometry_with_roads_and_measure_time(kerb_generator, roads_to_update, "kerb")
 
-                    # Get the curves of the crossroad to generate kerbs and sidewalks
-                    crossroad_curves = crossroad_generator.crossroads[f"Crossroad_{crossroad_point.name}"]
+            # Visualize sidewalks in Blender
+            offset = kerb_generator.mesh_template.dimensions[1]
+            sidewalk_generator = RG_SidewalkGenerator(offset=offset, segmented=self.segmented_sidewalks)
+            add_geometry_with_roads_and_measure_time(sidewalk_generator, roads_to_update, "sidewalk")
 
-                    for curve in crossroad_curves:
-                        kerb_generator.add_geometry(curve=curve)
-                        sidewalk_generator.add_geometry(curve=curve)
+            for road in roads:
+                if not road.kerb_mesh_template:
+                    road.kerb_mesh_template = kerb_generator.mesh_template
+                if not road.sidewalk_mesh_template:
+                    road.sidewalk_mesh_template = sidewalk_generator.mesh_template
 
-                    counter += 1
+            # Visualize crossroads in Blender
+            crossroad_points = topology.crossing_points
+
+            if crossroad_points:
+                print("\n- Starting generation of crossroads -")
+
+                counter = 0
+
+                with profile("Crossroads") as span:
+                    # The crossroad generator adds also the kerbs and sidewalks along the curves of the crossroads
+                    crossroad_generator = RG_CrossroadGenerator(kerb_generator, sidewalk_generator)
+
+                    for crossroad_point in crossroad_points:
+                        # Get the original curves to generate the crossroad as such to check if there are more than one
+                        curves = topology.get_crossing_curves(crossroad_point)
+                        is_outdated = any(curve.name in curve_names_to_update for curve in curves)
+
+                        if len(curves) > 1 and is_outdated:
+                            with profile(crossroad_point.name, "crossroad"):
+                                crossroad_generator.add_geometry(curves, crossroad_point)
+
+                            counter += 1
+
+                            if counter % 10 == 0:
+                                print(f"\t{counter} crossroads added")
+
+                copied_crossroads_number = crossroad_generator.copied_crossroads_number
+                print(f"Crossroad generation ({counter} in total, {copied_crossroads_number} copied) "
+                      f"completed in {span['duration']:.2f}s")
+
+            # Remove the overlapping parts of the sidewalks (e.g. at the crossroads)
+            print("\n- Starting correction of sidewalks -")
+
+            with profile("Sidewalk correction") as span:
+                sidewalk_generator.correct_sidewalks()
 
-                if counter % 10 == 0:
-                    print(f"\t{counter} crossroads added")
+            print(f"Sidewalk correction completed in {span['duration']:.2f}s")
 
-            print(f"Crossroad generation ({counter} in total) completed in {time() - t:.2f}s")
+            # Visualize road furniture in Blender
+            road_furniture_generator = RG_RoadFurnitureGenerator(
+                ["Street Lamp", "Street Name Sign", "Traffic Light", "Traffic Sign"], topology, self.instanced_furniture)
+            add_geometry_with_roads_and_measure_time(road_furniture_generator, dependent_roads, "road furniture object")
 
-        # sidewalk_generator.correct_sidewalks()
+            # Visualize lots (areas between the roads) in Blender
+            lot_generator = RG_LotGenerator(roads, topology, dependent_roads)
+            add_geometry_and_measure_time(lot_generator, "lot")
 
-        # Visualize road furniture in Blender
-        road_furniture_generator = RG_RoadFurnitureGenerator(["Street Lamp", "Street Name Sign", "Traffic Light", "Traffic Sign"])
-        add_geometry_with_roads_and_measure_time(road_furniture_generator, roads, "road furniture object")
+            # Visualize buildings in Blender
+            building_generator = RG_BuildingGenerator(lot_generator.lots)
+            add_geometry_and_measure_time(building_generator, "building")
 
-        # Visualize lots (areas between the roads) in Blender
-        lot_generator = RG_LotGenerator(roads)
-        add_geometry_and_measure_time(lot_generator, "lot")
+            # Create line meshes of all evaluated curves (only for debugging)
+            if self.with_line_meshes:
+                with profile("Line meshes"):
+                    export_line_meshes()
 
-        # Visualize buildings in Blender
-        building_generator = RG_BuildingGenerator(lot_generator.lots)
-        add_geometry_and_measure_time(building_generator, "building")
+            # Remember the state of the curves to find changed curves for the next incremental generation
+            store_curve_fingerprints([road.curve for road in roads])
+        finally:
+            # Stop the profiler also if the generation failed (e.g. to remove its depsgraph handler)
+            stop_profiler(self.trace_filepath)
 
-        print(f"\n--- Overall road net generation time: {time() - start:.2f}s ---")
+        print(f"\n--- Overall road net generation time: {profiler.end_time - profiler.start_time:.2f}s ---")
 
 
 # ------------------------------------------------------------------------
-#    Helper Method
+#    Helper Methods
 # ------------------------------------------------------------------------
 
 
 def add_geometry_and_measure_time(generator, geometry_type: str):
-    t = time()
+    plural_geometry_type = geometry_type + "s"
 
-    generator.add_geometry()
+    with profile(plural_geometry_type.capitalize()) as span:
+        generator.add_geometry()
 
-    plural_geometry_type = geometry_type + "s"
     generated_meshes = getattr(generator, plural_geometry_type)
 
     if generated_meshes:
         print(f"\n- Starting generation of {geometry_type}s -")
-        print(f"{geometry_type.capitalize()} generation ({len(generated_meshes)} in total) completed in {time() - t:.2f}s")
+        print(f"{geometry_type.capitalize()} generation ({len(generated_meshes)} in total) "
+              f"completed in {span['duration']:.2f}s")
+
+
+def get_curves_to_update(curves: list, topology: RG_Topology):
+    curve_names = {curve.name for curve in curves}
+    changed_curve_names = {curve.name for curve in get_changed_curves(curves)}
+
+    # Curves that were generated together with removed curves have to be updated as well
+    removed_curve_names, removed_curve_dependencies = get_removed_curve_dependencies(curve_names)
+    changed_curve_names |= removed_curve_dependencies
+
+    if removed_curve_names:
+        delete_objects_with_source_curves(removed_curve_names)
+
+    # The turning lanes and crossroads of a road depend on its neighbours,
+    # so also the roads sharing a crossroad point with a changed road have to be updated
+    curve_names_to_update = topology.get_dependent_curve_names(changed_curve_names)
+
+    return [curve for curve in curves if curve.name in curve_names_to_update]
 
 
 def add_geometry_with_roads_and_measure_time(generator, roads: list, geometry_type: str):
     print(f"\n- Starting generation of {geometry_type}s -")
 
     counter = 0
-    t = time()
 
-    for road in roads:
-        for side in ["Left", "Right"]:
-            generator.add_geometry(road=road, side=side)
-            counter += 1
+    with profile(f"{geometry_type.capitalize()}s") as span:
+        for road in roads:
+            with profile(road.curve.name, "road", stage=geometry_type):
+                for side in ["Left", "Right"]:
+                    generator.add_geometry(road=road, side=side)
+                    counter += 1
+
+            if counter % 10 == 0 and geometry_type != "road furniture object":
+                print(f"\t{counter} {geometry_type}s added")
+
+        # Add the collected placements of the instanced road furniture as one point cloud per object and road
+        if geometry_type == "road furniture object" and generator.instanced:
+            generator.add_points()
 
-        if counter % 10 == 0 and geometry_type != "road furniture object":
-            print(f"\t{counter} {geometry_type}s added")
+        # Link the queued objects of the stage (e.g. the road furniture) and update the scene only once
+        link_queued_objects()
 
     with_subcollections = False if geometry_type == "sidewalk" else True
 
     if geometry_type == "road furniture object":
         collection_names = [object_name + "s" for object_name in generator.road_furniture_object_names]
-        emptys = True
+        # The instanced road furniture consists of point meshes instead of emptys
+        emptys = not generator.instanced
     else:
         collection_names = [f"{generator.mesh_template.name}s"]
         emptys = False
 
     generated_objects_number = count_objects_in_collections(collection_names, with_subcollections, emptys)
 
-    print(f"{geometry_type.capitalize()} generation ({generated_objects_number} in total) completed in {time() - t:.2f}s")
+    print(f"{geometry_type.capitalize()} generation ({generated_objects_number} in total) "
+          f"completed in {span['duration']:.2f}s")
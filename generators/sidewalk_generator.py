@@ -1,23 +1,29 @@
 import bpy
+import numpy as np
 
 from mathutils import Vector
 
+from roadGen.core.geometry import get_closest_point_indices, get_distinct_point_indices
 from roadGen.generators.geometry_generator import RG_GeometryGenerator
 from roadGen.road import RG_Road
-from roadGen.utils.collection_management import (
-    get_first_and_last_objects_from_collections, get_objects_from_collection, link_to_collection)
+from roadGen.snapshot import RG_MeshSnapshot
+from roadGen.utils.centreline_management import get_centreline
+from roadGen.utils.collection_management import get_objects_from_collection, link_to_collection
+from roadGen.utils.intersection_management import get_intersecting_meshes, subtract_mesh_footprint
 from roadGen.utils.mesh_management import (
     add_mesh_to_curve,
     apply_modifiers,
-    create_kdtree,
-    get_intersecting_meshes,
+    get_object_coordinates,
+    get_sidewalk_meshes,
     separate_array_meshes,
     set_origin)
+from roadGen.utils.regeneration_management import tag_objects_like
 
 
 class RG_SidewalkGenerator(RG_GeometryGenerator):
-    def __init__(self, mesh_template: bpy.types.Object = None, offset: float = 0.0):
+    def __init__(self, mesh_template: bpy.types.Object = None, offset: float = 0.0, segmented: bool = True):
         self.offset = offset
+        self.segmented = segmented
         self.sidewalks = {}
         self.mesh_template = mesh_template if mesh_template else bpy.data.objects.get("Sidewalk")
 
@@ -40,7 +46,8 @@ class RG_SidewalkGenerator(RG_GeometryGenerator):
             elif side == "Right" and road.right_curve:
                 curve = road.right_curve
 
-        mesh = add_mesh_to_curve(self.mesh_template, curve, f"Sidewalk_{curve.name}", index, self.offset)
+        mesh = add_mesh_to_curve(
+            self.mesh_template, curve, f"Sidewalk_{curve.name}", index, self.offset, self.segmented)
 
         if curve.name not in self.sidewalks:
             self.sidewalks[curve.name] = []
@@ -48,21 +55,34 @@ class RG_SidewalkGenerator(RG_GeometryGenerator):
 
         kerb_mesh_name = "Kerb_" + curve.name
 
-        drop_sidewalk(mesh, kerb_mesh_name)
+        # Take the positions of the dropped kerbs from the road data if there are any
+        positions = road.dropped_positions(side) if road and road.curve.get(f"{side} Dropped Kerbs") else None
 
-        separate_array_meshes(mesh)
+        drop_sidewalk(mesh, kerb_mesh_name, positions=positions, curve_name=curve.name)
+
+        # Keep segmented sidewalks as one mesh (their segments are stored in a face attribute)
+        if self.segmented:
+            meshes = [mesh]
+        else:
+            separate_array_meshes(mesh)
+            meshes = get_objects_from_collection(mesh.name)
+
+        tag_objects_like(meshes, curve)
 
         # Add the sidewalk meshes to the Road
         if road:
-            meshes = get_objects_from_collection(mesh.name)
             road.sidewalks[side] = meshes
 
-    # ToDo: Check if it is still required
     def correct_sidewalks(self):
-        collections = [collection for collections in list(self.sidewalks.values()) for collection in collections]
+        sidewalk_names = [sidewalk_name for sidewalk_names in list(self.sidewalks.values()) for sidewalk_name in sidewalk_names]
 
+        # Only the first and last meshes of separated sidewalks can intersect other sidewalks
         number_of_meshes = 5
-        meshes = get_first_and_last_objects_from_collections(collections, number_of_meshes)
+        meshes = []
+        for sidewalk_name in sidewalk_names:
+            sidewalk_meshes = get_sidewalk_meshes(sidewalk_name)
+            meshes.extend(dict.fromkeys(sidewalk_meshes[:number_of_meshes] + sidewalk_meshes[-number_of_meshes:]))
+
         mesh_intersections = get_intersecting_meshes(meshes)
 
         edit_meshes = []
@@ -73,7 +93,11 @@ class RG_SidewalkGenerator(RG_GeometryGenerator):
 
             for intersected_mesh in intersections:
                 if intersected_mesh not in edit_meshes:
-                    # Create a copy of the current mesh
+                    # Subtract the footprint of the intersected mesh in 2D if both meshes are prisms there
+                    if subtract_mesh_footprint(mesh, intersected_mesh):
+                        continue
+
+                    # Otherwise create a copy of the current mesh
                     mesh_copy = mesh.copy()
                     mesh_copy.data = mesh.data.copy()
 
@@ -107,53 +131,42 @@ class RG_SidewalkGenerator(RG_GeometryGenerator):
 # ------------------------------------------------------------------------
 
 
-def drop_sidewalk(mesh: bpy.types.Object, kerb_mesh_name: str, drop_depth: float = 0.115):
+def drop_sidewalk(
+        mesh: bpy.types.Object, kerb_mesh_name: str, drop_depth: float = 0.115, positions: list = None,
+        curve_name: str = None):
     kerb_mesh = bpy.data.objects.get(kerb_mesh_name)
-    vertices = [vertex.co for vertex in kerb_mesh.data.vertices]
+    kerb_vertices = get_object_coordinates(kerb_mesh) + np.array(kerb_mesh.location)
 
     # Find all dropped vertices of the kerb
-    dropped_vertices = []
-    for vertex in vertices:
-        # Have a small threshold for finding the correct vertices due to the mesh structure and rounding issues
-        depth_threshold = 0.00001
-        if vertex.z <= drop_depth + depth_threshold and vertex.z >= drop_depth - depth_threshold:
-            dropped_vertices.append(vertex + kerb_mesh.location)
-
-    num = len(dropped_vertices)
-
-    # Filter the dropped vertices by comparing three successively vertices to find one vertex per pair of vertices
-    filtered_dropped_vertices = []
-    for i in range(num - 2):
-        vertex_1 = dropped_vertices[i]
-        vertex_2 = dropped_vertices[i + 1]
-        vertex_3 = dropped_vertices[i + 2]
-
-        # Adjust the height to find better the upper vertices
-        vertex_1.z = 0.25
-        vertex_2.z = 0.25
-        vertex_3.z = 0.25
-
-        # Calculate the distances between the two pairs of vertices
-        vector_1 = vertex_2 - vertex_1
-        vector_2 = vertex_3 - vertex_1
-
-        # Only use the current vertex if its distance to the other two vertices is large enough
-        distance_threshold = 0.15
-        if vector_1.length >= distance_threshold and vector_2.length >= distance_threshold:
-            filtered_dropped_vertices.append(vertex_1)
-
-        # Add also a vertex for the last pair of vertices (the last is sufficient)
-        if i == num - 3 and vector_2.length >= distance_threshold:
-            filtered_dropped_vertices.append(vertex_3)
-
-    mesh_vertices = [vertex.co for vertex in mesh.data.vertices]
-    kd_tree = create_kdtree(mesh_vertices, len(mesh_vertices))
-
-    # For each filtered dropped kerb vertex, find the correct sidewalk vertex/vertices and drop it/they as well
-    for dropped_vertex in filtered_dropped_vertices:
-        for (co, index, dist) in kd_tree.find_n(dropped_vertex - mesh.location, 2):
-            vertex = mesh_vertices[index]
-
-            # Decrease the height only for the upper vertices
-            if vertex.z > 0.2:
-                vertex.z -= 0.135
+    # (have a small threshold for finding the correct vertices due to the mesh structure and rounding issues)
+    depth_threshold = 0.00001
+    is_dropped = np.abs(kerb_vertices[:, 2] - drop_depth) <= depth_threshold
+    dropped_vertices = kerb_vertices[is_dropped]
+
+    if positions and curve_name and len(dropped_vertices) > 0:
+        # Only use the dropped vertices around the positions of the dropped kerbs of the road
+        radius = 2
+        points = get_centreline(curve_name).points_at(positions)
+        distances = np.linalg.norm(dropped_vertices[:, np.newaxis, :2] - points[np.newaxis, :, :2], axis=2)
+        dropped_vertices = dropped_vertices[(distances <= radius).any(axis=1)]
+
+    if len(dropped_vertices) == 0:
+        return
+
+    # Use only one dropped vertex of the dropped vertices that are closer than a threshold to each other (spatial hash)
+    # and adjust the height to find better the upper vertices
+    distance_threshold = 0.15
+    dropped_vertices = dropped_vertices[get_distinct_point_indices(dropped_vertices, distance_threshold)]
+    dropped_vertices[:, 2] = 0.25
+
+    # For each filtered dropped kerb vertex, find the two closest sidewalk vertices (at once with a grid of 1 m cells)
+    snapshot = RG_MeshSnapshot(mesh)
+    mesh_vertices = snapshot.coordinates
+    closest_indices = get_closest_point_indices(mesh_vertices, dropped_vertices - np.array(mesh.location), 2, 1.0)
+    closest_indices = np.unique(closest_indices)
+
+    # Decrease the height only for the upper vertices and write all vertices back at once
+    closest_indices = closest_indices[mesh_vertices[closest_indices, 2] > 0.2]
+    mesh_vertices[closest_indices, 2] -= 0.135
+
+    snapshot.write()
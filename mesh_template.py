@@ -0,0 +1,188 @@
+import bpy
+import numpy as np
+
+from mathutils import kdtree
+
+
+class RG_MeshTemplate:
+    def __init__(self, template: bpy.types.Object):
+        self.object = template
+        self.name = template.name
+        mesh = template.data
+
+        # Read the geometry of the template at once
+        self.vertices = get_attribute(mesh.vertices, "co", 3, np.float64)
+        self.loop_vertex_indices = get_attribute(mesh.loops, "vertex_index", 1, np.int32)
+        self.loop_starts = get_attribute(mesh.polygons, "loop_start", 1, np.int32)
+        self.loop_totals = get_attribute(mesh.polygons, "loop_total", 1, np.int32)
+        self.material_indices = get_attribute(mesh.polygons, "material_index", 1, np.int32)
+        self.use_smooth = get_attribute(mesh.polygons, "use_smooth", 1, bool)
+        self.uv_layers = {uv_layer.name: get_attribute(uv_layer.data, "uv", 2, np.float32) for uv_layer in mesh.uv_layers}
+        self.vertex_groups = get_vertex_groups(template)
+        self.face_parts, self.parts_number = get_loose_parts(self.loop_vertex_indices, self.loop_starts, self.loop_totals)
+
+        # Use the rotation and scale of the template like they were applied
+        self.rotation = np.array(template.matrix_basis.to_quaternion().to_matrix())
+        self.scale = np.array(template.scale)
+        self.dimensions = (self.vertices.max(axis=0) - self.vertices.min(axis=0)) * np.abs(self.scale)
+
+        # Read the settings of the modifiers that are replaced by the template (with the defaults of Blender)
+        array_modifier = template.modifiers.get("Array")
+        self.relative_offset = np.array([1.0, 0.0, 0.0])
+        self.constant_offset = np.zeros(3)
+        self.merge_threshold = None
+
+        if array_modifier:
+            if array_modifier.use_relative_offset:
+                self.relative_offset = np.array(array_modifier.relative_offset_displace)
+            else:
+                self.relative_offset = np.zeros(3)
+            if array_modifier.use_constant_offset:
+                self.constant_offset = np.array(array_modifier.constant_offset_displace)
+            if array_modifier.use_merge_vertices:
+                self.merge_threshold = array_modifier.merge_threshold
+
+    def get_tiles(self, tile_length: float, length: float):
+        # Scale the template along the x-axis to the tile length and transform it like it was applied
+        scale = self.scale.copy()
+        scale[0] *= tile_length / self.dimensions[0] if self.dimensions[0] > 0 else 1.0
+        vertices = (self.vertices * scale) @ self.rotation.T
+
+        # Calculate the offset between two tiles like the Array modifier (relative to the bounds of the tile)
+        tile_dimensions = vertices.max(axis=0) - vertices.min(axis=0)
+        offset = self.relative_offset * tile_dimensions + self.constant_offset
+        offset_length = np.linalg.norm(offset)
+        count = max(1, int(round(length / offset_length))) if offset_length > 0 else 1
+
+        # Repeat the vertices, faces, uvs and vertex groups for each tile
+        vertices_number = len(vertices)
+        loops_number = len(self.loop_vertex_indices)
+        tile_indices = np.arange(count)
+
+        tiled_vertices = (vertices[np.newaxis] + tile_indices[:, np.newaxis, np.newaxis] * offset).reshape(-1, 3)
+        loop_vertex_indices = (self.loop_vertex_indices[np.newaxis] +
+                               tile_indices[:, np.newaxis] * vertices_number).ravel()
+        loop_starts = (self.loop_starts[np.newaxis] + tile_indices[:, np.newaxis] * loops_number).ravel()
+        loop_totals = np.tile(self.loop_totals, count)
+        material_indices = np.tile(self.material_indices, count)
+        use_smooth = np.tile(self.use_smooth, count)
+        uv_layers = {name: np.tile(uvs, (count, 1)) for name, uvs in self.uv_layers.items()}
+        segments = (tile_indices[:, np.newaxis] * self.parts_number + self.face_parts[np.newaxis]).ravel()
+        vertex_groups = {
+            name: [((indices[np.newaxis] + tile_indices[:, np.newaxis] * vertices_number).ravel(), weight)
+                   for indices, weight in groups]
+            for name, groups in self.vertex_groups.items()}
+
+        # Merge the vertices at the borders of neighbouring tiles like the Array modifier would do
+        # (coincident vertices inside a tile are kept)
+        if self.merge_threshold is not None and count > 1:
+            vertex_map = get_merged_vertex_map(vertices, offset, count, self.merge_threshold)
+            is_kept = vertex_map == np.arange(len(vertex_map))
+            new_indices = np.cumsum(is_kept) - 1
+
+            tiled_vertices = tiled_vertices[is_kept]
+            loop_vertex_indices = new_indices[vertex_map][loop_vertex_indices]
+            vertex_groups = {
+                name: [(new_indices[indices[is_kept[indices]]], weight) for indices, weight in groups]
+                for name, groups in vertex_groups.items()}
+
+        return RG_MeshData(
+            tiled_vertices, loop_vertex_indices, loop_starts, loop_totals,
+            material_indices, use_smooth, uv_layers, vertex_groups, segments)
+
+
+class RG_MeshData:
+    def __init__(
+            self, vertices: np.ndarray, loop_vertex_indices: np.ndarray, loop_starts: np.ndarray, loop_totals: np.ndarray,
+            material_indices: np.ndarray, use_smooth: np.ndarray, uv_layers: dict, vertex_groups: dict,
+            segments: np.ndarray):
+        self.vertices = vertices
+        self.loop_vertex_indices = loop_vertex_indices
+        self.loop_starts = loop_starts
+        self.loop_totals = loop_totals
+        self.material_indices = material_indices
+        self.use_smooth = use_smooth
+        self.uv_layers = uv_layers
+        self.vertex_groups = vertex_groups
+        # The index of the loose part (e.g. a sidewalk segment) of each face
+        self.segments = segments
+
+
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def get_attribute(collection, attribute_name: str, size: int, dtype):
+    values = np.empty(len(collection) * size, dtype=dtype)
+    collection.foreach_get(attribute_name, values)
+
+    return values.reshape(-1, size) if size > 1 else values
+
+
+def get_loose_parts(loop_vertex_indices: np.ndarray, loop_starts: np.ndarray, loop_totals: np.ndarray):
+    # Find the loose parts of the faces by propagating the smallest vertex index over the faces until nothing changes
+    # (faces that share a vertex belong to the same part)
+    if len(loop_starts) == 0:
+        return np.zeros(0, dtype=np.int32), 0
+
+    labels = np.arange(loop_vertex_indices.max() + 1)
+
+    while True:
+        face_labels = np.minimum.reduceat(labels[loop_vertex_indices], loop_starts)
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, loop_vertex_indices, np.repeat(face_labels, loop_totals))
+
+        if np.array_equal(new_labels, labels):
+            break
+
+        labels = new_labels
+
+    parts, face_parts = np.unique(face_labels, return_inverse=True)
+
+    return face_parts.astype(np.int32), len(parts)
+
+
+def get_merged_vertex_map(vertices: np.ndarray, offset: np.ndarray, count: int, threshold: float):
+    # Find for each vertex of a tile the closest vertex of the previous tile within the threshold
+    # (the start cap of a tile is merged with the end cap of the previous tile)
+    kd = kdtree.KDTree(len(vertices))
+
+    for i, vertex in enumerate(vertices):
+        kd.insert(vertex, i)
+
+    kd.balance()
+
+    sources, targets = [], []
+
+    for i, vertex in enumerate(vertices):
+        _, target, distance = kd.find(vertex + offset)
+
+        if target is not None and distance <= threshold:
+            sources.append(i)
+            targets.append(target)
+
+    # Map the merged vertices of each tile to the (already mapped) vertices of the previous tile,
+    # so that vertices which are merged over several tiles end at the first one
+    vertices_number = len(vertices)
+    vertex_map = np.arange(count * vertices_number)
+    sources, targets = np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64)
+
+    for tile_index in range(1, count):
+        vertex_map[tile_index * vertices_number + sources] = vertex_map[(tile_index - 1) * vertices_number + targets]
+
+    return vertex_map
+
+
+def get_vertex_groups(template: bpy.types.Object):
+    # Collect for each vertex group its vertex indices, grouped by their weights
+    weights = {}
+
+    for vertex in template.data.vertices:
+        for group in vertex.groups:
+            group_name = template.vertex_groups[group.group].name
+            weights.setdefault(group_name, {}).setdefault(round(group.weight, 6), []).append(vertex.index)
+
+    return {
+        group_name: [(np.array(indices, dtype=np.int32), weight) for weight, indices in group_weights.items()]
+        for group_name, group_weights in weights.items()}
@@ -1,7 +1,12 @@
 import bpy
 
+from bpy_extras.io_utils import ExportHelper
+
 from roadGen.generators.road_net_generator import RG_RoadNetGenerator
-from roadGen.utils.collection_management import delete_collections_with_objects, switch_collections_visibility
+from roadGen.utils.collection_management import (
+    delete_collections_with_objects, set_collection_visibility, switch_collections_visibility)
+from roadGen.utils.profile_management import get_last_profiler
+from roadGen.utils.regeneration_management import delete_objects_with_source_curves, get_source_curve_names_in_collections
 
 
 # ------------------------------------------------------------------------
@@ -16,7 +21,7 @@ class RG_CreateAll(bpy.types.Operator):
     bl_options = {"REGISTER", "UNDO"}
 
     def execute(self, context):
-        road_net_generator = RG_RoadNetGenerator()
+        road_net_generator = RG_RoadNetGenerator(instanced_furniture=context.scene.rg_instanced_furniture)
         road_net_generator.generate()
 
         collection_names = ["Crossing Points", "Crossroad Curves", "Line Meshes"]
@@ -26,6 +31,25 @@ class RG_CreateAll(bpy.types.Operator):
         return {"FINISHED"}
 
 
+class RG_UpdateAll(bpy.types.Operator):
+    """Regenerate only the roads, crossroads and their dependent objects for curves that changed since the last generation"""
+    bl_label = "Update All"
+    bl_idname = "rg.update_all"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        # The crossing points have to be visible to be found during the generation
+        set_collection_visibility("Crossing Points", True)
+
+        road_net_generator = RG_RoadNetGenerator(
+            incremental=True, instanced_furniture=context.scene.rg_instanced_furniture)
+        road_net_generator.generate()
+
+        set_collection_visibility("Crossing Points", False)
+
+        return {"FINISHED"}
+
+
 class RG_DeleteAll(bpy.types.Operator):
     """Delete all created meshes and the collections themselves"""
     bl_label = "Delete All"
@@ -38,6 +62,10 @@ class RG_DeleteAll(bpy.types.Operator):
         delete_collections_with_objects(collection_names)
         switch_collections_visibility(["Crossing Points"])
 
+        # Delete also the generated side curves that are in the same collection as the original curves
+        generated_curve_names = get_source_curve_names_in_collections(["Curves"])
+        delete_objects_with_source_curves(generated_curve_names, ["Curves"])
+
         return {"FINISHED"}
 
     def invoke(self, context, event):
@@ -46,6 +74,23 @@ class RG_DeleteAll(bpy.types.Operator):
         return wm.invoke_confirm(self, event)
 
 
+class RG_ExportProfile(bpy.types.Operator, ExportHelper):
+    """Export the measured stages, roads and crossroads of the last generation as Chrome trace file"""
+    bl_label = "Export Profile"
+    bl_idname = "rg.export_profile"
+
+    filename_ext = ".json"
+
+    @classmethod
+    def poll(cls, context):
+        return get_last_profiler() is not None
+
+    def execute(self, context):
+        get_last_profiler().export_chrome_trace(self.filepath)
+
+        return {"FINISHED"}
+
+
 # ------------------------------------------------------------------------
 #    Helper Methods
 # ------------------------------------------------------------------------
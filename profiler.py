@@ -0,0 +1,108 @@
+import bpy
+import json
+
+from contextlib import contextmanager
+from time import perf_counter
+
+
+# The types of datablocks whose creation is counted by the profiler
+DATABLOCK_TYPES = ["collections", "curves", "meshes", "node_groups", "objects"]
+
+
+class RG_Profiler:
+    def __init__(self):
+        self.start_time = perf_counter()
+        self.end_time = None
+        self.spans = []
+        self.counters = {}
+        self.datablock_numbers = count_datablocks()
+
+    def count(self, name: str, number: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + number
+
+    def export_chrome_trace(self, filepath: str):
+        # Write the spans as complete events and the counters as counter events of the Chrome trace event format
+        # (the file can be opened in chrome://tracing or ui.perfetto.dev)
+        events = [{
+            "name": span["name"],
+            "cat": span["category"],
+            "ph": "X",
+            "ts": (span["start"] - self.start_time) * 1e6,
+            "dur": span["duration"] * 1e6,
+            "pid": 0,
+            "tid": 0,
+            "args": span["args"]} for span in self.spans]
+
+        end_time = self.end_time if self.end_time is not None else perf_counter()
+        events.append({
+            "name": "Counters", "ph": "C", "ts": (end_time - self.start_time) * 1e6, "pid": 0, "args": self.counters})
+
+        with open(filepath, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+    def get_slowest(self, category: str, number: int = 3):
+        # Sum up the durations of all spans of the category by their names (e.g. all stages of a road)
+        durations = {}
+
+        for span in self.spans:
+            if span["category"] == category:
+                durations[span["name"]] = durations.get(span["name"], 0.0) + span["duration"]
+
+        return sorted(durations.items(), key=lambda item: item[1], reverse=True)[:number]
+
+    def get_summary(self):
+        end_time = self.end_time if self.end_time is not None else perf_counter()
+        summary = [f"Total: {end_time - self.start_time:.2f}s"]
+
+        summary += [f"{span['name']}: {span['duration']:.2f}s" for span in self.spans if span["category"] == "stage"]
+        summary += [f"{name}: {number}" for name, number in sorted(self.counters.items())]
+
+        for category in ["road", "crossroad"]:
+            summary += [f"Slowest {category}: {name} ({duration:.3f}s)" for name, duration in self.get_slowest(category)]
+
+        return summary
+
+    @contextmanager
+    def span(self, name: str, category: str = "stage", **args):
+        span = {"name": name, "category": category, "start": perf_counter(), "duration": 0.0, "args": args}
+
+        # Only the stages remember how many counted calls and datablocks they added
+        if category == "stage":
+            counters = dict(self.counters)
+            datablock_numbers = count_datablocks()
+
+        try:
+            yield span
+        finally:
+            span["duration"] = perf_counter() - span["start"]
+
+            if category == "stage":
+                args.update(get_differences(counters, self.counters))
+                args.update(get_differences(datablock_numbers, count_datablocks(), "Created "))
+
+            self.spans.append(span)
+
+    def stop(self):
+        self.end_time = perf_counter()
+        self.counters.update(get_differences(self.datablock_numbers, count_datablocks(), "Created "))
+
+
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def count_datablocks():
+    return {datablock_type: len(getattr(bpy.data, datablock_type)) for datablock_type in DATABLOCK_TYPES}
+
+
+def get_differences(numbers: dict, other_numbers: dict, prefix: str = ""):
+    differences = {}
+
+    for name, other_number in other_numbers.items():
+        difference = other_number - numbers.get(name, 0)
+
+        if difference:
+            differences[f"{prefix}{name}"] = difference
+
+    return differences
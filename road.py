@@ -1,5 +1,8 @@
 import bpy
+import numpy as np
 
+from roadGen.snapshot import RG_SplineSnapshot
+from roadGen.utils.centreline_management import get_centreline
 from roadGen.utils.curve_management import get_closest_curve_point, get_closest_point
 
 
@@ -26,6 +29,17 @@ class RG_Road:
     def dropped_positions(self, side: str):
         return [int(x) for x in self.curve.get(f"{side} Dropped Kerbs").split(",")]
 
+    def get_centreline(self, side: str = None):
+        # Return the centreline of the curve or of one of its side curves
+        curve = self.curve
+
+        if side == "Left":
+            curve = self.left_curve
+        elif side == "Right":
+            curve = self.right_curve
+
+        return get_centreline(curve.name)
+
     def get_right_curve(self, side: str):
         right_neighbour = (bpy.data.objects.get(self.right_neighbour_of_left_curve) if side == "Left"
                            else bpy.data.objects.get(self.right_neighbour_of_right_curve))
@@ -38,11 +52,10 @@ class RG_Road:
 
         for side in ["Left", "Right"]:
             side_curve = self.left_curve if side == "Left" else self.right_curve
-            point = closest_point - side_curve.location
-            bezier_points = side_curve.data.splines[0].bezier_points
+            point = np.array(closest_point - side_curve.location)
+            points = RG_SplineSnapshot(side_curve.data.splines[0]).points
 
             # For each bezier point of the side curve, calculate the distance between it and the closest point
             # and return the corresponding side curve if it is the same point, i.e. the distance is smaller than a threshold
-            for bezier_point in bezier_points:
-                if (bezier_point.co - point).length < 0.0001:
-                    return side_curve
+            if (np.linalg.norm(points - point, axis=1) < 0.0001).any():
+                return side_curve
@@ -0,0 +1,85 @@
+import bpy
+import numpy as np
+
+from roadGen.core.spline import RG_Spline
+
+
+class RG_SplineSnapshot(RG_Spline):
+    def __init__(self, spline: bpy.types.Spline = None, with_handle_types: bool = False):
+        super().__init__()
+
+        if spline is None:
+            return
+
+        # Read the points and handles of the bezier spline at once into flat buffers
+        bezier_points = spline.bezier_points
+        self.points = read_vectors(bezier_points, "co")
+        self.handles_left = read_vectors(bezier_points, "handle_left")
+        self.handles_right = read_vectors(bezier_points, "handle_right")
+        self.cyclic = spline.use_cyclic_u
+
+        # The handle types are enums that can not be read at once, so only read them if they are needed
+        if with_handle_types:
+            self.handle_left_types = [bezier_point.handle_left_type for bezier_point in bezier_points]
+            self.handle_right_types = [bezier_point.handle_right_type for bezier_point in bezier_points]
+
+    def create_spline(self, curve: bpy.types.Curve):
+        # Replace the spline(s) of the curve by one new spline with the points and handles of the snapshot
+        curve.splines.clear()
+        spline = curve.splines.new(type='BEZIER')
+        spline.bezier_points.add(len(self.points) - 1)
+        self.write(spline)
+
+        return spline
+
+    def write(self, spline: bpy.types.Spline):
+        # Write the points and handles back at once (the spline needs the same number of points)
+        bezier_points = spline.bezier_points
+        write_vectors(bezier_points, "co", self.points)
+        write_vectors(bezier_points, "handle_left", self.handles_left)
+        write_vectors(bezier_points, "handle_right", self.handles_right)
+        spline.use_cyclic_u = self.cyclic
+
+        # Setting the handle types lets Blender recalculate the automatic handles of the spline
+        # (a type of None keeps the current type of the handle)
+        if self.handle_left_types is not None:
+            for bezier_point, handle_left_type, handle_right_type in zip(
+                    bezier_points, self.handle_left_types, self.handle_right_types):
+                if handle_left_type is not None:
+                    bezier_point.handle_left_type = handle_left_type
+                if handle_right_type is not None:
+                    bezier_point.handle_right_type = handle_right_type
+
+
+class RG_MeshSnapshot:
+    def __init__(self, object: bpy.types.Object):
+        self.object = object
+
+        # Read the (local) coordinates of all vertices at once into a flat buffer
+        self.coordinates = read_vectors(object.data.vertices, "co")
+
+    def get_world_coordinates(self):
+        m = np.array(self.object.matrix_world)
+
+        return self.coordinates @ m[:3, :3].T + m[:3, 3]
+
+    def write(self):
+        # Write the (changed) coordinates back at once
+        write_vectors(self.object.data.vertices, "co", self.coordinates)
+        self.object.data.update()
+
+
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def read_vectors(collection, attribute_name: str):
+    values = np.empty(len(collection) * 3, dtype=np.float64)
+    collection.foreach_get(attribute_name, values)
+
+    return values.reshape(-1, 3)
+
+
+def write_vectors(collection, attribute_name: str, vectors: np.ndarray):
+    collection.foreach_set(attribute_name, np.asarray(vectors, dtype=np.float32).ravel())
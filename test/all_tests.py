@@ -2,15 +2,36 @@
 # "C:\Program Files\Blender Foundation\Blender 3.6\blender.exe" -b -noaudio --addons roadGen --python test/all_tests.py -- -v
 
 import bpy
+import json
+import numpy as np
+import os
+import random
+import tempfile
 import unittest
 
+from mathutils import Vector
+
 from roadGen.generators.data_generator import RG_DataGenerator
-from roadGen.generators.road_generator import RG_RoadGenerator
+from roadGen.generators.graph_to_net_generator import RG_GraphToNetGenerator
+from roadGen.generators.road_generator import RG_RoadGenerator, get_paired_vertices
 from roadGen.generators.kerb_generator import RG_KerbGenerator
 from roadGen.generators.sidewalk_generator import RG_SidewalkGenerator
 from roadGen.generators.crossroad_generator import RG_CrossroadGenerator
+from roadGen.generators.road_net_generator import RG_RoadNetGenerator
+from roadGen.centreline import RG_Centreline
+from roadGen.snapshot import RG_SplineSnapshot
+from roadGen.topology import RG_Topology
 from roadGen.utils.collection_management import delete_collections_with_objects, get_crossing_curves, get_crossing_points
+from roadGen.utils.bezier_management import evaluate_curves
+from roadGen.utils.centreline_management import evaluate_curve, export_line_meshes, get_centreline
 from roadGen.utils.curve_management import get_visible_curves
+from roadGen.utils.mesh_management import (
+    calculate_rotation_angles, create_kdtree, create_mesh_from_vertices, edit_mesh_at_positions, get_natural_sort_key,
+    get_object_coordinates)
+from roadGen.utils.polygon_management import calculate_convex_difference, calculate_polygon_area
+from roadGen.utils.profile_management import get_last_profiler
+from roadGen.utils.regeneration_management import get_source_curve_names
+from roadGen.test.benchmarks import create_radial_graph
 
 
 # ------------------------------------------------------------------------
@@ -45,6 +66,60 @@ def delete_custom_properties(object: bpy.types.Object):
         del object[custom_prop_name]
 
 
+def get_empty_placements(object_name: str):
+    # Get the locations, rotations and templates of all emptys that instance the templates of the object
+    collection = bpy.data.collections.get(f"{object_name}s")
+    emptys = [obj for obj in collection.all_objects if obj.instance_type == 'COLLECTION'] if collection else []
+
+    return sorted(
+        (*np.round(empty.location, 4).tolist(), round(empty.rotation_euler[2] % (2 * np.pi), 4),
+         empty.instance_collection.name)
+        for empty in emptys)
+
+
+def get_global_coordinates(obj: bpy.types.Object):
+    m = np.array(obj.matrix_world)
+
+    return get_object_coordinates(obj) @ m[:3, :3].T + m[:3, 3]
+
+
+def get_largest_vertex_distance(vertices: np.ndarray, other_vertices: np.ndarray):
+    # Get the largest distance of a vertex to the closest vertex of the other vertices (in both directions)
+    distances = []
+
+    for first_vertices, second_vertices in [(vertices, other_vertices), (other_vertices, vertices)]:
+        kd = create_kdtree(second_vertices.tolist(), len(second_vertices))
+        distances.extend(kd.find(vertex)[2] for vertex in first_vertices.tolist())
+
+    return max(distances)
+
+
+def get_point_placements(points_object: bpy.types.Object, object_name: str):
+    # Get the locations, rotations and templates of all points that instance the templates of the object
+    mesh = points_object.data
+    coordinates = np.empty(len(mesh.vertices) * 3)
+    mesh.vertices.foreach_get("co", coordinates)
+    rotations = np.empty(len(mesh.vertices) * 3)
+    mesh.attributes["Rotation"].data.foreach_get("vector", rotations)
+    template_indices = np.empty(len(mesh.vertices), dtype=np.int32)
+    mesh.attributes["Template Index"].data.foreach_get("value", template_indices)
+
+    template_names = sorted(
+        [child.name for child in bpy.data.collections[f"{object_name} Instances"].children], key=get_natural_sort_key)
+
+    return sorted(
+        (*np.round(location, 4).tolist(), round(rotation % (2 * np.pi), 4), template_names[index])
+        for location, rotation, index in zip(
+            (points_object.matrix_world @ Vector(co) for co in coordinates.reshape(-1, 3)),
+            rotations.reshape(-1, 3)[:, 2], template_indices))
+
+
+def get_points_objects(object_name: str):
+    prefix = f"{object_name.replace(' ', '_')}_Points_"
+
+    return [obj for obj in bpy.data.objects if obj.name.startswith(prefix)]
+
+
 # ------------------------------------------------------------------------
 #    Tests
 # ------------------------------------------------------------------------
@@ -109,6 +184,7 @@ class TestRoadCreationAndDeletion(unittest.TestCase):
 
     def test_assignAndCreateOneRoad(self):
         self.road_generator.add_geometry(self.curve)
+        self.road_generator.add_lanes()
 
         add_kerbs(self.road_generator.roads)
 
@@ -116,13 +192,74 @@ class TestRoadCreationAndDeletion(unittest.TestCase):
         self.assertIsNotNone(bpy.data.objects.get("Road_Lane_Right_Curve_000"))
         self.assertIsNotNone(bpy.data.objects.get("Kerb_Curve_000_Left"))
         self.assertIsNotNone(bpy.data.objects.get("Kerb_Curve_000_Right"))
-        self.assertIsNotNone(bpy.data.objects.get("Line_Mesh_Curve_000_Left"))
-        self.assertIsNotNone(bpy.data.objects.get("Line_Mesh_Curve_000_Right"))
+        self.assertIsNotNone(get_centreline("Curve_000_Left"))
+        self.assertIsNotNone(get_centreline("Curve_000_Right"))
+        self.assertIsNone(bpy.data.objects.get("Line_Mesh_Curve_000_Left"))
+
+    def test_roadLaneIsQuadStrip(self):
+        self.road_generator.add_geometry(self.curve)
+        self.road_generator.add_lanes()
+
+        for side in ["Left", "Right"]:
+            road_lane = bpy.data.objects.get(f"Road_Lane_{self.curve.name}_{side}")
+            top_faces = [polygon for polygon in road_lane.data.polygons if polygon.normal.z > 0.5]
+
+            self.assertTrue(all(polygon.loop_total == 4 for polygon in road_lane.data.polygons))
+            self.assertEqual(len(top_faces) * 4 + 2, len(road_lane.data.polygons))
+
+    def test_kerbIsDeformedWithoutModifiers(self):
+        self.road_generator.add_geometry(self.curve)
+        self.road_generator.add_lanes()
+
+        add_kerbs(self.road_generator.roads)
+
+        kerb = bpy.data.objects.get("Kerb_Curve_000_Left")
+        kerb_template = bpy.data.objects.get("Kerb")
+
+        self.assertEqual(len(kerb.modifiers), 0)
+        self.assertGreater(len(kerb.data.vertices), len(kerb_template.data.vertices))
+        self.assertEqual(kerb.vertex_groups.keys(), kerb_template.vertex_groups.keys())
+
+    def test_editKerbAtDroppedPositions(self):
+        self.road_generator.add_geometry(self.curve)
+        self.road_generator.add_lanes()
+
+        # Add the kerb without a road so that it has no dropped kerbs yet
+        RG_KerbGenerator().add_geometry(curve=bpy.data.objects.get("Curve_000_Left"))
+
+        kerb = bpy.data.objects.get("Kerb_Curve_000_Left")
+        heights = [vertex.co.z for vertex in kerb.data.vertices]
+
+        edit_mesh_at_positions(kerb.name, [5.0], "Curve_000_Left")
+
+        drops = [height - vertex.co.z for height, vertex in zip(heights, kerb.data.vertices) if height != vertex.co.z]
+
+        self.assertTrue(drops)
+        for drop in drops:
+            self.assertAlmostEqual(drop, 0.135, places=5)
+
+    def test_sidewalkIsSegmented(self):
+        self.road_generator.add_geometry(self.curve)
+        self.road_generator.add_lanes()
+
+        add_kerbs(self.road_generator.roads)
+
+        sidewalk_generator = RG_SidewalkGenerator(offset=bpy.data.objects.get("Kerb").dimensions[1])
+        sidewalk_generator.add_geometry(road=self.road_generator.roads[0], side="Left")
+
+        sidewalk = bpy.data.objects.get("Sidewalk_Curve_000_Left")
+
+        self.assertIsNotNone(sidewalk)
+        self.assertIsNone(bpy.data.collections.get("Sidewalk_Curve_000_Left"))
+        self.assertIsNotNone(sidewalk.data.attributes.get("Segment"))
+        self.assertEqual(self.road_generator.roads[0].sidewalks["Left"], [sidewalk])
 
     def test_CreateAllRoads(self):
         for curve in self.curves:
             self.road_generator.add_geometry(curve)
 
+        self.road_generator.add_lanes()
+
         add_kerbs(self.road_generator.roads)
 
         self.assertIsNotNone(bpy.data.objects.get("Road_Lane_Left_Curve_000"))
@@ -134,19 +271,19 @@ class TestRoadCreationAndDeletion(unittest.TestCase):
         for curve in self.curves:
             self.road_generator.add_geometry(curve)
 
+        self.road_generator.add_lanes()
+
         add_kerbs(self.road_generator.roads)
 
         self.assertIsNotNone(bpy.data.collections.get("Road Lanes"))
         self.assertIsNotNone(bpy.data.collections.get("Kerbs"))
-        self.assertIsNotNone(bpy.data.collections.get("Line Meshes"))
 
-        collections = ["Kerbs", "Line Meshes", "Road Lanes"]
+        collections = ["Kerbs", "Road Lanes"]
 
         delete_collections_with_objects(collections)
 
         self.assertIsNone(bpy.data.collections.get("Road Lanes"))
         self.assertIsNone(bpy.data.collections.get("Kerbs"))
-        self.assertIsNone(bpy.data.collections.get("Line Meshes"))
 
     def test_CreateAllOperator(self):
         bpy.ops.rg.create_all()
@@ -160,17 +297,26 @@ class TestRoadCreationAndDeletion(unittest.TestCase):
         for curve in self.curves:
             self.road_generator.add_geometry(curve)
 
+        self.road_generator.add_lanes()
+
         add_kerbs(self.road_generator.roads)
 
         self.assertIsNotNone(bpy.data.collections.get("Road Lanes"))
         self.assertIsNotNone(bpy.data.collections.get("Kerbs"))
-        self.assertIsNotNone(bpy.data.collections.get("Line Meshes"))
 
         bpy.ops.rg.delete_all()
 
         self.assertIsNone(bpy.data.collections.get("Road Lanes"))
         self.assertIsNone(bpy.data.collections.get("Kerbs"))
-        self.assertIsNone(bpy.data.collections.get("Line Meshes"))
+
+    def test_exportLineMeshes(self):
+        self.road_generator.add_geometry(self.curve)
+        self.road_generator.add_lanes()
+
+        export_line_meshes(["Curve_000_Left"])
+
+        self.assertIsNotNone(bpy.data.objects.get("Line_Mesh_Curve_000_Left"))
+        self.assertIsNotNone(bpy.data.collections.get("Line Meshes"))
 
 
 class TestCrossroadCreation(unittest.TestCase):
@@ -188,6 +334,8 @@ class TestCrossroadCreation(unittest.TestCase):
         for curve in self.curves:
             self.road_generator.add_geometry(curve)
 
+        self.road_generator.add_lanes()
+
         self.kerb_generator = RG_KerbGenerator()
         self.sidewalk_generator = RG_SidewalkGenerator()
 
@@ -201,7 +349,347 @@ class TestCrossroadCreation(unittest.TestCase):
         self.assertIsNotNone(bpy.data.collections.get("Crossroads"))
 
         for crossroad_point in self.crossroad_points:
-            self.assertIsNotNone(bpy.data.objects.get(f"Crossroad_{crossroad_point.name}"))
+            crossroad = bpy.data.objects.get(f"Crossroad_{crossroad_point.name}")
+
+            self.assertIsNotNone(crossroad)
+            self.assertTrue(all(polygon.loop_total <= 4 for polygon in crossroad.data.polygons))
+
+    def test_createCrossroadWithKerbsAndSidewalks(self):
+        crossroad_generator = RG_CrossroadGenerator(self.kerb_generator, self.sidewalk_generator)
+
+        for crossroad_point in self.crossroad_points:
+            curves = get_crossing_curves(crossroad_point)
+            crossroad_generator.add_geometry(curves, crossroad_point)
+
+        # Repeated crossroads are copied, but all of them need their own kerbs and sidewalks
+        for crossroad_curves in crossroad_generator.crossroads.values():
+            for crossroad_curve in crossroad_curves:
+                self.assertIsNotNone(get_centreline(crossroad_curve.name))
+                self.assertIsNotNone(bpy.data.objects.get(f"Kerb_{crossroad_curve.name}"))
+                self.assertIn(crossroad_curve.name, self.sidewalk_generator.sidewalks)
+
+
+class TestCrossroadCopies(unittest.TestCase):
+    def setUp(self):
+        # A radial road net whose crossroads on the inner ring are copies of one junction (rotated by 60 degrees)
+        bpy.ops.wm.open_mainfile(filepath="test/test_data/test_scene.blend")
+        delete_collections_with_objects(["Crossing Points", "Curves"])
+        cleanup()
+
+        RG_GraphToNetGenerator(create_radial_graph(rings=2, spokes=6)).generate()
+
+        curves = get_visible_curves()
+        RG_DataGenerator(curves).create_road_data()
+        road_generator = RG_RoadGenerator()
+
+        for curve in curves:
+            road_generator.add_geometry(curve)
+
+        road_generator.add_lanes()
+
+    def add_crossroads(self, crossroad_points: list):
+        crossroad_generator = RG_CrossroadGenerator(RG_KerbGenerator(), RG_SidewalkGenerator())
+        copied_crossroad_points = []
+
+        for crossroad_point in crossroad_points:
+            copied_crossroads_number = crossroad_generator.copied_crossroads_number
+            crossroad_generator.add_geometry(get_crossing_curves(crossroad_point), crossroad_point)
+
+            if crossroad_generator.copied_crossroads_number > copied_crossroads_number:
+                copied_crossroad_points.append(crossroad_point)
+
+        return crossroad_generator, copied_crossroad_points
+
+    def get_crossroad_geometry(self, crossroad_point: bpy.types.Object, crossroad_generator: RG_CrossroadGenerator):
+        # Get the global vertices of the slab, the centrelines of the crossroad curves and the vertices of their kerbs
+        crossroad_mesh = bpy.data.objects.get(f"Crossroad_{crossroad_point.name}")
+        geometry = {crossroad_mesh.name: get_global_coordinates(crossroad_mesh)}
+
+        for crossroad_curve in crossroad_generator.crossroads[crossroad_mesh.name]:
+            geometry[crossroad_curve.name] = get_centreline(crossroad_curve.name).vertices.copy()
+            kerb = bpy.data.objects.get(f"Kerb_{crossroad_curve.name}")
+            geometry[kerb.name] = get_global_coordinates(kerb)
+
+        return geometry
+
+    def test_copiedCrossroadMatchesGeneratedCrossroad(self):
+        crossroad_generator, copied_crossroad_points = self.add_crossroads(get_crossing_points())
+
+        self.assertGreater(crossroad_generator.copied_crossroads_number, 0)
+
+        crossroad_point = copied_crossroad_points[0]
+        copied_geometry = self.get_crossroad_geometry(crossroad_point, crossroad_generator)
+
+        # Delete the copied crossroad and generate it again without any cached junction
+        for object_name in list(copied_geometry) + [f"Sidewalk_{name}" for name in copied_geometry]:
+            obj = bpy.data.objects.get(object_name)
+
+            if obj:
+                bpy.data.objects.remove(obj)
+
+        crossroad_generator, copied_crossroad_points = self.add_crossroads([crossroad_point])
+        generated_geometry = self.get_crossroad_geometry(crossroad_point, crossroad_generator)
+
+        self.assertEqual(copied_crossroad_points, [])
+        self.assertEqual(sorted(generated_geometry), sorted(copied_geometry))
+
+        for name, vertices in generated_geometry.items():
+            self.assertEqual(len(vertices), len(copied_geometry[name]))
+            self.assertLess(get_largest_vertex_distance(vertices, copied_geometry[name]), 1e-3)
+
+
+class TestCentreline(unittest.TestCase):
+    def setUp(self):
+        self.centreline = RG_Centreline([(0.0, 0.0, 0.0), (3.0, 0.0, 0.0), (3.0, 4.0, 0.0)])
+
+    def test_length(self):
+        self.assertAlmostEqual(self.centreline.length, 7.0)
+
+    def test_pointsAndTangentsAtDistances(self):
+        points = self.centreline.points_at([0.0, 1.5, 5.0, 10.0])
+        tangents = self.centreline.tangents_at([1.5, 5.0])
+        normals = self.centreline.normals_at([1.5])
+
+        self.assertEqual(points.tolist(), [[0.0, 0.0, 0.0], [1.5, 0.0, 0.0], [3.0, 2.0, 0.0], [3.0, 4.0, 0.0]])
+        self.assertEqual(tangents.tolist(), [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+        self.assertEqual(normals.tolist(), [[0.0, 1.0, 0.0]])
+
+    def test_deformAlongCentreline(self):
+        centreline = RG_Centreline([(0.0, 0.0, 0.0), (0.0, 2.0, 0.0), (0.0, 4.0, 0.0)])
+        points = centreline.deform([(1.0, 1.0, 0.5), (5.0, -1.0, 0.0)])
+
+        self.assertEqual(points.tolist(), [[-1.0, 1.0, 0.5], [1.0, 5.0, 0.0]])
+
+    def test_projectPoints(self):
+        distances = self.centreline.project([(1.0, -1.0, 0.0), (4.0, 3.0, 0.0), (-1.0, 0.0, 0.0)], [0, 2, 0])
+
+        self.assertEqual(distances.tolist(), [1.0, 6.0, 0.0])
+
+    def test_pairedVerticesOfCutSideCurve(self):
+        # A side curve with a widening at its start that is cut before the end of the centreline
+        centreline = RG_Centreline([(x, 0.0, 0.0) for x in range(21)])
+        side_centreline = RG_Centreline([(0.0, 6.0, 0.0), (2.5, 6.0, 0.0), (5.0, 4.5, 0.0), (7.5, 3.0, 0.0), (15.0, 3.0, 0.0)])
+
+        inner_vertices, outer_vertices = get_paired_vertices(centreline, side_centreline)
+
+        # Each pair lies on the same orthogonal line and the strip ends where the side curve ends
+        self.assertTrue(np.allclose(inner_vertices[:, 0], outer_vertices[:, 0]))
+        self.assertEqual(inner_vertices[-1].tolist(), [15.0, 0.0, 0.0])
+        self.assertEqual(len(inner_vertices), 18)
+
+
+class TestBezierEvaluation(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.open_mainfile(filepath="test/test_data/test_scene.blend")
+
+        self.curves = get_visible_curves()
+
+    def test_evaluateLikeBlender(self):
+        for curve, (vertices, _, distances) in zip(self.curves, evaluate_curves(self.curves)):
+            self.assertTrue(np.allclose(vertices, evaluate_curve(curve), atol=1e-4))
+            self.assertTrue(np.allclose(distances, RG_Centreline(vertices).distances))
+
+    def test_splineSnapshotRoundTrip(self):
+        curve = self.curves[0]
+        snapshot = RG_SplineSnapshot(curve.data.splines[0], with_handle_types=True)
+        matrix = np.identity(4)
+        matrix[:3, 3] = (1.0, 2.0, 0.0)
+
+        curve_copy = curve.data.copy()
+        snapshot.transform(matrix).create_spline(curve_copy)
+        copied_snapshot = RG_SplineSnapshot(curve_copy.splines[0])
+
+        self.assertTrue(np.allclose(copied_snapshot.points, snapshot.points + (1.0, 2.0, 0.0), atol=1e-5))
+        self.assertTrue(np.allclose(copied_snapshot.handles_left, snapshot.handles_left + (1.0, 2.0, 0.0), atol=1e-5))
+
+
+class TestIncrementalGeneration(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.open_mainfile(filepath="test/test_data/test_scene.blend")
+
+        cleanup()
+        RG_RoadNetGenerator().generate()
+
+    def test_unchangedCurvesAreReused(self):
+        road_lane = bpy.data.objects.get("Road_Lane_Curve_000_Left")
+        pointer = road_lane.as_pointer()
+
+        RG_RoadNetGenerator(incremental=True).generate()
+
+        self.assertEqual(bpy.data.objects.get("Road_Lane_Curve_000_Left").as_pointer(), pointer)
+
+    def test_changedCurveIsRegenerated(self):
+        curve = bpy.data.objects.get("Curve_000")
+        curve["Lane Width"] = 3.0
+        fingerprint = curve.get("Fingerprint")
+
+        RG_RoadNetGenerator(incremental=True).generate()
+
+        self.assertNotEqual(curve.get("Fingerprint"), fingerprint)
+        self.assertIsNotNone(bpy.data.objects.get("Road_Lane_Curve_000_Left"))
+        self.assertIsNone(bpy.data.objects.get("Road_Lane_Curve_000_Left.001"))
+
+    def test_generationIsProfiled(self):
+        filepath = os.path.join(tempfile.mkdtemp(), "trace.json")
+
+        RG_RoadNetGenerator(trace_filepath=filepath).generate()
+
+        with open(filepath) as file:
+            events = json.load(file)["traceEvents"]
+
+        road_names = {event["name"] for event in events if event.get("cat") == "road"}
+        stage_names = {event["name"] for event in events if event.get("cat") == "stage"}
+
+        self.assertIn("Curve_000", road_names)
+        self.assertTrue({"Road data", "Roads", "Kerbs", "Sidewalks"} <= stage_names)
+        self.assertTrue(get_last_profiler().get_summary()[0].startswith("Total:"))
+
+
+class TestRoadFurnitureInstancing(unittest.TestCase):
+    def setUp(self):
+        self.object_names = ["Street Lamp", "Street Name Sign", "Traffic Light", "Traffic Sign"]
+
+    def generate(self, instanced_furniture: bool):
+        # Use the same random traffic signs for both generations
+        bpy.ops.wm.open_mainfile(filepath="test/test_data/test_scene.blend")
+        cleanup()
+        random.seed(0)
+
+        RG_RoadNetGenerator(instanced_furniture=instanced_furniture).generate()
+
+    def test_instancesMatchEmptys(self):
+        self.generate(False)
+        empty_placements = {object_name: get_empty_placements(object_name) for object_name in self.object_names}
+
+        self.generate(True)
+
+        for object_name in self.object_names:
+            points_objects = get_points_objects(object_name)
+
+            if not empty_placements[object_name]:
+                self.assertEqual(points_objects, [])
+                continue
+
+            # One point cloud per object and road with one point per empty
+            point_placements = sorted(
+                placement for points_object in points_objects
+                for placement in get_point_placements(points_object, object_name))
+
+            self.assertEqual(get_empty_placements(object_name), [])
+            self.assertEqual(point_placements, empty_placements[object_name])
+
+        self.assertGreater(sum(len(placements) for placements in empty_placements.values()), 0)
+
+
+    def test_unchangedRoadsKeepTheirInstances(self):
+        self.generate(True)
+        points_objects = [
+            points_object for object_name in self.object_names for points_object in get_points_objects(object_name)]
+        pointers = {points_object.name: points_object.as_pointer() for points_object in points_objects}
+
+        # Only the point clouds that depend on the regenerated roads (at the crossroads of the changed road) are replaced
+        curve = bpy.data.objects.get("Curve_000")
+        curve["Lane Width"] = 3.0
+        curve_names_to_update = RG_Topology().get_dependent_curve_names({curve.name})
+        kept_names = [
+            points_object.name for points_object in points_objects
+            if not get_source_curve_names(points_object) & curve_names_to_update]
+
+        RG_RoadNetGenerator(incremental=True, instanced_furniture=True).generate()
+
+        self.assertGreater(len(kept_names), 0)
+
+        for name in kept_names:
+            self.assertEqual(bpy.data.objects.get(name).as_pointer(), pointers[name])
+
+
+class TestMeshConstruction(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.open_mainfile(filepath="test/test_data/test_scene.blend")
+
+        self.vertices = [Vector((0.0, 0.0, 0.0)), Vector((4.0, 0.0, 0.0)), Vector((4.0, 2.0, 0.0)), Vector((0.0, 2.0, 0.0))]
+
+    def test_createExtrudedMesh(self):
+        mesh = create_mesh_from_vertices(self.vertices, "Crossroad", "Test", 0.1)
+
+        self.assertEqual(len(mesh.data.vertices), 8)
+        self.assertEqual(len(mesh.data.polygons), 6)
+        self.assertEqual(len(mesh.data.edges), 12)
+        self.assertAlmostEqual((mesh.location - Vector((2.0, 1.0, 0.05))).length, 0.0, places=5)
+        self.assertIn(mesh, bpy.data.collections.get("Crossroads").objects[:])
+
+    def test_calculateRotationAngles(self):
+        directions = np.array([(1.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, -1.0, 0.0)])
+        reference_directions = np.array([(0.0, 1.0, 0.0), (0.0, -1.0, 0.0), (0.0, -2.0, 0.0)])
+
+        angles = calculate_rotation_angles(directions, reference_directions)
+
+        self.assertEqual(np.round(angles, 5).tolist(), np.round([np.pi / 2, 3 * np.pi / 2, 0.0], 5).tolist())
+
+    def test_createFlatMesh(self):
+        mesh = create_mesh_from_vertices(self.vertices, "Lot", "Test", reverse=True)
+
+        self.assertEqual(len(mesh.data.vertices), 4)
+        self.assertEqual(len(mesh.data.polygons), 1)
+        self.assertLess(mesh.data.polygons[0].normal.z, 0.0)
+
+    def test_createTriangulatedMesh(self):
+        vertices = self.vertices[:2] + [Vector((4.0, 1.0, 0.0)), Vector((1.0, 1.0, 0.0)), Vector((1.0, 2.0, 0.0))]
+        vertices.append(self.vertices[3])
+        mesh = create_mesh_from_vertices(vertices, "Crossroad", "Test", 0.1, triangulate=True)
+        top_faces = [polygon for polygon in mesh.data.polygons if polygon.normal.z > 0.5]
+
+        self.assertEqual(len(mesh.data.vertices), 12)
+        self.assertEqual(len(top_faces), 4)
+        self.assertEqual(len(mesh.data.polygons), 14)
+        self.assertAlmostEqual(sum(polygon.area for polygon in top_faces), 5.0, places=5)
+
+    def test_naturalSortKey(self):
+        names = ["Traffic Sign 10", "traffic sign 2", "Traffic Sign 1"]
+
+        self.assertEqual(
+            sorted(names, key=get_natural_sort_key), ["Traffic Sign 1", "traffic sign 2", "Traffic Sign 10"])
+
+
+class TestPolygonClipping(unittest.TestCase):
+    def setUp(self):
+        self.square = np.array([(0.0, 0.0), (2.0, 0.0), (2.0, 2.0), (0.0, 2.0)])
+
+    def test_convexDifference(self):
+        pieces = calculate_convex_difference(self.square, self.square + 1.0)
+
+        self.assertAlmostEqual(sum(calculate_polygon_area(piece) for piece in pieces), 3.0)
+
+    def test_convexDifferenceWithoutOverlap(self):
+        pieces = calculate_convex_difference(self.square, self.square + 5.0)
+
+        self.assertEqual(len(pieces), 1)
+        self.assertAlmostEqual(calculate_polygon_area(pieces[0]), 4.0)
+
+    def test_convexDifferenceWithCoveringPolygon(self):
+        pieces = calculate_convex_difference(self.square, self.square * 2.0 - 1.0)
+
+        self.assertEqual(pieces, [])
+
+
+class TestTopology(unittest.TestCase):
+    def setUp(self):
+        bpy.ops.wm.open_mainfile(filepath="test/test_data/test_scene.blend")
+
+        self.crossroad_points = get_crossing_points()
+        self.topology = RG_Topology()
+
+    def test_crossingCurvesAreIndexed(self):
+        self.assertEqual(self.topology.crossing_points, self.crossroad_points)
+
+        for crossroad_point in self.crossroad_points:
+            curves = get_crossing_curves(crossroad_point)
+
+            self.assertEqual(self.topology.get_crossing_curves(crossroad_point), curves)
+
+            for curve in curves:
+                self.assertIn(crossroad_point, self.topology.get_crossing_points_of_curve(curve.name))
+                self.assertNotIn(curve.name, self.topology.get_ordered_neighbours(curve.name, crossroad_point))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,381 @@
+# Run in a command line tool (like git bash):
+# "C:\Program Files\Blender Foundation\Blender 3.6\blender.exe" -b -noaudio --addons roadGen --python test/benchmarks.py -- --sizes small medium
+#
+# Each scenario is generated in its own Blender process (to measure its peak memory) and all results are written to
+# test/benchmark_results.json. Use --baseline to compare them with the results of an earlier run
+# and --update-baseline to store them as new baseline.
+
+import argparse
+import bpy
+import json
+import math
+import numpy as np
+import os
+import subprocess
+import sys
+
+from collections import deque
+from mathutils import Vector
+
+from roadGen.generators.road_net_generator import RG_RoadNetGenerator
+from roadGen.utils.collection_management import delete_collections_with_objects
+from roadGen.utils.profile_management import get_last_profiler
+
+try:
+    import resource
+except ImportError:
+    # There is no resource module on Windows
+    resource = None
+
+
+# The synthetic road networks (by their family and size) with the arguments of their graph functions
+SCENARIOS = {
+    "small": {"grid": {"size": 3}, "radial": {"rings": 2, "spokes": 6}, "random": {"nodes_number": 16, "max_degree": 3}},
+    "medium": {"grid": {"size": 6}, "radial": {"rings": 4, "spokes": 8}, "random": {"nodes_number": 64, "max_degree": 4}},
+    "large": {"grid": {"size": 12}, "radial": {"rings": 8, "spokes": 12}, "random": {"nodes_number": 256, "max_degree": 5}},
+}
+
+# The distance between neighbouring nodes of the synthetic road networks
+SPACING = 100.0
+
+
+class BenchmarkEdge:
+    def __init__(self, points: list, major: bool = False):
+        self.connection = deque(Vector(point[:2]) for point in points)
+        self.major = major
+
+
+class BenchmarkNode:
+    def __init__(self, co: tuple):
+        self.co = Vector(co[:2])
+        self.edges = []
+        self.border_neighbors = []
+        self.curves = []
+
+
+class BenchmarkGraph:
+    # A road network with the same interface as the graphs of RG_GraphToNetGenerator
+    def __init__(self):
+        self.nodes = []
+        self.edges = []
+
+    def add_edge(self, node: BenchmarkNode, other_node: BenchmarkNode, points: list = None, major: bool = False):
+        edge = BenchmarkEdge([node.co] + (points or []) + [other_node.co], major)
+        node.edges.append(edge)
+        other_node.edges.append(edge)
+        self.edges.append(edge)
+
+        return edge
+
+    def add_node(self, co: tuple):
+        node = BenchmarkNode(co)
+        self.nodes.append(node)
+
+        return node
+
+
+# ------------------------------------------------------------------------
+#    Synthetic Road Networks
+# ------------------------------------------------------------------------
+
+
+def create_graph(family: str, seed: int = 0, **args):
+    if family == "grid":
+        return create_grid_graph(**args)
+    elif family == "radial":
+        return create_radial_graph(**args)
+
+    return create_random_planar_graph(seed=seed, **args)
+
+
+def create_grid_graph(size: int):
+    # A size x size grid of straight roads (the roads through the middle are major roads)
+    graph = BenchmarkGraph()
+    nodes = [[graph.add_node((x * SPACING, y * SPACING)) for y in range(size)] for x in range(size)]
+
+    for x in range(size):
+        for y in range(size):
+            if x + 1 < size:
+                graph.add_edge(nodes[x][y], nodes[x + 1][y], major=y == size // 2)
+            if y + 1 < size:
+                graph.add_edge(nodes[x][y], nodes[x][y + 1], major=x == size // 2)
+
+    return graph
+
+
+def create_radial_graph(rings: int, spokes: int):
+    # A city with straight (major) roads from its centre and curved roads along rings around it
+    graph = BenchmarkGraph()
+    centre = graph.add_node((0.0, 0.0))
+    angles = [2 * math.pi * i / spokes for i in range(spokes)]
+    nodes = [[graph.add_node((r * SPACING * math.cos(a), r * SPACING * math.sin(a))) for a in angles]
+             for r in range(1, rings + 1)]
+
+    for r, ring_nodes in enumerate(nodes, start=1):
+        for i, node in enumerate(ring_nodes):
+            graph.add_edge(nodes[r - 2][i] if r > 1 else centre, node, major=True)
+
+            # Follow the ring with some points between two nodes
+            next_angle = angles[i] + 2 * math.pi / spokes
+            points = [(r * SPACING * math.cos(angles[i] + (next_angle - angles[i]) * t),
+                       r * SPACING * math.sin(angles[i] + (next_angle - angles[i]) * t)) for t in (0.25, 0.5, 0.75)]
+            graph.add_edge(node, ring_nodes[(i + 1) % spokes], points)
+
+    return graph
+
+
+def create_random_planar_graph(nodes_number: int, max_degree: int, seed: int = 0):
+    # Randomly moved nodes of a grid that are connected (without crossings) by slightly curved roads,
+    # the shortest possible connections are added first until the nodes reach the maximum degree
+    rng = np.random.default_rng(seed)
+    size = math.ceil(math.sqrt(nodes_number))
+    positions = np.array([(x, y) for x in range(size) for y in range(size)][:nodes_number], dtype=np.float64) * SPACING
+    positions += rng.uniform(-0.25, 0.25, positions.shape) * SPACING
+
+    graph = BenchmarkGraph()
+    nodes = [graph.add_node(tuple(position)) for position in positions]
+    degrees = np.zeros(nodes_number, dtype=np.int64)
+    segments = np.empty((0, 4))
+
+    distances = np.linalg.norm(positions[:, np.newaxis] - positions[np.newaxis], axis=2)
+    first_indices, second_indices = np.nonzero(np.triu(distances < 1.6 * SPACING, k=1))
+
+    for i in np.argsort(distances[first_indices, second_indices]):
+        first, second = first_indices[i], second_indices[i]
+
+        if degrees[first] >= max_degree or degrees[second] >= max_degree:
+            continue
+
+        segment = np.concatenate([positions[first], positions[second]])
+
+        if is_crossing_any_segment(segment, segments):
+            continue
+
+        # Bend the road a little bit to the side
+        midpoint = (positions[first] + positions[second]) / 2
+        direction = positions[second] - positions[first]
+        midpoint += np.array((-direction[1], direction[0])) * rng.uniform(-0.08, 0.08)
+
+        graph.add_edge(nodes[first], nodes[second], [tuple(midpoint)])
+        degrees[[first, second]] += 1
+        segments = np.vstack([segments, segment])
+
+    return graph
+
+
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float, minimum_difference: float = 0.05):
+    # Compare the times, the peak memory and the counts of all scenarios with the baseline
+    regressions = []
+
+    for name, result in results.items():
+        baseline_result = baseline.get(name)
+
+        if baseline_result is None:
+            print(f"{name}: no baseline")
+            continue
+
+        measurements = {f"stage {stage}": duration for stage, duration in result["stages"].items()}
+        measurements["total"] = result["total"]
+        baseline_measurements = {f"stage {stage}": duration for stage, duration in baseline_result["stages"].items()}
+        baseline_measurements["total"] = baseline_result["total"]
+
+        if result["peak_memory"] and baseline_result["peak_memory"]:
+            measurements["peak memory"] = result["peak_memory"]
+            baseline_measurements["peak memory"] = baseline_result["peak_memory"]
+
+        for measurement_name, value in measurements.items():
+            baseline_value = baseline_measurements.get(measurement_name)
+
+            if not baseline_value:
+                continue
+
+            ratio = value / baseline_value
+            is_time = measurement_name != "peak memory"
+            is_regression = ratio > tolerance and (not is_time or value - baseline_value > minimum_difference)
+
+            print(f"{name:<16} {measurement_name:<32} {baseline_value:>12.3f} {value:>12.3f} {ratio:>7.2f}x"
+                  + (" REGRESSION" if is_regression else ""))
+
+            if is_regression:
+                regressions.append((name, measurement_name))
+
+        # The generated geometry should not change without reason
+        for count_name in ["roads", "objects", "vertices"]:
+            if result[count_name] != baseline_result.get(count_name):
+                print(f"{name:<16} {count_name:<32} {baseline_result.get(count_name)!s:>12} {result[count_name]:>12} CHANGED")
+                regressions.append((name, count_name))
+
+    return regressions
+
+
+def count_vertices():
+    return sum(len(mesh.vertices) for mesh in bpy.data.meshes)
+
+
+def get_peak_memory():
+    # The peak memory of the whole Blender process in MB (None if it can not be measured)
+    if resource is None:
+        return None
+
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS bytes
+    return peak_memory / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def is_crossing_any_segment(segment: np.ndarray, segments: np.ndarray, threshold: float = 1e-9):
+    # Check if a 2D segment (x1, y1, x2, y2) crosses other segments (touching at their ends is no crossing)
+    if not len(segments):
+        return False
+
+    p, r = segment[:2], segment[2:] - segment[:2]
+    q, s = segments[:, :2], segments[:, 2:] - segments[:, :2]
+
+    denominators = r[0] * s[:, 1] - r[1] * s[:, 0]
+    is_parallel = np.abs(denominators) < threshold
+    denominators[is_parallel] = 1.0
+
+    t = ((q[:, 0] - p[0]) * s[:, 1] - (q[:, 1] - p[1]) * s[:, 0]) / denominators
+    u = ((q[:, 0] - p[0]) * r[1] - (q[:, 1] - p[1]) * r[0]) / denominators
+
+    return bool(np.any(~is_parallel & (t > 1e-6) & (t < 1 - 1e-6) & (u > 1e-6) & (u < 1 - 1e-6)))
+
+
+def print_scaling(results: dict):
+    # Estimate for each stage how its time grows with the number of roads (as exponent between consecutive sizes)
+    families = {}
+
+    for name, result in results.items():
+        families.setdefault(result["family"], []).append(result)
+
+    for family, family_results in families.items():
+        family_results.sort(key=lambda result: result["roads"])
+
+        for smaller, larger in zip(family_results, family_results[1:]):
+            if not smaller["roads"] or larger["roads"] <= smaller["roads"]:
+                continue
+
+            print(f"\n{family}: {smaller['roads']} -> {larger['roads']} roads")
+
+            for stage, duration in larger["stages"].items():
+                smaller_duration = smaller["stages"].get(stage)
+
+                if smaller_duration and duration:
+                    exponent = math.log(duration / smaller_duration) / math.log(larger["roads"] / smaller["roads"])
+                    print(f"\t{stage:<32} O(n^{exponent:.2f})")
+
+
+def run_in_new_process(name: str, scene_filepath: str, output_filepath: str):
+    # Start a new Blender process for the scenario and read its result
+    subprocess.run([
+        bpy.app.binary_path, "-b", "-noaudio", "--addons", "roadGen", "--python", __file__, "--",
+        "--scenario", name, "--scene", scene_filepath, "--output", output_filepath], check=True)
+
+    with open(output_filepath) as file:
+        return json.load(file)[name]
+
+
+def run_scenario(name: str, scene_filepath: str):
+    size, family = name.split("-")
+    graph = create_graph(family, **SCENARIOS[size][family])
+
+    # Use the templates of the test scene but none of its curves
+    bpy.ops.wm.open_mainfile(filepath=scene_filepath)
+    delete_collections_with_objects(["Crossing Points", "Curves"])
+
+    objects_number = len(bpy.data.objects)
+    vertices_number = count_vertices()
+
+    road_net_generator = RG_RoadNetGenerator(graph)
+    road_net_generator.generate()
+
+    profiler = get_last_profiler()
+
+    return {
+        "family": family,
+        "size": size,
+        "roads": len({span["name"] for span in profiler.spans if span["category"] == "road"}),
+        "total": profiler.end_time - profiler.start_time,
+        "stages": {span["name"]: span["duration"] for span in profiler.spans if span["category"] == "stage"},
+        "counters": profiler.counters,
+        "peak_memory": get_peak_memory(),
+        "objects": len(bpy.data.objects) - objects_number,
+        "vertices": count_vertices() - vertices_number,
+    }
+
+
+def write_results(filepath: str, results: dict):
+    with open(filepath, "w") as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+
+
+# ------------------------------------------------------------------------
+#    Benchmarks
+# ------------------------------------------------------------------------
+
+
+def main(argv: list):
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description="Benchmark the road net generation with synthetic road networks")
+    parser.add_argument("--sizes", nargs="+", choices=list(SCENARIOS), default=["small", "medium"])
+    parser.add_argument("--families", nargs="+", choices=["grid", "radial", "random"], default=["grid", "radial", "random"])
+    parser.add_argument("--scene", default=os.path.join(directory, "test_data", "test_scene.blend"))
+    parser.add_argument("--output", default=os.path.join(directory, "benchmark_results.json"))
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    parser.add_argument("--in-process", action="store_true", help="Run all scenarios in this Blender process")
+    parser.add_argument("--scenario", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    # A started process generates only its scenario
+    if args.scenario:
+        write_results(args.output, {args.scenario: run_scenario(args.scenario, args.scene)})
+        return 0
+
+    results = {}
+
+    for size in args.sizes:
+        for family in args.families:
+            name = f"{size}-{family}"
+            print(f"\n=== Benchmark {name} ===")
+
+            if args.in_process:
+                results[name] = run_scenario(name, args.scene)
+            else:
+                results[name] = run_in_new_process(name, args.scene, f"{args.output}.{name}.json")
+                os.remove(f"{args.output}.{name}.json")
+
+    write_results(args.output, results)
+    print_scaling(results)
+
+    baseline_filepath = args.baseline or os.path.join(directory, "benchmark_baseline.json")
+
+    if args.update_baseline:
+        write_results(baseline_filepath, results)
+        print(f"\nBaseline written to {baseline_filepath}")
+        return 0
+
+    if not os.path.exists(baseline_filepath):
+        print(f"\nNo baseline found at {baseline_filepath} (create one with --update-baseline)")
+        return 0
+
+    with open(baseline_filepath) as file:
+        baseline = json.load(file)
+
+    print(f"\n{'scenario':<16} {'measurement':<32} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    regressions = compare_with_baseline(results, baseline, args.tolerance)
+
+    print(f"\n{len(regressions)} regression(s) compared with the baseline")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []))
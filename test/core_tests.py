@@ -0,0 +1,257 @@
+# Run in a command line tool (like git bash) without Blender:
+# python test/core_tests.py -v
+
+import numpy as np
+import os
+import sys
+import types
+import unittest
+
+# Make the repository importable as package roadGen without the add-on itself (that requires Blender)
+if "roadGen" not in sys.modules:
+    package = types.ModuleType("roadGen")
+    package.__path__ = [os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+    sys.modules["roadGen"] = package
+
+from roadGen.core.bezier import evaluate_bezier_splines
+from roadGen.core.geometry import (
+    get_candidate_box_pairs, get_candidate_segment_pairs, get_closest_point_indices, get_distinct_point_indices,
+    get_intersection_with_circle, get_polyline_intersections, get_rotation_matrix,
+    remove_points_from_polyline_intersections)
+from roadGen.core.junction import calculate_crossroad_curve_handles, calculate_crossroad_signature, sort_outer_points
+from roadGen.core.lane import calculate_offset_spline, calculate_side_spline
+from roadGen.core.lot import remove_close_vertices, walk_lot
+from roadGen.core.spline import RG_Spline
+
+
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def create_straight_spline(points_number: int, distance: float = 5.0):
+    points = np.array([(distance * i, 0.0, 0.0) for i in range(points_number)])
+
+    return RG_Spline(points, points - (distance / 3, 0.0, 0.0), points + (distance / 3, 0.0, 0.0))
+
+
+# ------------------------------------------------------------------------
+#    Test Cases
+# ------------------------------------------------------------------------
+
+
+class TestSpline(unittest.TestCase):
+    def setUp(self):
+        self.spline = create_straight_spline(4)
+
+    def test_shiftMovesHandlesWithPoints(self):
+        shifted = self.spline.shift(np.array([(0.0, 1.0, 0.0)] * 4))
+
+        self.assertTrue(np.allclose(shifted.points[:, 1], 1.0))
+        self.assertTrue(np.allclose(shifted.handles_right - shifted.points, self.spline.handles_right - self.spline.points))
+        self.assertTrue(np.allclose(self.spline.points[:, 1], 0.0))
+
+    def test_appendAddsHandleTypes(self):
+        spline = self.spline.select([0, 1]).append((7.0, 0.0, 0.0), (6.0, 0.0, 0.0), (8.0, 0.0, 0.0), 'FREE', 'FREE')
+
+        self.assertEqual(len(spline.points), 3)
+        self.assertEqual(spline.handle_left_types, [None, None, 'FREE'])
+        self.assertEqual(spline.handles_right[-1].tolist(), [8.0, 0.0, 0.0])
+
+    def test_transformRotatesPointsAndHandles(self):
+        matrix = np.identity(4)
+        matrix[:3, :3] = get_rotation_matrix(np.pi / 2)
+        matrix[:3, 3] = (1.0, 0.0, 0.0)
+
+        transformed = self.spline.transform(matrix)
+
+        self.assertTrue(np.allclose(transformed.points[:, 0], 1.0))
+        self.assertTrue(np.allclose(transformed.points[:, 1], self.spline.points[:, 0]))
+        self.assertTrue(np.allclose(transformed.handles_left[:, 1], self.spline.handles_left[:, 0]))
+
+
+class TestBezier(unittest.TestCase):
+    def test_evaluateStraightSplines(self):
+        points = np.array([(0.0, 0.0, 0.0), (6.0, 0.0, 0.0), (0.0, 0.0, 0.0), (0.0, 3.0, 0.0)])
+        handles_left = points - points / 3
+        handles_right = points + np.array([(2.0, 0.0, 0.0), (2.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 1.0, 0.0)])
+
+        positions, tangents, normals, distances, sample_counts = evaluate_bezier_splines(
+            points, handles_left, handles_right, [2, 2], resolution=4)
+
+        self.assertEqual(sample_counts.tolist(), [5, 5])
+        self.assertAlmostEqual(distances[4], 6.0)
+        self.assertAlmostEqual(distances[9], 3.0)
+        self.assertEqual(np.round(tangents[5], 5).tolist(), [0.0, 1.0, 0.0])
+        self.assertEqual(np.round(normals[0], 5).tolist(), [0.0, 1.0, 0.0])
+
+    def test_evaluateCyclicSpline(self):
+        points = np.array([(0.0, 0.0, 0.0), (4.0, 0.0, 0.0), (4.0, 4.0, 0.0)])
+
+        positions, _, _, distances, sample_counts = evaluate_bezier_splines(
+            points, points.copy(), points.copy(), [3], [True], resolution=2)
+
+        self.assertEqual(sample_counts.tolist(), [6])
+        self.assertEqual(positions[[0, 2, 4]].tolist(), points.tolist())
+        self.assertAlmostEqual(distances[-1], 4.0 + 4.0 + 2.0 * np.sqrt(2.0))
+
+
+class TestGeometry(unittest.TestCase):
+    def setUp(self):
+        # A polyline with a loop (the first and the last segment cross each other at (2, 0))
+        self.points = np.array([(0.0, 0.0, 0.0), (3.0, 0.0, 0.0), (3.0, 2.0, 0.0), (2.0, 2.0, 0.0), (2.0, -1.0, 0.0)])
+
+    def test_polylineSelfIntersection(self):
+        segment_pairs, intersections = get_polyline_intersections(self.points)
+
+        self.assertEqual(segment_pairs.tolist(), [[0, 3]])
+        self.assertEqual(np.round(intersections[0], 5).tolist(), [2.0, 0.0, 0.0])
+
+    def test_polylineIntersectionWithOtherSegment(self):
+        segment_pairs, intersections = get_polyline_intersections(self.points, [(2.5, -1.0, 0.0)], [(2.5, 3.0, 0.0)])
+
+        self.assertEqual(segment_pairs.tolist(), [[0, 3], [0, 4], [2, 4]])
+        self.assertEqual(np.round(intersections[2], 5).tolist(), [2.5, 2.0, 0.0])
+
+    def test_verticalPolylineIsSweptAlongItsLength(self):
+        # A zigzag along the y-axis whose segments all overlap along the x-axis
+        points = np.array([((i % 2) * 1.0, i * 1.0, 0.0) for i in range(50)])
+        starts, ends = points[:-1], points[1:]
+
+        pairs = get_candidate_segment_pairs(starts, ends)
+
+        self.assertEqual(pairs.tolist(), [[i, i + 1] for i in range(48)])
+
+    def test_stackedBoxesArePairedInGrid(self):
+        # Long boxes above each other overlap all along the sweep axis (so the grid is used instead)
+        minimums = np.array([(0.0, i * 0.5) for i in range(100)])
+        maximums = minimums + (100.0, 0.6)
+
+        pairs = get_candidate_box_pairs(minimums, maximums)
+
+        self.assertEqual(sorted(pairs.tolist()), [[i, i + 1] for i in range(99)])
+
+    def test_intersectionsAreRemappedAfterRemovingPoints(self):
+        points = np.concatenate([self.points, [(1.0, -2.0, 0.0), (1.0, 3.0, 0.0)]])
+        segment_pairs, intersections = get_polyline_intersections(points)
+
+        # Remove the points 2 and 3 of the loop
+        remaining_points = points[[0, 1, 4, 5, 6]]
+        remapped = remove_points_from_polyline_intersections(remaining_points, segment_pairs, intersections, 1, 2)
+        expected = get_polyline_intersections(remaining_points)
+
+        self.assertEqual(remapped[0].tolist(), expected[0].tolist())
+        self.assertTrue(np.allclose(remapped[1], expected[1]))
+
+    def test_overlappingBoxesArePaired(self):
+        # Boxes along the y-axis (the third box overlaps the others only along x and y but not along z)
+        # and an empty box
+        minimums = np.array([(0.0, 0.0, 0.0), (0.5, 0.9, 0.0), (0.0, 1.5, 2.0), (0.0, 1.8, 0.5), (np.inf,) * 3])
+        maximums = np.array([(1.0, 1.0, 1.0), (1.5, 1.9, 1.0), (1.0, 2.5, 3.0), (1.0, 2.8, 1.5), (-np.inf,) * 3])
+
+        self.assertEqual(sorted(get_candidate_box_pairs(minimums, maximums).tolist()), [[0, 1], [1, 3]])
+
+    def test_closePointsAreRemovedAcrossCells(self):
+        # The second point is in another cell than the first one but still too close to it
+        points = np.array([(0.14, 0.0, 0.0), (0.16, 0.0, 0.0), (0.31, 0.0, 0.0), (0.01, 0.01, 0.0)])
+
+        self.assertEqual(get_distinct_point_indices(points, 0.15).tolist(), [0, 2])
+
+    def test_closestPointsAreFoundInNeighbouringAndFarCells(self):
+        points = np.array([(0.0, 0.0, 0.0), (0.9, 0.0, 0.0), (2.0, 0.0, 0.0), (10.0, 0.0, 0.0)])
+        query_points = np.array([(0.95, 0.1, 0.0), (9.0, 0.0, 0.0)])
+
+        closest_indices = get_closest_point_indices(points, query_points, 2, 1.0)
+
+        self.assertEqual(closest_indices.tolist(), [[1, 0], [3, 2]])
+
+    def test_intersectionWithCircle(self):
+        intersection = get_intersection_with_circle((0.0, 0.0, 0.0), (10.0, 0.0, 0.0), (0.0, 0.0, 0.0), 4.0)
+
+        self.assertEqual(np.round(intersection, 5).tolist(), [4.0, 0.0, 0.0])
+
+
+class TestLane(unittest.TestCase):
+    def test_offsetSplineWithTurningLane(self):
+        original = create_straight_spline(9)
+
+        new, first_widening_index, last_widening_index, sharp_vertex_indices = calculate_offset_spline(
+            original, 10.0, 3.0, 1, False)
+
+        self.assertEqual(new.points[:, 1].tolist(), [6.0, 6.0, 4.5, 3.0, 3.0, 3.0, 3.0, 3.0, 3.0])
+        self.assertTrue(np.allclose(new.handles_right - new.points, original.handles_right - original.points))
+        self.assertEqual((first_widening_index, last_widening_index), (3, 1))
+        self.assertEqual(sharp_vertex_indices, [])
+
+    def test_sideSplineHasHandleTypeForEachPoint(self):
+        spline = calculate_side_spline(create_straight_spline(9), 10.0, 3.0, 1, False)
+
+        self.assertEqual(len(spline.handle_left_types), len(spline.points))
+        self.assertEqual(len(spline.handle_right_types), len(spline.points))
+        self.assertTrue(np.allclose(spline.points[2:, 1], 3.0))
+
+
+class TestJunction(unittest.TestCase):
+    def setUp(self):
+        # The outer points of a T-junction (with a straight through road) around the crossroad point
+        self.names = ["Curve_000_Left", "Curve_001_Right", "Curve_001_Left", "Curve_002_Right"]
+        self.points = np.array([(5.0, 3.0, 0.0), (-5.0, 3.0, 0.0), (-5.0, -3.0, 0.0), (5.0, -3.0, 0.0)])
+        self.directions = np.array([(1.0, 0.0, 0.0), (-1.0, 0.0, 0.0), (-1.0, 0.0, 0.0), (1.0, 0.0, 0.0)])
+        self.centre = np.zeros(3)
+
+    def test_signatureIsInvariantUnderRotation(self):
+        signature, _, angle = calculate_crossroad_signature(
+            self.names, self.points, self.directions, self.centre, ("Crossroad",))
+
+        rotation = get_rotation_matrix(0.7)
+        rotated_signature, _, rotated_angle = calculate_crossroad_signature(
+            self.names, self.points @ rotation.T, self.directions @ rotation.T, self.centre, ("Crossroad",))
+
+        self.assertEqual(signature, rotated_signature)
+        self.assertAlmostEqual(rotated_angle - angle, 0.7, places=5)
+
+    def test_outerPointsAreSortedCounterClockwise(self):
+        order = [2, 0, 3, 1]
+        names, points = sort_outer_points([self.names[i] for i in order], [self.points[i] for i in order], self.centre)
+
+        self.assertEqual(names, ["Curve_001_Left", "Curve_002_Right", "Curve_000_Left", "Curve_001_Right"])
+        self.assertEqual(np.array(points).tolist(), self.points[[2, 3, 0, 1]].tolist())
+
+    def test_crossroadCurveHandlesFollowDirections(self):
+        handles = calculate_crossroad_curve_handles(self.points[:2], -self.directions[:2])
+
+        self.assertEqual(handles.tolist(), [[0.0, 3.0, 0.0], [0.0, 3.0, 0.0]])
+
+
+class TestLot(unittest.TestCase):
+    def setUp(self):
+        # Three roads around a triangular lot (each side curve has the next side curve as right neighbour)
+        self.road_names = ["Curve_000", "Curve_001", "Curve_002"]
+        self.right_neighbours = {
+            ("Curve_000", "Left"): "Curve_001_Right",
+            ("Curve_001", "Right"): "Curve_002_Left",
+            ("Curve_002", "Left"): "Curve_000_Left",
+        }
+
+    def test_closedLotIsFound(self):
+        lot_road_names, steps = walk_lot("Curve_000", "Left", self.right_neighbours, self.road_names)
+
+        self.assertEqual(lot_road_names, {"Left": ["Curve_000", "Curve_002"], "Right": ["Curve_001"]})
+        self.assertEqual([(step.road_name, step.side) for step in steps],
+                         [("Curve_000", "Left"), ("Curve_001", "Right"), ("Curve_002", "Left")])
+        self.assertEqual(steps[0].crossroad_curve_name, "Crossroad_Curve_Curve_000_Left_Curve_001_Right")
+
+    def test_openLotIsNotFound(self):
+        del self.right_neighbours[("Curve_002", "Left")]
+
+        self.assertEqual(walk_lot("Curve_000", "Left", self.right_neighbours, self.road_names), (None, None))
+        self.assertEqual(walk_lot("Curve_000", "Right", self.right_neighbours, self.road_names), (None, None))
+
+    def test_closeVerticesAreRemoved(self):
+        vertices = [(0.0, 0.0, 0.0), (0.001, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1.0, 0.0), (0.0, 0.0, 0.0)]
+
+        self.assertEqual(remove_close_vertices(vertices).tolist(), [[0.001, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,268 @@
+# Run in a command line tool (like git bash):
+# "C:\Program Files\Blender Foundation\Blender 3.6\blender.exe" -b -noaudio --addons roadGen --python test/microbenchmarks.py -- --max-size 100000
+#
+# Each kernel is timed with synthetic inputs of increasing size (from 10 vertices on) and the complexity that fits
+# the times best is compared with the expected complexity of the kernel. The results are written to
+# test/microbenchmark_results.json and the script exits with 1 if a kernel scales worse than expected.
+
+import argparse
+import bpy
+import json
+import math
+import numpy as np
+import os
+import sys
+
+from mathutils import Vector
+from time import perf_counter
+
+from roadGen.centreline import RG_Centreline
+from roadGen.snapshot import RG_SplineSnapshot
+from roadGen.utils.centreline_management import add_centreline, clear_centrelines
+from roadGen.utils.curve_management import get_closest_curve_point, sort_curves
+from roadGen.utils.intersection_management import get_intersecting_meshes
+from roadGen.utils.mesh_management import (
+    calculate_optimal_distance, edit_mesh_at_positions, find_closest_points, get_line_mesh_length)
+
+
+# The complexity models (ordered by their growth) that are fitted to the measured times
+COMPLEXITY_MODELS = {
+    "O(1)": lambda n: np.ones_like(n),
+    "O(log n)": lambda n: np.log(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * np.log(n),
+    "O(n^2)": lambda n: n ** 2,
+}
+
+
+# ------------------------------------------------------------------------
+#    Synthetic Inputs
+# ------------------------------------------------------------------------
+
+
+def setup_calculate_optimal_distance(size: int):
+    return lambda: calculate_optimal_distance(float(size), 7.0), []
+
+
+def setup_edit_mesh_at_positions(size: int):
+    # A strip of vertices along a straight centreline with some dropped positions on it
+    vertices = np.zeros((size, 3))
+    vertices[:, 0] = np.linspace(0.0, 100.0, size)
+    vertices[:, 1] = np.tile([0.0, 0.3], size)[:size]
+    vertices[:, 2] = 0.4
+
+    mesh = create_mesh("Benchmark_Kerb", vertices)
+    add_centreline("Benchmark_Reference", RG_Centreline(np.array([(0.0, 0.0, 0.0), (100.0, 0.0, 0.0)])))
+    positions = list(np.linspace(5.0, 95.0, 20))
+
+    return lambda: edit_mesh_at_positions(mesh.name, positions, "Benchmark_Reference"), [mesh]
+
+
+def setup_find_closest_points(size: int):
+    rng = np.random.default_rng(0)
+    points = [Vector(point) for point in rng.uniform(-100.0, 100.0, (size, 3))]
+
+    return lambda: find_closest_points(points, points[0]), []
+
+
+def setup_get_closest_curve_point(size: int):
+    curve = create_curve("Benchmark_Curve", np.stack([np.arange(size), np.zeros(size), np.zeros(size)], axis=1))
+
+    return lambda: get_closest_curve_point(curve, Vector((-1.0, 0.0, 0.0)), True), [curve]
+
+
+def setup_get_intersecting_meshes(size: int):
+    # A row of grid meshes (with the vertices split between them) where each mesh overlaps its neighbours
+    meshes_number = 8
+    side = max(int(math.sqrt(size / meshes_number)), 2)
+    meshes = []
+
+    for i in range(meshes_number):
+        x, y = np.meshgrid(np.linspace(0.0, 12.0, side) + i * 10.0, np.linspace(0.0, 12.0, side))
+        vertices = np.stack([x.ravel(), y.ravel(), np.zeros(side * side)], axis=1)
+        meshes.append(create_mesh(f"Benchmark_Mesh_{i}", vertices, side))
+
+    return lambda: get_intersecting_meshes(meshes), meshes
+
+
+def setup_get_line_mesh_length(size: int):
+    add_centreline("Benchmark_Line", RG_Centreline(np.stack([np.arange(size), np.zeros(size), np.zeros(size)], axis=1)))
+
+    return lambda: get_line_mesh_length("Benchmark_Line"), []
+
+
+def setup_sort_curves(size: int):
+    # Curves that end around a crossing point (the size is the number of curves)
+    angles = np.linspace(0.0, 2 * math.pi, size, endpoint=False)
+    directions = np.stack([np.cos(angles), np.sin(angles), np.zeros(size)], axis=1)
+    curves = [create_curve(f"Benchmark_Curve_{i}", np.array([direction * 20.0, direction * 60.0]))
+              for i, direction in enumerate(directions)]
+    curve_names = [curve.name for curve in curves]
+
+    return lambda: sort_curves(curve_names, Vector((0.0, 0.0, 0.0))), curves
+
+
+# The kernels with their inputs, their expected complexity and their largest size
+KERNELS = {
+    "sort_curves": (setup_sort_curves, "O(n log n)", 10000),
+    "get_closest_curve_point": (setup_get_closest_curve_point, "O(1)", 100000),
+    "find_closest_points": (setup_find_closest_points, "O(n log n)", 100000),
+    "get_intersecting_meshes": (setup_get_intersecting_meshes, "O(n log n)", 100000),
+    "edit_mesh_at_positions": (setup_edit_mesh_at_positions, "O(n log n)", 100000),
+    "calculate_optimal_distance": (setup_calculate_optimal_distance, "O(1)", 100000),
+    "get_line_mesh_length": (setup_get_line_mesh_length, "O(1)", 100000),
+}
+
+
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def create_curve(name: str, points: np.ndarray):
+    curve = bpy.data.curves.new(name, 'CURVE')
+
+    snapshot = RG_SplineSnapshot()
+    snapshot.points = snapshot.handles_left = snapshot.handles_right = np.asarray(points, dtype=np.float64)
+    snapshot.handle_left_types = snapshot.handle_right_types = ['VECTOR'] * len(points)
+    snapshot.create_spline(curve)
+
+    obj = bpy.data.objects.new(name, curve)
+    bpy.context.scene.collection.objects.link(obj)
+
+    return obj
+
+
+def create_mesh(name: str, vertices: np.ndarray, side: int = 0):
+    # Create a mesh of the vertices (with the quads of a side x side grid if there is a side)
+    faces = []
+
+    if side:
+        indices = np.arange(side * side).reshape(side, side)
+        faces = np.stack([indices[:-1, :-1], indices[:-1, 1:], indices[1:, 1:], indices[1:, :-1]], axis=2)
+        faces = faces.reshape(-1, 4).tolist()
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(vertices.tolist(), [], faces)
+
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+
+    return obj
+
+
+def fit_complexity(sizes: np.ndarray, times: np.ndarray, significance: float = 0.5):
+    # Fit each model (times = a * f(n) + b with a >= 0) and take the one with the smallest relative error,
+    # a faster growing model is only taken if it reduces the error significantly
+    errors = {}
+
+    for name, model in COMPLEXITY_MODELS.items():
+        values = model(sizes.astype(np.float64))
+        a, b = np.linalg.lstsq(np.stack([values, np.ones_like(values)], axis=1), times, rcond=None)[0]
+
+        if a < 0.0:
+            a, b = 0.0, times.mean()
+
+        errors[name] = float(np.sum(((a * values + b - times) / times) ** 2))
+
+    complexity = "O(1)"
+
+    for name, error in errors.items():
+        if error < errors[complexity] * significance:
+            complexity = name
+
+    # The exponent of the growth between the smallest and the largest size (as additional hint)
+    exponent = math.log(times[-1] / times[0]) / math.log(sizes[-1] / sizes[0])
+
+    return complexity, exponent
+
+
+def get_sizes(max_size: int, min_size: int = 10):
+    # Two sizes per decade (10, 31, 100, 316, ...)
+    decades = math.log10(max_size / min_size)
+
+    return np.unique(np.geomspace(min_size, max_size, int(round(decades * 2)) + 1).astype(np.int64))
+
+
+def measure(function, minimum_time: float = 0.1, minimum_repeats: int = 3):
+    # Call the function until the minimum time is reached and return the fastest call
+    times = []
+    start = perf_counter()
+
+    while len(times) < minimum_repeats or perf_counter() - start < minimum_time:
+        t = perf_counter()
+        function()
+        times.append(perf_counter() - t)
+
+    return min(times)
+
+
+def remove_objects(objects: list):
+    for obj in objects:
+        data = obj.data
+        bpy.data.objects.remove(obj)
+
+        if isinstance(data, bpy.types.Mesh):
+            bpy.data.meshes.remove(data)
+        elif isinstance(data, bpy.types.Curve):
+            bpy.data.curves.remove(data)
+
+    clear_centrelines()
+
+
+def run_kernel(name: str, max_size: int):
+    setup, expected_complexity, kernel_max_size = KERNELS[name]
+    sizes = get_sizes(min(max_size, kernel_max_size))
+    times = []
+
+    for size in sizes:
+        function, objects = setup(int(size))
+        times.append(measure(function))
+        remove_objects(objects)
+
+    complexity, exponent = fit_complexity(sizes, np.array(times))
+    models = list(COMPLEXITY_MODELS)
+
+    return {
+        "sizes": sizes.tolist(),
+        "times": times,
+        "complexity": complexity,
+        "expected_complexity": expected_complexity,
+        "exponent": exponent,
+        "regression": models.index(complexity) > models.index(expected_complexity),
+    }
+
+
+# ------------------------------------------------------------------------
+#    Microbenchmarks
+# ------------------------------------------------------------------------
+
+
+def main(argv: list):
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description="Measure how the kernels of the utils scale with their input size")
+    parser.add_argument("--kernels", nargs="+", choices=list(KERNELS), default=list(KERNELS))
+    parser.add_argument("--max-size", type=int, default=100000)
+    parser.add_argument("--output", default=os.path.join(directory, "microbenchmark_results.json"))
+    args = parser.parse_args(argv)
+
+    results = {}
+
+    print(f"{'kernel':<28} {'sizes':>14} {'largest time':>14} {'fitted':>12} {'expected':>12} {'exponent':>9}")
+
+    for name in args.kernels:
+        result = results[name] = run_kernel(name, args.max_size)
+
+        print(f"{name:<28} {result['sizes'][0]:>6}-{result['sizes'][-1]:<7} {result['times'][-1] * 1000:>12.3f}ms "
+              f"{result['complexity']:>12} {result['expected_complexity']:>12} {result['exponent']:>9.2f}"
+              + (" REGRESSION" if result["regression"] else ""))
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    return 1 if any(result["regression"] for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []))
@@ -0,0 +1,129 @@
+import bpy
+
+from roadGen.utils.collection_management import get_crossing_curves, get_crossing_points
+from roadGen.utils.curve_management import get_closest_curve_point
+
+
+class RG_Topology:
+    def __init__(self):
+        self.crossing_points = get_crossing_points()
+        self.curves_of_crossing_point = {}
+        self.crossing_points_of_curve = {}
+        self.ordered_curve_names_of_crossing_point = {}
+        self.right_neighbours = {}
+        self.roads = {}
+
+        # Read the custom properties of every crossroad point only once and remember which curves belong to it
+        for crossroad_point in self.crossing_points:
+            curves = get_crossing_curves(crossroad_point)
+            curves_number = int(crossroad_point["Number of Curves"])
+            ordered_curve_names = [crossroad_point.get(f"Curve {i}") for i in range(1, curves_number + 1)]
+
+            self.curves_of_crossing_point[crossroad_point.name] = curves
+            self.ordered_curve_names_of_crossing_point[crossroad_point.name] = ordered_curve_names
+
+            for curve in curves:
+                if curve.name not in self.crossing_points_of_curve:
+                    self.crossing_points_of_curve[curve.name] = []
+                self.crossing_points_of_curve[curve.name].append(crossroad_point)
+
+        # Calculate the right neighbour of each curve side at each of its crossroad points
+        for crossroad_point in self.crossing_points:
+            for curve in self.curves_of_crossing_point[crossroad_point.name]:
+                for side in ["Left", "Right"]:
+                    right_neighbour = calculate_right_neighbour_curve_of_curve(
+                        curve, crossroad_point, self.ordered_curve_names_of_crossing_point[crossroad_point.name], side)
+                    self.right_neighbours[(curve.name, crossroad_point.name, side)] = right_neighbour
+
+    def add_road(self, road):
+        self.roads[road.curve.name] = road
+
+    def get_crossing_curves(self, crossroad_point: bpy.types.Object):
+        return self.curves_of_crossing_point.get(crossroad_point.name, [])
+
+    def get_crossing_curve_names(self, crossroad_point: bpy.types.Object):
+        return [curve.name for curve in self.get_crossing_curves(crossroad_point)]
+
+    def get_dependent_curve_names(self, curve_names: set):
+        # Return the passed curve names together with the names of all curves that share a crossroad point with them
+        dependent_curve_names = set(curve_names)
+
+        for curve_name in curve_names:
+            for crossroad_point in self.get_crossing_points_of_curve(curve_name):
+                dependent_curve_names.update(self.get_crossing_curve_names(crossroad_point))
+
+        return dependent_curve_names
+
+    def get_crossing_points_of_curve(self, curve_name: str):
+        return self.crossing_points_of_curve.get(curve_name, [])
+
+    def get_ordered_neighbours(self, curve_name: str, crossroad_point: bpy.types.Object):
+        # Return the curves of the crossroad point in their (sorted) order, beginning with the curve after the passed one
+        curve_names = self.ordered_curve_names_of_crossing_point.get(crossroad_point.name, [])
+
+        if curve_name not in curve_names:
+            return []
+
+        index = curve_names.index(curve_name)
+
+        return curve_names[index + 1:] + curve_names[:index]
+
+    def get_right_neighbour(self, curve_name: str, crossroad_point: bpy.types.Object, side: str):
+        return self.right_neighbours.get((curve_name, crossroad_point.name, side), "")
+
+    def get_road_by_side_curve_name(self, side_curve_name: str):
+        return self.roads.get(side_curve_name.rpartition('_')[0])
+
+
+# ------------------------------------------------------------------------
+#    Helper Methods
+# ------------------------------------------------------------------------
+
+
+def calculate_right_neighbour_curve_of_curve(
+        curve: bpy.types.Object, crossroad_point: bpy.types.Object, ordered_curve_names: list, side: str):
+    total_number_of_curves = len(ordered_curve_names)
+
+    # Find the index of the passed curve in the (sorted) curve names of the crossroad point
+    for i, crv_name in enumerate(ordered_curve_names, start=1):
+        # Get the right neighbour of the passed curve when we reached the correct curve in properties of the crossroad point
+        if crv_name == curve.name:
+            neighbour_index = i + 1 if i < total_number_of_curves else 1
+            right_neighbour_curve_name = ordered_curve_names[neighbour_index - 1]
+            right_neighbour_curve = bpy.data.objects.get(right_neighbour_curve_name)
+
+            if right_neighbour_curve:
+                reference_point = crossroad_point.location
+                curve_point = get_closest_curve_point(curve, reference_point, True)
+                first_point = curve.matrix_world @ curve.data.splines[0].bezier_points[0].co
+                last_point = curve.matrix_world @ curve.data.splines[0].bezier_points[-1].co
+
+                # Only possibly return the right neighbour curve if it is the correct side
+                if side == "Left" and curve_point == first_point or side == "Right" and curve_point == last_point:
+                    # Get the normalized direction vector for the curve point and the crossroad point
+                    direction = reference_point - curve_point
+                    direction.normalize()
+
+                    # Get the normalized direction vector for the curve point of the right neighbour and the crossroad point
+                    right_neighbour_point = get_closest_curve_point(right_neighbour_curve, reference_point, True)
+                    right_neighbour_direction = reference_point - right_neighbour_point
+                    right_neighbour_direction.normalize()
+
+                    # Calculate the cross product between the two direction vectors to check
+                    # whether the right neighbour is really right to the current road and not, for example, straight
+                    cross_prod = right_neighbour_direction.cross(direction)
+
+                    # Round the z-axis of the cross product to obtain also a not quite exact right-hand curve
+                    # (or to avoid floating point issues)
+                    if round(cross_prod.z, 1) < 0:
+                        right_neighbour_first_point = (right_neighbour_curve.matrix_world @
+                                                       right_neighbour_curve.data.splines[0].bezier_points[0].co)
+
+                        if right_neighbour_point == right_neighbour_first_point:
+                            right_neighbour_closest_side = "Right"
+                        else:
+                            right_neighbour_closest_side = "Left"
+
+                        return f"{right_neighbour_curve_name}_{right_neighbour_closest_side}"
+
+    return ""
@@ -0,0 +1,73 @@
+import bpy
+import numpy as np
+
+from roadGen.core.bezier import evaluate_bezier_splines
+from roadGen.snapshot import RG_SplineSnapshot
+
+
+def evaluate_curves(curves: list):
+    # Evaluate the bezier splines of all curves at once (grouped by the resolution of each spline) in world space
+    # and return the evaluated vertices, unit tangents and cumulative distances of each curve
+    spline_data = [read_bezier_splines(curve) for curve in curves]
+    points, handles_left, handles_right, point_counts, cyclic, resolutions = (
+        np.concatenate([data[j] for data in spline_data]) if spline_data else np.empty(0) for j in range(6))
+
+    spline_samples = [None] * len(point_counts)
+
+    for resolution in np.unique(resolutions):
+        spline_indices = np.flatnonzero(resolutions == resolution)
+        is_selected = np.repeat(resolutions == resolution, point_counts)
+
+        positions, tangents, _, distances, sample_counts = evaluate_bezier_splines(
+            points[is_selected], handles_left[is_selected], handles_right[is_selected], point_counts[spline_indices],
+            cyclic[spline_indices], int(resolution))
+
+        # Split the samples again into the samples of each spline
+        splits = np.cumsum(sample_counts)[:-1]
+
+        for i, samples in zip(spline_indices, zip(*(np.split(a, splits) for a in (positions, tangents, distances)))):
+            spline_samples[i] = samples
+
+    # Join the samples of the splines of each curve (the distances of a following spline continue after the gap to it)
+    curve_samples = []
+    spline_index = 0
+
+    for data in spline_data:
+        samples = spline_samples[spline_index:spline_index + len(data[3])]
+        spline_index += len(data[3])
+
+        if len(samples) == 1:
+            curve_samples.append(samples[0])
+            continue
+
+        vertices, tangents, distances = [np.empty((0, 3))], [np.empty((0, 3))], [np.empty(0)]
+        offset = 0.0
+
+        for spline_vertices, spline_tangents, spline_distances in samples:
+            if len(vertices[-1]) and len(spline_vertices):
+                offset += np.linalg.norm(spline_vertices[0] - vertices[-1][-1])
+
+            vertices.append(spline_vertices)
+            tangents.append(spline_tangents)
+            distances.append(spline_distances + offset)
+            offset += spline_distances[-1] if len(spline_distances) else 0.0
+
+        curve_samples.append((np.concatenate(vertices), np.concatenate(tangents), np.concatenate(distances)))
+
+    return curve_samples
+
+
+def read_bezier_splines(curve: bpy.types.Object):
+    # Read the points and handles of all bezier splines of the curve at once and transform them into world space
+    m = np.array(curve.matrix_world)
+    splines = list(curve.data.splines)
+    snapshots = [RG_SplineSnapshot(spline).transform(m) for spline in splines]
+
+    points, handles_left, handles_right = (
+        np.concatenate([getattr(snapshot, name) for snapshot in snapshots]) if snapshots else np.empty((0, 3))
+        for name in ["points", "handles_left", "handles_right"])
+    point_counts = np.array([len(snapshot.points) for snapshot in snapshots], dtype=np.int64)
+    cyclic = np.array([snapshot.cyclic for snapshot in snapshots], dtype=bool)
+    resolutions = np.array([spline.resolution_u for spline in splines], dtype=np.int64)
+
+    return points, handles_left, handles_right, point_counts, cyclic, resolutions
@@ -0,0 +1,95 @@
+import bpy
+import numpy as np
+
+from roadGen.centreline import RG_Centreline
+from roadGen.utils.bezier_management import evaluate_curves
+from roadGen.utils.collection_management import link_to_collection
+from roadGen.utils.regeneration_management import get_source_curve_names, tag_object
+
+
+# Store of the centrelines (evaluated curves with their arc-length tables) for one generation run
+centrelines = {}
+
+
+def add_centreline(curve_name: str, centreline: RG_Centreline):
+    # Place an already known centreline (e.g. a transformed copy of another one) in the store without evaluating the curve
+    centrelines[curve_name] = centreline
+
+    return centrelines[curve_name]
+
+
+def add_centrelines(curves: list):
+    # Evaluate all passed curves once and (re)place their centrelines in the store
+    # (the bezier curves are evaluated together with NumPy, other curves by Blender)
+    bezier_curves = [curve for curve in curves if all(spline.type == 'BEZIER' for spline in curve.data.splines)]
+    bezier_curve_names = {curve.name for curve in bezier_curves}
+
+    for curve, (vertices, tangents, distances) in zip(bezier_curves, evaluate_curves(bezier_curves)):
+        centrelines[curve.name] = RG_Centreline(vertices, tangents, distances)
+
+    for curve in curves:
+        if curve.name not in bezier_curve_names:
+            centrelines[curve.name] = RG_Centreline(evaluate_curve(curve))
+
+    return [centrelines[curve.name] for curve in curves]
+
+
+def clear_centrelines():
+    centrelines.clear()
+
+
+def evaluate_curve(curve: bpy.types.Object):
+    # Create a temporary mesh of the curve, read all its vertices at once and release the mesh again
+    mesh = curve.to_mesh()
+    vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+    mesh.vertices.foreach_get("co", vertices)
+    curve.to_mesh_clear()
+
+    m = np.array(curve.matrix_world)
+
+    return vertices.reshape(-1, 3) @ m[:3, :3].T + m[:3, 3]
+
+
+def export_line_meshes(curve_names: list = None):
+    # Create line mesh objects of the stored centrelines (e.g. for debugging)
+    line_meshes = []
+
+    for curve_name in curve_names if curve_names is not None else list(centrelines.keys()):
+        centreline = centrelines.get(curve_name)
+
+        # Skip curves without centreline or with an already exported (and still valid) line mesh
+        if centreline is None or bpy.data.objects.get(f"Line_Mesh_{curve_name}"):
+            continue
+
+        vertices_number = len(centreline.vertices)
+        edges = [(i, i + 1) for i in range(vertices_number - 1)]
+
+        mesh = bpy.data.meshes.new(f"Line_Mesh_{curve_name}")
+        mesh.from_pydata(centreline.vertices.tolist(), edges, [])
+        line_mesh = bpy.data.objects.new(f"Line_Mesh_{curve_name}", mesh)
+        link_to_collection(line_mesh, "Line Meshes")
+
+        # The line mesh depends on the same curves as its curve (or on the curve itself for original curves)
+        curve = bpy.data.objects.get(curve_name)
+
+        if curve:
+            tag_object(line_mesh, get_source_curve_names(curve) or {curve_name})
+
+        line_meshes.append(line_mesh)
+
+    return line_meshes
+
+
+def get_centreline(curve_name: str):
+    centreline = centrelines.get(curve_name)
+
+    if centreline is None:
+        # Evaluate curves that have not been added (yet) on demand
+        curve = bpy.data.objects.get(curve_name)
+
+        if not curve or curve.type != 'CURVE':
+            return None
+
+        centreline = add_centrelines([curve])[0]
+
+    return centreline
@@ -1,5 +1,14 @@
 import bpy
 
+from roadGen.utils.profile_management import count
+
+
+# Cache of the collections (by their names and the names of their child collections) to link objects to
+cached_collections = {}
+
+# Objects that are linked to their collections at once (by their collection names and child collection names)
+queued_objects = {}
+
 
 def count_empty_objects_in_collection(collection):
     counter = 0
@@ -90,16 +99,6 @@ def get_crossing_points():
     return [marker for marker in markers if marker.visible_get() and int(marker["Number of Curves"]) > 1]
 
 
-def get_first_and_last_objects_from_collections(collection_names: list, number_of_objects: int):
-    objects = []
-    for collection_name in collection_names:
-        collection = bpy.data.collections[collection_name]
-        objects.extend(collection.objects[:number_of_objects])
-        objects.extend(collection.objects[-number_of_objects:])
-
-    return objects
-
-
 def get_subcollection_names_of_collection_by_name(collection_name: str, filter_name: str):
     subcollection_names = []
     collection = bpy.data.collections.get(collection_name)
@@ -112,7 +111,17 @@ def get_subcollection_names_of_collection_by_name(collection_name: str, filter_n
     return subcollection_names
 
 
-def link_to_collection(object: bpy.types.Object, collection_name: str, child_collection_name: str = None):
+def get_collection(collection_name: str, child_collection_name: str = None):
+    # Use the cached collection if it still exists, otherwise get (or create) it and cache it
+    key = (collection_name, child_collection_name)
+    collection = cached_collections.get(key)
+
+    try:
+        if collection and collection.name == (child_collection_name or collection_name):
+            return collection
+    except ReferenceError:
+        pass
+
     collection = bpy.data.collections.get(collection_name)
 
     if collection is None:
@@ -129,7 +138,35 @@ def link_to_collection(object: bpy.types.Object, collection_name: str, child_col
 
         collection = child_collection
 
-    collection.objects.link(object)
+    cached_collections[key] = collection
+
+    return collection
+
+
+def link_queued_objects():
+    # Link all queued objects to their collections and update the scene only once
+    if not queued_objects:
+        return
+
+    for (collection_name, child_collection_name), objects in queued_objects.items():
+        collection = get_collection(collection_name, child_collection_name)
+
+        for object in objects:
+            collection.objects.link(object)
+
+    queued_objects.clear()
+
+    bpy.context.view_layer.update()
+    count("View layer updates")
+
+
+def link_to_collection(object: bpy.types.Object, collection_name: str, child_collection_name: str = None):
+    get_collection(collection_name, child_collection_name).objects.link(object)
+
+
+def queue_link_to_collection(object: bpy.types.Object, collection_name: str, child_collection_name: str = None):
+    # Remember the object to link it together with all other queued objects (see link_queued_objects)
+    queued_objects.setdefault((collection_name, child_collection_name), []).append(object)
 
 
 def get_objects_from_collection(collection_name: str, subcollections: bool = False):
@@ -146,6 +183,14 @@ def get_objects_from_collection(collection_name: str, subcollections: bool = Fal
     return []
 
 
+def set_collection_visibility(collection_name: str, visible: bool):
+    collection = bpy.data.collections.get(collection_name)
+
+    if collection:
+        coll = bpy.context.view_layer.layer_collection.children[collection_name]
+        coll.hide_viewport = not visible
+
+
 def switch_collection_visibility(collection_name: str):
     collection = bpy.data.collections.get(collection_name)
 
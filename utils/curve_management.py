@@ -1,7 +1,10 @@
 import bpy
+import numpy as np
 
 from mathutils import Vector
 
+from roadGen.snapshot import RG_SplineSnapshot
+
 
 def get_closest_curve_point(curve: bpy.types.Object, reference_point: Vector, in_global_co: bool = False):
     # Get the curve end points in world space
@@ -33,16 +36,12 @@ def get_closest_point(points: list, reference_point: Vector):
     return closest_point
 
 
-def get_total_curve_length(curve: bpy.types.Object = None, bezier_points: list = None):
-    total_length = 0
-
+def get_total_curve_length(curve: bpy.types.Object = None, points: np.ndarray = None):
+    # Sum up the distances between the bezier points (read at once from the first spline of the curve)
     if curve:
-        bezier_points = curve.data.splines[0].bezier_points
-
-    for i in range(len(bezier_points) - 1):
-        total_length += (bezier_points[i].co - bezier_points[i + 1].co).length
+        points = RG_SplineSnapshot(curve.data.splines[0]).points
 
-    return total_length
+    return float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
 
 
 def get_visible_curves():
@@ -0,0 +1,355 @@
+import bpy
+import numpy as np
+
+from mathutils import bvhtree
+
+from roadGen.core.geometry import get_candidate_box_pairs, normalize
+from roadGen.utils.mesh_management import (
+    SEGMENT_ATTRIBUTE_NAME,
+    calculate_prism_data,
+    get_object_coordinates,
+    get_vertex_segments,
+    write_mesh_data,
+    write_outside_attributes)
+from roadGen.utils.polygon_management import (
+    calculate_convex_difference,
+    calculate_convex_hull,
+    calculate_distances_to_polygon_edges,
+    calculate_polygon_area)
+
+
+def calculate_face_normals(
+        coordinates: np.ndarray, loop_vertex_indices: np.ndarray, loop_starts: np.ndarray, loop_totals: np.ndarray):
+    # Calculate the normals of all faces at once (Newell's method, also for non-planar faces)
+    loops = np.arange(len(loop_vertex_indices))
+    next_loops = loops + 1
+    face_ends = loop_starts + loop_totals - 1
+    next_loops[face_ends] = loop_starts
+
+    vertices = coordinates[loop_vertex_indices]
+    crosses = np.cross(vertices, vertices[next_loops])
+
+    return normalize(np.add.reduceat(crosses, loop_starts, axis=0)) if len(loop_starts) else np.zeros((0, 3))
+
+
+def create_bvhtree(mesh: bpy.types.Object, coordinates: np.ndarray):
+    # Create a BVH tree of the mesh in global space from its (already read) coordinates
+    loop_vertex_indices = np.empty(len(mesh.data.loops), dtype=np.int32)
+    mesh.data.loops.foreach_get("vertex_index", loop_vertex_indices)
+    loop_starts = np.empty(len(mesh.data.polygons), dtype=np.int32)
+    mesh.data.polygons.foreach_get("loop_start", loop_starts)
+
+    polygons = [polygon.tolist() for polygon in np.split(loop_vertex_indices, loop_starts[1:])] if len(loop_starts) else []
+
+    return bvhtree.BVHTree.FromPolygons(coordinates.tolist(), polygons)
+
+
+def get_intersecting_meshes(meshes: list):
+    intersecting_meshes = {}
+
+    # Read the global coordinates and the bounding box of each mesh once
+    coordinates = []
+    minimums = []
+    maximums = []
+
+    for mesh in meshes:
+        m = np.array(mesh.matrix_world)
+        mesh_coordinates = get_object_coordinates(mesh) @ m[:3, :3].T + m[:3, 3]
+        coordinates.append(mesh_coordinates)
+
+        if len(mesh_coordinates):
+            minimums.append(mesh_coordinates.min(axis=0))
+            maximums.append(mesh_coordinates.max(axis=0))
+        else:
+            minimums.append(np.full(3, np.inf))
+            maximums.append(np.full(3, -np.inf))
+
+    # Only check the meshes with overlapping bounding boxes that do not belong together
+    groups = [get_intersection_group(mesh) for mesh in meshes]
+    candidate_pairs = get_candidate_box_pairs(np.reshape(minimums, (-1, 3)), np.reshape(maximums, (-1, 3)))
+    pairs = [(i, j) for (i, j) in candidate_pairs.tolist() if groups[i] != groups[j]]
+
+    # Create the BVH tree of each mesh only once (and only if it is necessary)
+    trees = {}
+    neighbours = {}
+
+    for i, j in pairs:
+        for index in [i, j]:
+            if index not in trees:
+                trees[index] = create_bvhtree(meshes[index], coordinates[index])
+
+        # Get the intersecting parts (indices) between the BVH trees
+        if trees[i].overlap(trees[j]):
+            neighbours.setdefault(i, set()).add(j)
+            neighbours.setdefault(j, set()).add(i)
+
+    # Keep the order of the passed meshes for the intersecting meshes
+    for index, mesh in enumerate(meshes):
+        if index in neighbours:
+            intersecting_meshes[mesh] = [meshes[other_index] for other_index in sorted(neighbours[index])]
+
+    return intersecting_meshes
+
+
+def get_intersection_group(mesh: bpy.types.Object):
+    # Separated meshes (e.g. of a sidewalk) in their own collection belong together (except the ones of crossroads)
+    collection = mesh.users_collection[0]
+
+    if "Crossroad" in collection.name or not mesh.name.startswith(collection.name):
+        return mesh
+
+    return collection
+
+
+def get_prismatic_footprints(mesh: bpy.types.Object, coordinates: np.ndarray, threshold: float = 0.001):
+    # Get for each segment (or the whole mesh) its convex footprint, its lowest and highest z-coordinate and its bounds
+    # (the footprint is None if the segment is not a convex prism, e.g. a dropped sidewalk)
+    vertex_segments = get_vertex_segments(mesh)
+
+    if vertex_segments is None:
+        vertex_segments = np.zeros(len(coordinates), dtype=np.int32)
+
+    footprints = {}
+
+    for segment in np.unique(vertex_segments[vertex_segments >= 0]):
+        segment_coordinates = coordinates[vertex_segments == segment]
+        heights = np.unique(np.round(segment_coordinates[:, 2] / threshold).astype(np.int64))
+        footprint = calculate_convex_hull(segment_coordinates)
+
+        is_prism = len(heights) == 2 and len(footprint) >= 3
+        if is_prism:
+            is_prism = calculate_distances_to_polygon_edges(segment_coordinates, footprint).max() <= threshold
+
+        footprints[segment] = (
+            footprint if is_prism else None, heights.min() * threshold, heights.max() * threshold,
+            segment_coordinates.min(axis=0), segment_coordinates.max(axis=0))
+
+    return footprints, vertex_segments
+
+
+def get_segment_end_points(points: np.ndarray):
+    # Get the two points that are furthest apart (in 2D) of points that lie (roughly) on a line
+    first_index = np.argmax(np.linalg.norm(points[:, :2] - points[0, :2], axis=1))
+    second_index = np.argmax(np.linalg.norm(points[:, :2] - points[first_index, :2], axis=1))
+
+    return points[[first_index, second_index], :2]
+
+
+def is_overlapping(minimum: np.ndarray, maximum: np.ndarray, other_minimum: np.ndarray, other_maximum: np.ndarray):
+    return bool(np.all(minimum[:2] <= other_maximum[:2]) and np.all(other_minimum[:2] <= maximum[:2]))
+
+
+def project_uvs(
+        coordinates: np.ndarray, loop_vertex_indices: np.ndarray, loop_starts: np.ndarray, loop_totals: np.ndarray,
+        faces: np.ndarray, uv_layers: dict, new_coordinates: np.ndarray, new_loop_vertex_indices: np.ndarray,
+        new_loop_starts: np.ndarray, new_loop_totals: np.ndarray):
+    # Project the loops of the new faces into the uv space of the replaced face with the most similar plane
+    # (an affine map from the positions to the uvs is fitted to the loops of the replaced face)
+    normals = calculate_face_normals(coordinates, loop_vertex_indices, loop_starts, loop_totals)[faces]
+    centres = np.array([
+        coordinates[loop_vertex_indices[loop_starts[face]:loop_starts[face] + loop_totals[face]]].mean(axis=0)
+        for face in faces])
+    new_normals = calculate_face_normals(new_coordinates, new_loop_vertex_indices, new_loop_starts, new_loop_totals)
+    new_uvs = {name: np.zeros((len(new_loop_vertex_indices), 2), dtype=np.float32) for name in uv_layers}
+
+    for new_normal, new_loop_start, new_loop_total in zip(new_normals, new_loop_starts, new_loop_totals):
+        new_loops = np.arange(new_loop_start, new_loop_start + new_loop_total)
+        positions = new_coordinates[new_loop_vertex_indices[new_loops]]
+
+        # Take the closest plane of the replaced faces with the most similar normal
+        similarities = normals @ new_normal
+        candidates = np.where(similarities >= similarities.max() - 1e-3)[0]
+        plane_distances = np.abs(np.sum((positions.mean(axis=0) - centres[candidates]) * normals[candidates], axis=1))
+        face = faces[candidates[np.argmin(plane_distances)]]
+
+        # Fit the affine map to the loops of the replaced face
+        # (relative to the centre of the replaced face, so that the positions are projected onto its plane)
+        loops = np.arange(loop_starts[face], loop_starts[face] + loop_totals[face])
+        centre = coordinates[loop_vertex_indices[loops]].mean(axis=0)
+        face_positions = np.column_stack([coordinates[loop_vertex_indices[loops]] - centre, np.ones(len(loops))])
+
+        for name, uvs in uv_layers.items():
+            affine_map = np.linalg.lstsq(face_positions, uvs[loops], rcond=None)[0]
+            new_uvs[name][new_loops] = np.column_stack([positions - centre, np.ones(len(positions))]) @ affine_map
+
+    return new_uvs
+
+
+def read_mesh_data(mesh: bpy.types.Mesh):
+    # Read the faces, material indices, smooth flags, uvs and vertex group weights of a mesh
+    loop_vertex_indices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertex_indices)
+    loop_starts = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_starts)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_indices)
+    use_smooth = np.empty(len(mesh.polygons), dtype=bool)
+    mesh.polygons.foreach_get("use_smooth", use_smooth)
+
+    uv_layers = {}
+    for uv_layer in mesh.uv_layers:
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uvs)
+        uv_layers[uv_layer.name] = uvs.reshape(-1, 2)
+
+    weights = {}
+    for vertex in mesh.vertices:
+        for group in vertex.groups:
+            weights.setdefault(group.group, {})[vertex.index] = group.weight
+
+    return loop_vertex_indices, loop_starts, loop_totals, material_indices, use_smooth, uv_layers, weights
+
+
+def replace_mesh_segments(
+        mesh: bpy.types.Object, vertex_segments: np.ndarray, replaced_segments: dict, threshold: float = 0.001):
+    # Replace the faces of the passed segments with new prisms (given in global space) and keep the rest of the mesh
+    m = np.array(mesh.matrix_world)
+    m_inverted = np.linalg.inv(m)
+    coordinates = get_object_coordinates(mesh)
+    global_coordinates = coordinates @ m[:3, :3].T + m[:3, 3]
+    loop_vertex_indices, loop_starts, loop_totals, material_indices, use_smooth, uv_layers, weights = read_mesh_data(
+        mesh.data)
+
+    face_segments = vertex_segments[loop_vertex_indices[loop_starts]]
+    kept_faces = ~np.isin(face_segments, list(replaced_segments.keys()))
+    kept_loops = np.repeat(kept_faces, loop_totals)
+
+    # Keep only the vertices that are still used by a face
+    kept_vertices = np.zeros(len(coordinates), dtype=bool)
+    kept_vertices[loop_vertex_indices[kept_loops]] = True
+    new_indices = np.cumsum(kept_vertices) - 1
+
+    new_coordinates = [coordinates[kept_vertices]]
+    new_loop_vertex_indices = [new_indices[loop_vertex_indices[kept_loops]]]
+    new_loop_totals = [loop_totals[kept_faces]]
+    new_material_indices = [material_indices[kept_faces]]
+    new_use_smooth = [use_smooth[kept_faces]]
+    new_segments = [face_segments[kept_faces]]
+    new_uvs = {name: [uvs[kept_loops]] for name, uvs in uv_layers.items()}
+    new_weights = {
+        group_index: {int(new_indices[index]): weight for index, weight in group_weights.items() if kept_vertices[index]}
+        for group_index, group_weights in weights.items()}
+
+    vertices_number = int(kept_vertices.sum())
+
+    for segment, (polygons, bottom, top) in replaced_segments.items():
+        segment_vertices = np.where(vertex_segments == segment)[0]
+        segment_faces = np.where(face_segments == segment)[0]
+        material_index = material_indices[segment_faces[0]] if len(segment_faces) else 0
+        is_smooth = use_smooth[segment_faces[0]] if len(segment_faces) else False
+
+        for polygon in polygons:
+            # Extrude the footprint again and transform it into the space of the mesh
+            vertices = np.column_stack([polygon, np.full(len(polygon), bottom)])
+            prism_coordinates, prism_loops, prism_starts, prism_totals = calculate_prism_data(vertices, top - bottom)
+
+            # Assign the new vertices to the vertex groups of the old vertices they lie on (e.g. the outside vertices)
+            for group_index, group_weights in weights.items():
+                group_vertices = [index for index in segment_vertices if index in group_weights]
+
+                if len(group_vertices) < 2:
+                    continue
+
+                group_coordinates = global_coordinates[group_vertices]
+                distances = calculate_distances_to_polygon_edges(
+                    prism_coordinates, get_segment_end_points(group_coordinates))
+                heights = np.round(group_coordinates[:, 2] / threshold)
+                is_in_group = (distances <= threshold) & np.isin(np.round(prism_coordinates[:, 2] / threshold), heights)
+
+                for index in np.where(is_in_group)[0]:
+                    new_weights[group_index][vertices_number + int(index)] = group_weights[group_vertices[0]]
+
+            prism_coordinates = prism_coordinates @ m_inverted[:3, :3].T + m_inverted[:3, 3]
+
+            new_coordinates.append(prism_coordinates)
+            new_loop_vertex_indices.append(prism_loops + vertices_number)
+            new_loop_totals.append(prism_totals)
+            new_material_indices.append(np.full(len(prism_totals), material_index))
+            new_use_smooth.append(np.full(len(prism_totals), is_smooth))
+            new_segments.append(np.full(len(prism_totals), segment))
+
+            # Keep the uv mapping of the replaced faces for the new faces
+            if len(segment_faces):
+                prism_uvs = project_uvs(
+                    coordinates, loop_vertex_indices, loop_starts, loop_totals, segment_faces, uv_layers,
+                    prism_coordinates, prism_loops, prism_starts, prism_totals)
+
+                for name in new_uvs:
+                    new_uvs[name].append(prism_uvs[name])
+            else:
+                for name in new_uvs:
+                    new_uvs[name].append(np.zeros((len(prism_loops), 2), dtype=np.float32))
+
+            vertices_number += len(prism_coordinates)
+
+    # Write the new geometry with its segments, material indices, smooth flags, uvs and vertex groups into the mesh
+    loop_totals = np.concatenate(new_loop_totals)
+    mesh.data.clear_geometry()
+    write_mesh_data(
+        mesh.data, np.concatenate(new_coordinates), np.concatenate(new_loop_vertex_indices),
+        np.concatenate([[0], np.cumsum(loop_totals)[:-1]]), loop_totals)
+    mesh.data.polygons.foreach_set("material_index", np.concatenate(new_material_indices).astype(np.int32))
+    mesh.data.polygons.foreach_set("use_smooth", np.concatenate(new_use_smooth).astype(bool))
+
+    segment_attribute = mesh.data.attributes.get(SEGMENT_ATTRIBUTE_NAME)
+    if not segment_attribute:
+        segment_attribute = mesh.data.attributes.new(SEGMENT_ATTRIBUTE_NAME, 'INT', 'FACE')
+    segment_attribute.data.foreach_set("value", np.concatenate(new_segments).astype(np.int32))
+
+    for name, uvs in new_uvs.items():
+        uv_layer = mesh.data.uv_layers.get(name) or mesh.data.uv_layers.new(name=name)
+        uv_layer.data.foreach_set("uv", np.concatenate(uvs).ravel())
+
+    # Add the vertices of each vertex group at once per weight
+    for group_index, group_weights in new_weights.items():
+        vertex_group = mesh.vertex_groups[group_index]
+        indices_by_weight = {}
+
+        for index, weight in group_weights.items():
+            indices_by_weight.setdefault(weight, []).append(index)
+
+        for weight, indices in indices_by_weight.items():
+            vertex_group.add(indices, weight, 'REPLACE')
+
+    write_outside_attributes(mesh.data, {
+        mesh.vertex_groups[group_index].name: list(group_weights.keys())
+        for group_index, group_weights in new_weights.items()})
+
+
+def subtract_mesh_footprint(mesh: bpy.types.Object, clip_mesh: bpy.types.Object):
+    # Subtract the footprint of the clip mesh from the prismatic segments of the mesh in 2D and extrude them again
+    # (returns False without any changes if a non-prismatic segment is affected so that the Boolean modifier has to be used)
+    coordinates = []
+    for obj in [mesh, clip_mesh]:
+        m = np.array(obj.matrix_world)
+        coordinates.append(get_object_coordinates(obj) @ m[:3, :3].T + m[:3, 3])
+
+    footprints, vertex_segments = get_prismatic_footprints(mesh, coordinates[0])
+    clip_footprints, _ = get_prismatic_footprints(clip_mesh, coordinates[1])
+    replaced_segments = {}
+
+    for segment, (footprint, bottom, top, minimum, maximum) in footprints.items():
+        polygons = [footprint]
+
+        for clip_footprint, _, _, clip_minimum, clip_maximum in clip_footprints.values():
+            # Only the clip segments that overlap the bounds of the segment are relevant
+            if not is_overlapping(minimum, maximum, clip_minimum, clip_maximum):
+                continue
+
+            if footprint is None or clip_footprint is None:
+                return False
+
+            polygons = [piece for polygon in polygons for piece in calculate_convex_difference(polygon, clip_footprint)]
+
+        if footprint is not None:
+            area = sum(calculate_polygon_area(polygon) for polygon in polygons)
+
+            if abs(area - calculate_polygon_area(footprint)) > 1e-6:
+                replaced_segments[segment] = (polygons, bottom, top)
+
+    if replaced_segments:
+        replace_mesh_segments(mesh, vertex_segments, replaced_segments)
+
+    return True
@@ -1,13 +1,37 @@
 import bmesh
 import bpy
 import math
+import numpy as np
 import random
+import re
 
-from mathutils import bvhtree, kdtree, Vector
+from mathutils import geometry, kdtree, Matrix, Vector
 
+from roadGen.furniture_template import RG_FurnitureTemplate
+from roadGen.mesh_template import RG_MeshData, RG_MeshTemplate
 from roadGen.road import RG_Road
-from roadGen.utils.collection_management import get_subcollection_names_of_collection_by_name, link_to_collection
+from roadGen.snapshot import RG_MeshSnapshot, RG_SplineSnapshot
+from roadGen.utils.centreline_management import get_centreline
+from roadGen.utils.collection_management import (
+    get_subcollection_names_of_collection_by_name, link_to_collection, queue_link_to_collection)
 from roadGen.utils.curve_management import get_closest_curve_point
+from roadGen.utils.profile_management import call_operator
+
+
+# Name of the face attribute with the index of the loose part (segment) of meshes that are created from templates
+SEGMENT_ATTRIBUTE_NAME = "Segment"
+
+# Name of the boolean point attribute with the vertices of the vertex group Outside_Left or Outside_Right
+# (e.g. of the sidewalks) that can be read at once (unlike the vertex groups of the vertices)
+OUTSIDE_ATTRIBUTE_NAME = "Is Outside {}"
+
+# Names of the point attributes of the road furniture points that are instanced with geometry nodes
+ROTATION_ATTRIBUTE_NAME = "Rotation"
+TEMPLATE_INDEX_ATTRIBUTE_NAME = "Template Index"
+
+# Stores of the read mesh templates (e.g. of the kerbs and sidewalks) and furniture templates for one generation run
+furniture_templates = {}
+mesh_templates = {}
 
 
 def add_line_following_mesh(mesh_name: str):
@@ -62,46 +86,54 @@ def add_line_following_mesh(mesh_name: str):
     line_mesh.location = mesh.location
 
 
-def add_mesh_to_curve(mesh_template: bpy.types.Object, curve: bpy.types.Object, name: str, index: int, offset: float = 0.0):
+def add_mesh_to_curve(
+        mesh_template: bpy.types.Object, curve: bpy.types.Object, name: str, index: int, offset: float = 0.0,
+        segmented: bool = False):
     collection_name = "Kerbs"
     child_collection_name = None
-    mesh = mesh_template.copy()
-    mesh.data = mesh_template.data.copy()
-    mesh.name = name
-    mesh.location = curve.location
+    template = get_mesh_template(mesh_template)
+    location = curve.location.copy()
 
     x, y, z = 0.0, 0.0, 0.0
 
     if "Kerb" in name:
         # Keep its original z-location for the kerb
-        z = mesh.location[2]
+        z = location[2]
     elif "Sidewalk" in name:
         collection_name = "Sidewalks"
 
         # Add for every sidewalk a new collection for separated meshes
-        child_collection_name = mesh.name
+        # (segmented sidewalks stay one mesh with a segment attribute)
+        if not segmented:
+            child_collection_name = name
 
     # Translate the created mesh according to its y-dimension and an offset
-    y += index * (mesh.dimensions[1] / 2 + offset)
-    mesh.location += Vector((x, y, z))
+    y += index * (template.dimensions[1] / 2 + offset)
+    translation = np.array((x, y, z))
 
-    # Calculate and update the x-dimension of the mesh so it fits better to its curve
+    # Calculate the x-dimension of the tiles so they fit better to the curve
     # (add a threshold to also take the last part into account)
-    curve_length = curve.data.splines[0].calc_length()
+    centreline = get_centreline(curve.name)
     minimum_width = 2.0
     threshold = 0.00001
-    mesh.dimensions[0] = calculate_optimal_distance(curve_length, minimum_width) + threshold
+    tile_length = calculate_optimal_distance(centreline.length, minimum_width) + threshold
 
-    # Apply the correct curve for the mesh modifiers
-    mesh.modifiers["Array"].curve = curve
-    mesh.modifiers["Curve"].object = curve
+    # Tile the template along the x-axis and bend the tiles along the centreline of the curve
+    # (instead of applying an Array and a Curve modifier)
+    mesh_data = template.get_tiles(tile_length, centreline.length)
+    vertices = mesh_data.vertices + translation
+    vertices[:, 0] -= vertices[:, 0].min()
+    mesh_data.vertices = centreline.deform(vertices) - (np.array(location) + translation)
 
-    # Add the created mesh to the correct collection and apply its rotation and scale
-    link_to_collection(mesh, collection_name, child_collection_name)
-    apply_transform(mesh, rotation=True, scale=True)
+    mesh = create_mesh_from_template(template, mesh_data, name)
+    mesh.location = location + Vector(translation)
+    update_matrix_world(mesh)
+
+    if child_collection_name:
+        child_collection_name = mesh.name
 
-    # Set the mesh as active object and apply its modifiers
-    apply_modifiers(mesh)
+    # Add the created mesh to the correct collection
+    link_to_collection(mesh, collection_name, child_collection_name)
 
     return mesh
 
@@ -142,224 +174,239 @@ def add_object_at_position(collection: bpy.types.Collection, position: Vector):
     else:
         collection_name = collection_name + "s"
 
-    link_to_collection(new_empty, collection_name, child_collection_name)
+    # Link the new empty object later together with all other objects (without updating the scene for each object)
+    queue_link_to_collection(new_empty, collection_name, child_collection_name)
 
     # Update the location of the new empty object
     new_empty.location = position
 
-    # The scene need to be updated so that the location of the new object is correct
-    bpy.context.view_layer.update()
-
     return new_empty
 
 
 def add_objects_to_road(object_name: str, road: RG_Road, side: str, offset: float, height: float):
-    curve_name = road.curve.name
-    line_mesh = bpy.data.objects.get(f"Line_Mesh_{curve_name}_{side}")
+    collections, points, angles = get_object_placements(object_name, road, side, offset, height)
+    objects = []
 
-    # Create a BMesh from the line mesh for edge length calculation
-    mesh_eval_data = line_mesh.data
-    bm_line = bmesh.new()
-    bm_line.from_mesh(mesh_eval_data)
-    total_length = get_line_mesh_length(bm_line)
+    for collection, point, angle in zip(collections, points, angles):
+        # Add an object at the position and rotate it
+        object = add_object_at_position(collection, Vector(point))
+        object.rotation_euler[2] = angle
+        update_matrix_world(object)
+        objects.append(object)
 
-    counter = 0
-    direction = None
-    position = None
-    reference_direction = None
-    turned = True
-    use_reference_direction = False
+    counter = len(objects)
+    name = object_name + "s" if counter > 1 else object_name
+    print(f"\t{counter} {name} added")
 
-    distance = calculate_optimal_distance(total_length, road.lamp_distance)
-    sections = round(total_length / distance)
+    return objects
 
-    if side == "Right":
-        offset *= -1
 
-    if "Traffic Sign" in object_name:
-        traffic_sign_collection_names = get_subcollection_names_of_collection_by_name("Templates", "Traffic Sign")
+def add_points_to_collection(
+        object_name: str, suffix: str, collections: list, points: np.ndarray, angles: np.ndarray):
+    # Add one point cloud for the objects of a type (e.g. of one road) that instances the templates with geometry nodes
+    if not collections:
+        return None
 
-        use_reference_direction = True
+    # Replace the point cloud of a previous run
+    points_object_name = f"{object_name.replace(' ', '_')}_Points_{suffix}"
+    old_points_object = bpy.data.objects.get(points_object_name)
 
-        if side == "Left":
-            turned = False
+    if old_points_object:
+        old_mesh = old_points_object.data
+        bpy.data.objects.remove(old_points_object, do_unlink=True)
 
-        # Get a random number of traffic signs
-        number = random.randint(0, int(total_length / distance))
+        if old_mesh.users == 0:
+            bpy.data.meshes.remove(old_mesh)
 
-        # Find random positions for the number of traffic signs
-        if number == 0:
-            positions = [random.uniform(2, total_length - 2)]
-        else:
-            positions = [random.uniform(2, total_length - 2) for _ in range(number)]
-            positions.sort()
+    template_collections = get_template_collections(object_name, collections)
+    template_indices = [template_collections.index(collection) for collection in collections]
 
-        # Adjust the position offset for the traffic sign
-        offset /= 3
-    elif "Traffic Light" in object_name:
-        # Check for turning lane and add an additional road lane if there is one
-        lanes_number = road.curve.get(f"{side} Lanes")
-        turning_lane_distance = road.left_turning_lane_distance if side == "Left" else road.right_turning_lane_distance
-        has_turning_lane = road.has_left_turning_lane if side == "Left" else road.has_right_turning_lane
+    mesh = bpy.data.meshes.new(f"{object_name} Points")
+    mesh.vertices.add(len(points))
+    mesh.vertices.foreach_set("co", points.astype(np.float32).ravel())
 
-        if turning_lane_distance and has_turning_lane:
-            lanes_number += 1
+    rotations = np.zeros((len(angles), 3), dtype=np.float32)
+    rotations[:, 2] = angles
+    mesh.attributes.new(ROTATION_ATTRIBUTE_NAME, 'FLOAT_VECTOR', 'POINT').data.foreach_set("vector", rotations.ravel())
+    mesh.attributes.new(TEMPLATE_INDEX_ATTRIBUTE_NAME, 'INT', 'POINT').data.foreach_set(
+        "value", np.array(template_indices, dtype=np.int32))
 
-        collection = bpy.data.collections.get(f"{object_name} {lanes_number}")
+    points_object = bpy.data.objects.new(points_object_name, mesh)
+    modifier = points_object.modifiers.new("Instances", 'NODES')
+    modifier.node_group = get_instancing_node_group(object_name, template_collections)
 
-        # If there is only one lane per side use a reference vector to rotate the corresponding mesh correctly
-        if lanes_number == 1:
-            use_reference_direction = True
+    link_to_collection(points_object, f"{object_name}s")
 
-        if side == "Right":
-            positions = [total_length - 1]
-        else:
-            if lanes_number == 1:
-                turned = False
-            positions = [1.0]
+    name = object_name + "s" if len(points) > 1 else object_name
+    print(f"\t{len(points)} {name} added as points")
 
-        # Adjust the position offset for the traffic light
-        offset /= 4
-    elif "Street Name Sign" in object_name:
-        if road.right_neighbour_of_left_curve and side == "Left":
-            right_neighbour_name = road.right_neighbour_of_left_curve
+    return points_object
 
-            # Adjust the position offset and the option for turning only for the left side
-            offset *= -1
-            turned = False
-        elif road.right_neighbour_of_right_curve and side == "Right":
-            right_neighbour_name = road.right_neighbour_of_right_curve
-        else:
-            return
 
-        # Set the direction to the negative y-axis, as we know that the street name sign template has this direction
-        # (the calculation with its children locations leads to incorrect results)
-        direction = Vector((0.0, -1.0, 0.0))
+def apply_modifiers(mesh: bpy.types.Object):
+    bpy.context.view_layer.objects.active = mesh
 
-        # Get the correct collection and crossroad curve
-        roads_number = 2 if road.right_neighbour_of_left_curve or road.right_neighbour_of_right_curve else 1
-        collection = bpy.data.collections.get(f"{object_name} {roads_number}")
+    for modifier in mesh.modifiers:
+        call_operator(bpy.ops.object.modifier_apply, modifier=modifier.name)
 
-        # Get the correct right curve (left and right could be swapped because it depends on the point of view)
-        curve = road.get_right_curve(side)
 
-        # Calculate the reference direction (the direction in which the sign should be rotated)
-        m = curve.matrix_world
-        crossroad_curve = bpy.data.objects.get(f"Crossroad_Curve_{curve_name}_{side}_{right_neighbour_name}")
-        curve_point = get_closest_curve_point(curve, crossroad_curve.matrix_world.translation)
-        reference_direction = m @ curve_point.co - m @ curve_point.handle_left
+def apply_transform(object: bpy.types.Object, rotation: bool = False, scale: bool = False):
+    # Bake the rotation and/or scale directly into the mesh or curve data (without bpy.ops and selection),
+    # the location stays at the object so that the data is only transformed around its origin
+    _, object_rotation, object_scale = object.matrix_basis.decompose()
+    matrix = Matrix.Identity(4)
 
-        # Get the corresponding line mesh
-        line_mesh = bpy.data.objects.get(f"Line_Mesh_{crossroad_curve.name}")
+    if rotation:
+        matrix = matrix @ object_rotation.to_matrix().to_4x4()
+        object.rotation_euler = (0.0, 0.0, 0.0)
+        object.rotation_quaternion = (1.0, 0.0, 0.0, 0.0)
+    if scale:
+        matrix = matrix @ Matrix.Diagonal(object_scale).to_4x4()
+        object.scale = (1.0, 1.0, 1.0)
 
-        # Create a BMesh from the line mesh for edge length calculation
-        mesh_eval_data = line_mesh.data
-        bm_line = bmesh.new()
-        bm_line.from_mesh(mesh_eval_data)
-        total_length = get_line_mesh_length(bm_line)
+    object.data.transform(matrix)
 
-        # Set the mid of the line mesh as the position for the sign
-        positions = [total_length / 2]
-    else:
-        collection = bpy.data.collections.get(object_name)
+    update_matrix_world(object)
 
-        # Calculate the (uniform) positions for the other objects
-        positions = [distance * i for i in range(sections + 1)]
 
-    if not positions:
-        return
+def calculate_optimal_distance(length: float, minimum: float):
+    number = length // minimum
 
-    correction_difference = 0
-    length = 0
+    return length if number == 0 else length / number
 
-    current_distance = positions.pop(0)
-    m = line_mesh.matrix_world
 
-    # Iterate over all line mesh edges to find the mesh positions to add the objects
-    for edge in bm_line.edges:
-        edge_length = edge.calc_length()
-        length += edge_length
+def calculate_origin(coordinates: np.ndarray, center: str = 'MEDIAN'):
+    if center == 'BOUNDS':
+        return (coordinates.min(axis=0) + coordinates.max(axis=0)) / 2
 
-        corrected_length = length - correction_difference
+    return coordinates.mean(axis=0)
 
-        # Calculate the position on the line mesh when the distance is big enough or when the last object is reached
-        # (round corrected_length and current_distance to avoid floating point issues)
-        if ((corrected_length <= total_length and corrected_length >= current_distance)
-                or (counter == sections and round(corrected_length, 10) == round(current_distance, 10))):
-            v0 = edge.verts[0].co
-            v1 = edge.verts[1].co
-            vec = v1 - v0
-            vec.normalize()
 
-            if counter == 0:
-                # Use no difference for the first position, because we only use the first vertex for this
-                # and not the second vertex
-                difference = 0
-                vertex = v0
-            else:
-                difference = corrected_length - current_distance
-                vertex = v1
+def calculate_prism_data(vertices: list, height: float = 0.0, reverse: bool = False, triangulate: bool = False):
+    # Calculate the vertex coordinates and the faces (as flat loop arrays) of a polygon that is extruded by a height
+    coordinates = np.array([tuple(vertex) for vertex in vertices], dtype=np.float64).reshape(-1, 3)
+    vertices_number = len(coordinates)
 
-                # Add the difference to the current length for more precise finding of further positions
-                length += difference
+    # The order of the vertices for the face has to be reversed for some meshes so that the normals are calculated correct
+    face = np.arange(vertices_number)
 
-                # Note the difference for correction of further positions
-                correction_difference += difference
+    if reverse:
+        face = face[::-1]
 
-            # Calculate the accurate point between the two line mesh vertices
-            position = m @ (vertex - vec * difference)
+    # Use triangles instead of one (possibly large and concave) n-gon for the top and bottom if required
+    faces = calculate_triangles(coordinates, face) if triangulate else face[np.newaxis]
+    faces_number, face_size = faces.shape
 
-            # Find an orthogonal vector to determine the direction for shifting/moving the object
-            orthogonal_vector = Vector((-vec.y, vec.x, 0))
+    if height == 0.0:
+        return coordinates, faces.ravel(), face_size * np.arange(faces_number), np.full(faces_number, face_size)
 
-            # Shift this orthogonal vector by an offset and the found position
-            shifted_position = position + orthogonal_vector * offset
+    # Add the top vertices, the bottom faces (flipped), the top faces and one side face per edge of the polygon
+    top_coordinates = coordinates + np.array([0.0, 0.0, height])
+    next_face = np.roll(face, -1)
+    side_faces = np.stack([face, next_face, next_face + vertices_number, face + vertices_number], axis=1)
 
-            # Select a random traffic sign template
-            if "Traffic Sign" in object_name:
-                index = random.randint(0, len(traffic_sign_collection_names) - 1)
-                collection = bpy.data.collections.get(traffic_sign_collection_names[index])
+    coordinates = np.concatenate([coordinates, top_coordinates])
+    loop_vertex_indices = np.concatenate([faces[:, ::-1].ravel(), (faces + vertices_number).ravel(), side_faces.ravel()])
+    loop_starts = np.concatenate([
+        face_size * np.arange(2 * faces_number), 2 * faces.size + 4 * np.arange(vertices_number)])
+    loop_totals = np.concatenate([np.full(2 * faces_number, face_size), np.full(vertices_number, 4)])
 
-            if use_reference_direction:
-                reference_direction = vec
+    return coordinates, loop_vertex_indices, loop_starts, loop_totals
 
-            # Add an object at the shifted position and rotate it
-            object = add_object_at_position(collection, shifted_position)
-            rotate_object(object, collection, position, turned, direction, reference_direction)
 
-            # Set the height correctly
-            if object.location.z == 0:
-                object.location.z = height
+def calculate_quad_strip_data(
+        inner_vertices: np.ndarray, outer_vertices: np.ndarray, height: float = 0.0, reverse: bool = False):
+    # Calculate the vertex coordinates and the quads (as flat loop arrays) between paired inner and outer vertices,
+    # the quads face upwards if the outer vertices are on the left side of the inner vertices (otherwise reverse them)
+    bottom_coordinates = np.concatenate([inner_vertices, outer_vertices]).astype(np.float64).reshape(-1, 3)
+    pairs_number = len(inner_vertices)
+    i = np.arange(pairs_number - 1)
+    inner, outer = i, i + pairs_number
 
-            counter += 1
+    if height == 0.0:
+        coordinates = bottom_coordinates
+        quads = np.stack([inner, inner + 1, outer + 1, outer], axis=1)
+    else:
+        # Add the top vertices, the top and bottom quads, the inner and outer side quads and the quads at both ends
+        coordinates = np.concatenate([bottom_coordinates, bottom_coordinates + np.array([0.0, 0.0, height])])
+        top = 2 * pairs_number
+        first, last = 0, pairs_number - 1
+
+        quads = np.concatenate([
+            np.stack([inner + top, inner + top + 1, outer + top + 1, outer + top], axis=1),
+            np.stack([outer, outer + 1, inner + 1, inner], axis=1),
+            np.stack([inner, inner + 1, inner + top + 1, inner + top], axis=1),
+            np.stack([outer + 1, outer, outer + top, outer + top + 1], axis=1),
+            [[first + pairs_number, first, first + top, first + pairs_number + top],
+             [last, last + pairs_number, last + pairs_number + top, last + top]]])
+
+    # The order of the vertices of the quads has to be reversed for some meshes so that the normals are calculated correct
+    if reverse:
+        quads = quads[:, ::-1]
 
-            if positions:
-                current_distance = positions.pop(0)
-            else:
-                break
+    quads_number = len(quads)
 
-    name = object_name + "s" if counter > 1 else object_name
-    print(f"\t{counter} {name} added")
+    return coordinates, quads.ravel(), 4 * np.arange(quads_number), np.full(quads_number, 4)
 
 
-def apply_modifiers(mesh: bpy.types.Object):
-    bpy.context.view_layer.objects.active = mesh
+def calculate_rotation_angles(directions: np.ndarray, reference_directions: np.ndarray):
+    # Calculate the angles (counter-clockwise, between 0 and 2 pi) around the z-axis that rotate the directions
+    # onto the reference directions
+    cross = directions[:, 0] * reference_directions[:, 1] - directions[:, 1] * reference_directions[:, 0]
+    dot = directions[:, 0] * reference_directions[:, 0] + directions[:, 1] * reference_directions[:, 1]
 
-    for modifier in mesh.modifiers:
-        bpy.ops.object.modifier_apply(modifier=modifier.name)
+    return np.mod(np.arctan2(cross, dot), 2 * math.pi)
 
 
-def apply_transform(
-        object: bpy.types.Object, location: bool = False, rotation: bool = False, scale: bool = False, properties: bool = False):
-    object.select_set(True)
-    bpy.ops.object.transform_apply(location=location, rotation=rotation, scale=scale, properties=properties)
-    object.select_set(False)
+def calculate_signed_areas(polygons: np.ndarray):
+    # Calculate the signed areas (positive for counter-clockwise) of polygons in the xy-plane with the shoelace formula
+    x, y = polygons[..., 0], polygons[..., 1]
 
+    return 0.5 * np.sum(x * np.roll(y, -1, axis=-1) - np.roll(x, -1, axis=-1) * y, axis=-1)
 
-def calculate_optimal_distance(length: float, minimum: float):
-    number = length // minimum
 
-    return length if number == 0 else length / number
+def calculate_triangles(coordinates: np.ndarray, face: np.ndarray):
+    # Triangulate the (possibly concave) face and keep the winding order of the face for all triangles
+    polygon = coordinates[face]
+    triangles = face[np.array(geometry.tessellate_polygon([[Vector(co) for co in polygon]]), dtype=np.int64).reshape(-1, 3)]
+
+    is_flipped = np.sign(calculate_signed_areas(coordinates[triangles])) != np.sign(calculate_signed_areas(polygon))
+    triangles[is_flipped] = triangles[is_flipped, ::-1]
+
+    return triangles
+
+
+def clear_furniture_templates():
+    furniture_templates.clear()
+
+
+def clear_mesh_templates():
+    mesh_templates.clear()
+
+
+def copy_object_with_transform(
+        object: bpy.types.Object, name: str, rotation: np.ndarray, translation: np.ndarray, collection_name: str):
+    # Copy the object with its data and move it rigidly (its rotation around the z-axis is applied to its data)
+    new_object = object.copy()
+    new_object.data = object.data.copy()
+    new_object.name = name
+    new_object.location = Vector(rotation @ np.array(object.location) + translation)
+
+    if object.type == 'CURVE':
+        matrix = np.identity(4)
+        matrix[:3, :3] = rotation
+
+        for spline in new_object.data.splines:
+            RG_SplineSnapshot(spline).transform(matrix).write(spline)
+    else:
+        snapshot = RG_MeshSnapshot(new_object)
+        snapshot.coordinates = snapshot.coordinates @ rotation.T
+        snapshot.write()
+
+    update_matrix_world(new_object)
+    link_to_collection(new_object, collection_name)
+
+    return new_object
 
 
 def create_kdtree(vertices: list, size: int):
@@ -374,46 +421,79 @@ def create_kdtree(vertices: list, size: int):
     return kd
 
 
-def create_mesh_from_vertices(vertices: list, category_name: str, suffix: str, height: float = 0.0, reverse: bool = False):
-    # Create the face (only one) based on the vertices for the mesh
-    face = []
-    faces = []
+def create_mesh_from_template(template: RG_MeshTemplate, mesh_data: RG_MeshData, name: str):
+    # Copy the template object (for its vertex groups and settings) but use a new mesh for the tiled geometry
+    mesh = bpy.data.meshes.new(name)
+    write_mesh_data(mesh, mesh_data.vertices, mesh_data.loop_vertex_indices, mesh_data.loop_starts, mesh_data.loop_totals)
+    mesh.polygons.foreach_set("material_index", mesh_data.material_indices)
+    mesh.polygons.foreach_set("use_smooth", mesh_data.use_smooth)
+    mesh.attributes.new(SEGMENT_ATTRIBUTE_NAME, 'INT', 'FACE').data.foreach_set("value", mesh_data.segments)
 
-    indices = range(len(vertices))
+    for uv_layer_name, uvs in mesh_data.uv_layers.items():
+        mesh.uv_layers.new(name=uv_layer_name).data.foreach_set("uv", uvs.ravel())
 
-    # The order of the vertices for the face has to be reversed for some meshes so that the normals are calculated correct
-    if reverse:
-        indices = reversed(indices)
+    for material in template.object.data.materials:
+        mesh.materials.append(material)
+
+    obj = template.object.copy()
+    obj.data = mesh
+    obj.name = name
+    obj.modifiers.clear()
+    obj.rotation_euler = (0.0, 0.0, 0.0)
+    obj.rotation_quaternion = (1.0, 0.0, 0.0, 0.0)
+    obj.scale = (1.0, 1.0, 1.0)
+
+    # Assign the vertices of the tiles to the vertex groups of the template (e.g. Outside_Left and Outside_Right)
+    for vertex_group_name, groups in mesh_data.vertex_groups.items():
+        vertex_group = obj.vertex_groups.get(vertex_group_name)
+
+        for indices, weight in groups:
+            vertex_group.add(indices.tolist(), weight, 'REPLACE')
+
+    write_outside_attributes(mesh, {
+        vertex_group_name: np.concatenate([indices for indices, _ in groups])
+        for vertex_group_name, groups in mesh_data.vertex_groups.items() if groups})
 
-    for index in indices:
-        face.append(index)
-    faces.append(face)
+    return obj
+
+
+def create_mesh_from_data(
+        coordinates: np.ndarray, loop_vertex_indices: np.ndarray, loop_starts: np.ndarray, loop_totals: np.ndarray,
+        category_name: str, suffix: str):
+    # Move the center (of the bounds) of the mesh data into the origin
+    origin = calculate_origin(coordinates, 'BOUNDS')
 
-    # Create the 2D mesh and link it to its corresponding collection
+    # Create the mesh and link it to its corresponding collection
     mesh = bpy.data.meshes.new(f"{category_name} Mesh")
-    mesh.from_pydata(vertices, [], faces)
+    write_mesh_data(mesh, coordinates - origin, loop_vertex_indices, loop_starts, loop_totals)
     new_category_name = category_name.replace(" ", "_")
     obj = bpy.data.objects.new(f"{new_category_name}_{suffix}", mesh)
     link_to_collection(obj, f"{category_name}s")
 
-    if height != 0.0:
-        # Extrude the 2D mesh so it is a 3D mesh
-        extrude_mesh(obj, height)
-
-    # Set the origin to the center of the mesh (Hint: This overwrites the location.)
-    set_origin(obj, 'BOUNDS')
+    obj.location = Vector(origin)
+    update_matrix_world(obj)
 
     return obj
 
 
-def curve_to_mesh(curve: bpy.types.Object):
-    # Create a line mesh from the curve and link it to its collection
-    mesh = curve.to_mesh()
-    line_mesh = bpy.data.objects.new(f"Line_Mesh_{curve.name}", mesh.copy())
-    line_mesh.matrix_world = curve.matrix_world
-    link_to_collection(line_mesh, "Line Meshes")
+def create_mesh_from_vertices(
+        vertices: list, category_name: str, suffix: str, height: float = 0.0, reverse: bool = False,
+        triangulate: bool = False):
+    # Create the (extruded) face based on the vertices
+    coordinates, loop_vertex_indices, loop_starts, loop_totals = calculate_prism_data(
+        vertices, height, reverse, triangulate)
 
-    return line_mesh
+    return create_mesh_from_data(coordinates, loop_vertex_indices, loop_starts, loop_totals, category_name, suffix)
+
+
+def create_quad_strip_mesh(
+        inner_vertices: np.ndarray, outer_vertices: np.ndarray, category_name: str, suffix: str,
+        height: float = 0.0, reverse: bool = False):
+    # Create the (extruded) quad strip between the paired inner and outer vertices
+    coordinates, loop_vertex_indices, loop_starts, loop_totals = calculate_quad_strip_data(
+        inner_vertices, outer_vertices, height, reverse)
+
+    return create_mesh_from_data(coordinates, loop_vertex_indices, loop_starts, loop_totals, category_name, suffix)
 
 
 def deselect_all():
@@ -422,206 +502,408 @@ def deselect_all():
 
 
 def edit_mesh_at_positions(mesh_name: str, positions: list, reference_mesh_name: str):
-    # Get the corresponding line mesh
-    line_mesh = bpy.data.objects.get(f"Line_Mesh_{reference_mesh_name}")
+    # Get the corresponding centreline and only use the positions that are on it
+    centreline = get_centreline(reference_mesh_name)
+    positions = [position for position in positions if 0 <= position < centreline.length]
 
-    # Create a BMesh from the line mesh for edge length calculation
-    mesh_eval_data = line_mesh.data
-    bm_line = bmesh.new()
-    bm_line.from_mesh(mesh_eval_data)
+    if not positions:
+        return
 
-    object_position = None
-    for pos in positions:
-        p = pos
-        length = 0
+    # Read all vertices once and transform the reached points into the space of the mesh
+    mesh = bpy.data.objects.get(mesh_name)
+    snapshot = RG_MeshSnapshot(mesh)
+    coordinates = snapshot.coordinates
+    m = np.array(mesh.matrix_world.inverted())
+    points = centreline.points_at(positions) @ m[:3, :3].T + m[:3, 3]
 
-        # Iterate over all line mesh edges to find its position, which corresponds to the given position
-        for edge in bm_line.edges:
-            edge_length = edge.calc_length()
-            length += edge_length
+    # Count for every vertex how many positions are in a certain radius (with one KD-tree for all positions)
+    radius = 2
+    kd = create_kdtree(coordinates, len(coordinates))
+    hits = np.zeros(len(coordinates), dtype=np.int32)
 
-            # Calculate the position on the line mesh when a position is reached
-            if length > pos:
-                v0 = edge.verts[0].co
-                v1 = edge.verts[1].co
-                vec = v1 - v0
-                unit_vec = vec / edge_length
-                object_position = v0 + unit_vec * p
-                break
+    for point in points:
+        indices = [index for (co, index, dist) in kd.find_range(point, radius)]
+        hits[indices] += 1
 
-            p -= edge_length
+    # Decrease the "height" (z-coordinate) of the vertices that are higher than 0.2 once per position
+    # (but not below 0.2 again)
+    drop_height = 0.135
+    z = coordinates[:, 2]
+    drops = np.minimum(hits, np.ceil(np.maximum(z - 0.2, 0.0) / drop_height))
+    coordinates[:, 2] = z - drops * drop_height
 
-        # Edit the mesh at the reached position
-        if object_position:
-            mesh = bpy.data.objects.get(mesh_name)
-            vertices = [vertex.co for vertex in mesh.data.vertices]
+    snapshot.write()
 
-            kd = create_kdtree(vertices, len(vertices))
 
-            # Decrease the "height" (z-coordinate) of all vertices in a certain radius that are higher than 0
-            radius = 2
-            for (co, index, dist) in kd.find_range(object_position, radius):
-                vertex = vertices[index]
+def find_closest_points(list: list, reference_point: Vector, find_all: bool = True):
+    num_vertices = len(list)
+    kd = create_kdtree(list, num_vertices)
+    n = num_vertices if find_all else 1
 
-                if vertex.z > 0.2:
-                    vertex.z -= 0.135
+    # Sort the points by distance to the reference point and return the nearest point or all
+    return kd.find_n(reference_point, n)
 
-    bm_line.free()
 
+def get_enabled_output(node: bpy.types.Node):
+    # Some nodes (e.g. the named attribute node) have one output for each data type and only the used one is enabled
+    return next(output for output in node.outputs if output.enabled)
 
-def extrude_mesh(mesh: bpy.types.Object, height: float):
-    # Edit the mesh
-    bpy.context.view_layer.objects.active = mesh
-    bpy.ops.object.mode_set(mode='EDIT')
 
-    # Extrude the mesh
-    bpy.ops.mesh.extrude_region_move(TRANSFORM_OT_translate={"value": (0.0, 0.0, height)})
-    bpy.ops.object.mode_set(mode='OBJECT')
+def get_furniture_template(collection: bpy.types.Collection):
+    # Calculate the orientation of each furniture template only once per generation run
+    template = furniture_templates.get(collection.name)
 
+    if template is None:
+        template = furniture_templates[collection.name] = RG_FurnitureTemplate(collection)
 
-def find_closest_points(list: list, reference_point: Vector, find_all: bool = True):
-    num_vertices = len(list)
-    kd = create_kdtree(list, num_vertices)
-    n = num_vertices if find_all else 1
+    return template
 
-    # Sort the points by distance to the reference point and return the nearest point or all
-    return kd.find_n(reference_point, n)
 
+def get_instancing_node_group(object_name: str, template_collections: list):
+    # Collect the templates in a collection (that is not linked to the scene) whose children can be instanced
+    instance_collection_name = f"{object_name} Instances"
+    instance_collection = bpy.data.collections.get(instance_collection_name)
 
-def get_furthest_object_in_collection(
-        collection: bpy.types.Collection, reference_object_location: Vector, by_vertex: bool = False):
-    furthest_object_location = None
-    max_distance = 0.0
+    if instance_collection is None:
+        instance_collection = bpy.data.collections.new(instance_collection_name)
 
-    # Find the object in the collection furthest away from the location of the reference object
-    for object in collection.objects:
-        if object.type == 'MESH':
-            object_global_location = object.matrix_world.translation + reference_object_location
+    for child_collection in list(instance_collection.children):
+        if child_collection not in template_collections:
+            instance_collection.children.unlink(child_collection)
 
-            # If necessary, iterate over all vertices of the object
-            if by_vertex:
-                vertices = object.data.vertices
-                list = []
+    for template_collection in template_collections:
+        if template_collection.name not in instance_collection.children:
+            instance_collection.children.link(template_collection)
 
-                for vertex in vertices:
-                    # Translate the vertex into the space of the reference object to calculate the correct distance between them
-                    global_vertex_pos = object.matrix_world @ vertex.co + reference_object_location
-                    global_vertex_pos.z = 0.0
-                    list.append(global_vertex_pos)
-            else:
-                list = [object_global_location]
+    node_group_name = f"RG {object_name} Instances"
+    node_group = bpy.data.node_groups.get(node_group_name)
 
-            for element in list:
-                distance = (element - reference_object_location).length
+    if node_group:
+        return node_group
 
-                if distance > max_distance:
-                    max_distance = distance
-                    furthest_object_location = object_global_location
+    # Create a node tree that instances the templates on the points (with their template index and rotation)
+    node_group = bpy.data.node_groups.new(node_group_name, 'GeometryNodeTree')
 
-    return furthest_object_location
+    if hasattr(node_group, "interface"):
+        node_group.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+        node_group.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    else:
+        node_group.inputs.new('NodeSocketGeometry', "Geometry")
+        node_group.outputs.new('NodeSocketGeometry', "Geometry")
 
+    nodes = node_group.nodes
+    group_input = nodes.new('NodeGroupInput')
+    group_output = nodes.new('NodeGroupOutput')
 
-def get_intersecting_meshes(meshes: list):
-    intersecting_meshes = {}
+    collection_info = nodes.new('GeometryNodeCollectionInfo')
+    collection_info.inputs["Collection"].default_value = instance_collection
+    collection_info.inputs["Separate Children"].default_value = True
 
-    # For each mesh, check whether it intersects with every other mesh
-    for mesh in meshes:
-        # Create a BMesh object from the mesh and transform it into the correct space
-        bm1 = bmesh.new()
-        bm1.from_mesh(mesh.data)
-        bm1.transform(mesh.matrix_world)
+    template_index = nodes.new('GeometryNodeInputNamedAttribute')
+    template_index.data_type = 'INT'
+    template_index.inputs["Name"].default_value = TEMPLATE_INDEX_ATTRIBUTE_NAME
 
-        # Create a BVH tree for the BMesh
-        mesh_BVHtree = bvhtree.BVHTree.FromBMesh(bm1)
+    rotation = nodes.new('GeometryNodeInputNamedAttribute')
+    rotation.data_type = 'FLOAT_VECTOR'
+    rotation.inputs["Name"].default_value = ROTATION_ATTRIBUTE_NAME
 
-        for other_mesh in meshes:
-            # Skip each other mesh if it belongs to a crossroad and is the same mesh as the current mesh
-            # or if it does not belongs to a crossroad and is in the same collection like the current mesh
-            if "Crossroad" in mesh.users_collection[0].name:
-                if mesh == other_mesh:
-                    continue
-            else:
-                if mesh.users_collection == other_mesh.users_collection:
-                    continue
+    instance_on_points = nodes.new('GeometryNodeInstanceOnPoints')
+    instance_on_points.inputs["Pick Instance"].default_value = True
 
-            # Create a BMesh and a BVH tree for the other mesh
-            bm2 = bmesh.new()
-            bm2.from_mesh(other_mesh.data)
-            bm2.transform(other_mesh.matrix_world)
-            other_mesh_BVHtree = bvhtree.BVHTree.FromBMesh(bm2)
+    links = node_group.links
+    links.new(group_input.outputs[0], instance_on_points.inputs["Points"])
+    links.new(collection_info.outputs[0], instance_on_points.inputs["Instance"])
+    links.new(get_enabled_output(template_index), instance_on_points.inputs["Instance Index"])
+    links.new(get_enabled_output(rotation), instance_on_points.inputs["Rotation"])
+    links.new(instance_on_points.outputs["Instances"], group_output.inputs[0])
 
-            # Get the intersecting parts (indices) between the BVH trees
-            inter = mesh_BVHtree.overlap(other_mesh_BVHtree)
+    return node_group
 
-            # Only add the first intersected mesh only if it is not in the list
-            if inter:
-                if mesh not in intersecting_meshes:
-                    intersecting_meshes[mesh] = []
-                if other_mesh not in intersecting_meshes[mesh]:
-                    intersecting_meshes[mesh].append(other_mesh)
 
-    return intersecting_meshes
+def get_line_mesh_length(curve_name: str):
+    return get_centreline(curve_name).length
 
 
-def get_line_mesh_length(line_mesh: bmesh):
-    total_length = 0
+def get_mesh_template(mesh_template: bpy.types.Object):
+    # Read the data of each template only once per generation run
+    template = mesh_templates.get(mesh_template.name)
 
-    for edge in line_mesh.edges:
-        edge_length = edge.calc_length()
-        total_length += edge_length
+    if template is None:
+        template = mesh_templates[mesh_template.name] = RG_MeshTemplate(mesh_template)
 
-    return total_length
+    return template
 
 
-def rotate_object(
-        object: bpy.types.Object, collection: bpy.types.Collection, reference_point: Vector,
-        turned: bool, direction: Vector = None, reference_direction: Vector = None):
-    furthest_object_location = None
-    object_location = object.matrix_world.translation
-    by_vertex = False if reference_direction else True
+def get_natural_sort_key(name: str):
+    # Compare the numbers in names by their values (e.g. "Sign 2" before "Sign 10") and ignore the case
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)]
 
-    if not direction:
-        # If no direction is passed, calculate it using the furthest object in the collection of the passed object
-        furthest_object_location = get_furthest_object_in_collection(collection, object_location, by_vertex)
-        direction = furthest_object_location - object_location
 
-    direction.z = 0.0
+def get_object_coordinates(object: bpy.types.Object):
+    # Read all vertex (or bezier point) coordinates of the object at once
+    if object.type == 'CURVE':
+        coordinates = [RG_SplineSnapshot(spline).points for spline in object.data.splines]
 
-    if turned:
-        direction *= -1
+        return np.concatenate(coordinates) if coordinates else np.empty((0, 3))
 
-    if not reference_direction:
-        # If no reference direction is passed, get the reference vector between the reference point and the object
-        reference_direction = object_location - reference_point
+    return RG_MeshSnapshot(object).coordinates
 
-    # Calculate the angle between the two vectors
-    angle_radian = direction.angle(reference_direction)
 
-    # Calculate the cross product of the two vectors to check whether the angle between them (in radians)
-    # is positive (counter-clockwise) or negative (clockwise)
-    cross = direction.cross(reference_direction)
+def get_object_placements(object_name: str, road: RG_Road, side: str, offset: float, height: float):
+    # Calculate the templates (collections), the positions and the rotation angles of the objects for a road side
+    curve_name = road.curve.name
+    centreline = road.get_centreline(side)
+    total_length = centreline.length
 
-    # If the z-coordinate of the cross is negative, we need switch the rotation direction to get the correct angle
-    if cross[2] < 0:
-        angle_radian = 2 * math.pi - angle_radian
+    direction = None
+    reference_direction = None
+    turned = True
+    use_reference_direction = False
 
-    # Rotate the object along the z-axis by the calculated angle
-    object.rotation_euler[2] = angle_radian
+    distance = calculate_optimal_distance(total_length, road.lamp_distance)
+    sections = round(total_length / distance)
 
+    if side == "Right":
+        offset *= -1
 
-def set_origin(object: bpy.types.Object, center: str = 'MEDIAN'):
-    object.select_set(True)
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center=center)
-    object.select_set(False)
+    if "Traffic Sign" in object_name:
+        traffic_sign_collection_names = get_subcollection_names_of_collection_by_name("Templates", "Traffic Sign")
+
+        use_reference_direction = True
+
+        if side == "Left":
+            turned = False
+
+        # Get a random number of traffic signs
+        number = random.randint(0, int(total_length / distance))
+
+        # Find random positions for the number of traffic signs
+        if number == 0:
+            positions = [random.uniform(2, total_length - 2)]
+        else:
+            positions = [random.uniform(2, total_length - 2) for _ in range(number)]
+            positions.sort()
+
+        # Adjust the position offset for the traffic sign
+        offset /= 3
+    elif "Traffic Light" in object_name:
+        # Check for turning lane and add an additional road lane if there is one
+        lanes_number = road.curve.get(f"{side} Lanes")
+        turning_lane_distance = road.left_turning_lane_distance if side == "Left" else road.right_turning_lane_distance
+        has_turning_lane = road.has_left_turning_lane if side == "Left" else road.has_right_turning_lane
+
+        if turning_lane_distance and has_turning_lane:
+            lanes_number += 1
+
+        collection = bpy.data.collections.get(f"{object_name} {lanes_number}")
+
+        # If there is only one lane per side use a reference vector to rotate the corresponding mesh correctly
+        if lanes_number == 1:
+            use_reference_direction = True
+
+        if side == "Right":
+            positions = [total_length - 1]
+        else:
+            if lanes_number == 1:
+                turned = False
+            positions = [1.0]
+
+        # Adjust the position offset for the traffic light
+        offset /= 4
+    elif "Street Name Sign" in object_name:
+        if road.right_neighbour_of_left_curve and side == "Left":
+            right_neighbour_name = road.right_neighbour_of_left_curve
+
+            # Adjust the position offset and the option for turning only for the left side
+            offset *= -1
+            turned = False
+        elif road.right_neighbour_of_right_curve and side == "Right":
+            right_neighbour_name = road.right_neighbour_of_right_curve
+        else:
+            return [], np.empty((0, 3)), np.empty(0)
+
+        # Set the direction to the negative y-axis, as we know that the street name sign template has this direction
+        # (the calculation with its children locations leads to incorrect results)
+        direction = Vector((0.0, -1.0, 0.0))
+
+        # Get the correct collection and crossroad curve
+        roads_number = 2 if road.right_neighbour_of_left_curve or road.right_neighbour_of_right_curve else 1
+        collection = bpy.data.collections.get(f"{object_name} {roads_number}")
+
+        # Get the correct right curve (left and right could be swapped because it depends on the point of view)
+        curve = road.get_right_curve(side)
+
+        # Calculate the reference direction (the direction in which the sign should be rotated)
+        m = curve.matrix_world
+        crossroad_curve = bpy.data.objects.get(f"Crossroad_Curve_{curve_name}_{side}_{right_neighbour_name}")
+        curve_point = get_closest_curve_point(curve, crossroad_curve.matrix_world.translation)
+        reference_direction = m @ curve_point.co - m @ curve_point.handle_left
+
+        # Get the centreline of the crossroad curve
+        centreline = get_centreline(crossroad_curve.name)
+        total_length = centreline.length
+
+        # Set the mid of the crossroad curve as the position for the sign
+        positions = [total_length / 2]
+    else:
+        collection = bpy.data.collections.get(object_name)
+
+        # Calculate the (uniform) positions for the other objects
+        positions = [distance * i for i in range(sections + 1)]
+
+    if not positions:
+        return [], np.empty((0, 3)), np.empty(0)
+
+    # Look up the points and the directions at all positions at once
+    points = centreline.points_at(positions)
+    tangents = centreline.tangents_at(positions)
+
+    # Shift the points orthogonal to their tangents by an offset
+    orthogonal_vectors = np.stack([-tangents[:, 1], tangents[:, 0], np.zeros(len(tangents))], axis=1)
+    shifted_points = points + orthogonal_vectors * offset
+
+    # Select the templates (a random traffic sign template for each position)
+    if "Traffic Sign" in object_name:
+        collections = []
+        for _ in positions:
+            index = random.randint(0, len(traffic_sign_collection_names) - 1)
+            collections.append(bpy.data.collections.get(traffic_sign_collection_names[index]))
+    else:
+        collections = [collection] * len(positions)
+
+    # Calculate the rotations of all objects at once
+    if use_reference_direction:
+        reference_directions = tangents
+    elif reference_direction:
+        reference_directions = np.tile(np.array(reference_direction), (len(positions), 1))
+    else:
+        reference_directions = shifted_points - points
+
+    by_vertex = not use_reference_direction and not reference_direction
+    directions = np.array([
+        direction if direction else get_furniture_template(collection).get_direction(by_vertex)
+        for collection in collections])
+    angles = calculate_rotation_angles(-directions if turned else directions, reference_directions)
+
+    # Set the height correctly
+    shifted_points[:, 2] = np.where(shifted_points[:, 2] == 0, height, shifted_points[:, 2])
+
+    return collections, shifted_points, angles
+
+
+def get_outside_indices(mesh: bpy.types.Object, side: str):
+    # Get the indices of the outside vertices of one side from their attribute (or None for meshes without it)
+    attribute = mesh.data.attributes.get(OUTSIDE_ATTRIBUTE_NAME.format(side))
+
+    if not attribute or attribute.domain != 'POINT':
+        return None
+
+    is_outside = np.empty(len(mesh.data.vertices), dtype=bool)
+    attribute.data.foreach_get("value", is_outside)
+
+    return np.flatnonzero(is_outside)
+
+
+def get_sidewalk_meshes(sidewalk_name: str):
+    # Separated sidewalks have their own collection, segmented sidewalks are only one mesh
+    collection = bpy.data.collections.get(sidewalk_name)
+
+    if collection:
+        return [obj for obj in collection.objects if obj.parent is None]
+
+    sidewalk = bpy.data.objects.get(sidewalk_name)
+
+    return [sidewalk] if sidewalk else []
+
+
+def get_template_collections(object_name: str, collections: list):
+    # Get all templates of the object (e.g. all traffic signs) sorted by their names like the collection info node does
+    template_collections = [
+        bpy.data.collections.get(collection_name)
+        for collection_name in get_subcollection_names_of_collection_by_name("Templates", object_name)]
+    template_collections = list(dict.fromkeys(template_collections + collections))
+
+    return sorted(template_collections, key=lambda collection: get_natural_sort_key(collection.name))
+
+
+def get_vertex_segments(mesh: bpy.types.Object):
+    # Get the segment of every vertex from the segment attribute of its faces (or None for meshes without segments)
+    attribute = mesh.data.attributes.get(SEGMENT_ATTRIBUTE_NAME)
+
+    if not attribute or attribute.domain != 'FACE':
+        return None
+
+    polygons = mesh.data.polygons
+    face_segments = np.empty(len(polygons), dtype=np.int32)
+    attribute.data.foreach_get("value", face_segments)
+    loop_totals = np.empty(len(polygons), dtype=np.int32)
+    polygons.foreach_get("loop_total", loop_totals)
+    loop_vertex_indices = np.empty(len(mesh.data.loops), dtype=np.int32)
+    mesh.data.loops.foreach_get("vertex_index", loop_vertex_indices)
+
+    vertex_segments = np.full(len(mesh.data.vertices), -1, dtype=np.int32)
+    vertex_segments[loop_vertex_indices] = np.repeat(face_segments, loop_totals)
+
+    return vertex_segments
 
 
 def separate_array_meshes(mesh: bpy.types.Object):
     bpy.context.view_layer.objects.active = mesh
-    bpy.ops.object.mode_set(mode='EDIT')
+    call_operator(bpy.ops.object.mode_set, mode='EDIT')
 
     # Separate the submeshes into independent meshes
-    bpy.ops.mesh.separate(type='LOOSE')
-    bpy.ops.object.mode_set(mode='OBJECT')
+    call_operator(bpy.ops.mesh.separate, type='LOOSE')
+    call_operator(bpy.ops.object.mode_set, mode='OBJECT')
 
     # Ensure that no object is selected
     deselect_all()
+
+
+def set_origin(object: bpy.types.Object, center: str = 'MEDIAN'):
+    coordinates = get_object_coordinates(object)
+
+    if len(coordinates) == 0:
+        return
+
+    # Move the data so that the origin is at its center and compensate this with the location of the object
+    origin = Vector(calculate_origin(coordinates, center))
+    object.data.transform(Matrix.Translation(-origin))
+    object.location += object.matrix_basis.to_3x3() @ origin
+
+    update_matrix_world(object)
+
+
+def update_matrix_world(object: bpy.types.Object):
+    # Calculate the world matrix directly from the location, rotation and scale instead of updating the whole scene
+    if object.parent:
+        object.matrix_world = object.parent.matrix_world @ object.matrix_parent_inverse @ object.matrix_basis
+    else:
+        object.matrix_world = object.matrix_basis.copy()
+
+
+def write_mesh_data(
+        mesh: bpy.types.Mesh, coordinates: np.ndarray, loop_vertex_indices: np.ndarray,
+        loop_starts: np.ndarray, loop_totals: np.ndarray):
+    # Write all vertices and faces at once into the (empty) mesh
+    mesh.vertices.add(len(coordinates))
+    mesh.vertices.foreach_set("co", np.asarray(coordinates, dtype=np.float32).ravel())
+    mesh.loops.add(len(loop_vertex_indices))
+    mesh.loops.foreach_set("vertex_index", np.asarray(loop_vertex_indices, dtype=np.int32))
+    mesh.polygons.add(len(loop_starts))
+    mesh.polygons.foreach_set("loop_start", np.asarray(loop_starts, dtype=np.int32))
+    mesh.polygons.foreach_set("loop_total", np.asarray(loop_totals, dtype=np.int32))
+
+    mesh.update(calc_edges=True)
+
+
+def write_outside_attributes(mesh: bpy.types.Mesh, vertex_group_indices: dict):
+    # Mark the vertices of the outside vertex groups (by their names) in their boolean point attributes
+    for vertex_group_name, indices in vertex_group_indices.items():
+        if not vertex_group_name.startswith("Outside_"):
+            continue
+
+        attribute_name = OUTSIDE_ATTRIBUTE_NAME.format(vertex_group_name.partition("_")[2])
+        attribute = mesh.attributes.get(attribute_name) or mesh.attributes.new(attribute_name, 'BOOLEAN', 'POINT')
+        is_outside = np.zeros(len(mesh.vertices), dtype=bool)
+        is_outside[np.asarray(indices, dtype=np.int64)] = True
+        attribute.data.foreach_set("value", is_outside)
@@ -0,0 +1,92 @@
+import numpy as np
+
+
+def calculate_convex_difference(polygon: np.ndarray, clip_polygon: np.ndarray, threshold: float = 1e-9):
+    # Subtract a convex polygon from another convex polygon (both counter-clockwise),
+    # the result is a list of convex polygons (one for each edge of the clip polygon the polygon lies outside of)
+    pieces = []
+    remaining_polygon = polygon
+
+    for a, b in zip(clip_polygon, np.roll(clip_polygon, -1, axis=0)):
+        outside_polygon = clip_polygon_by_half_plane(remaining_polygon, a, b, keep_left=False)
+
+        if calculate_polygon_area(outside_polygon) > threshold:
+            pieces.append(outside_polygon)
+
+        remaining_polygon = clip_polygon_by_half_plane(remaining_polygon, a, b, keep_left=True)
+
+        if calculate_polygon_area(remaining_polygon) <= threshold:
+            break
+
+    return pieces
+
+
+def calculate_convex_hull(points: np.ndarray):
+    # Calculate the convex hull (counter-clockwise) of 2D points with the monotone chain algorithm
+    points = np.unique(np.round(np.asarray(points, dtype=np.float64)[:, :2], 6), axis=0)
+
+    if len(points) < 3:
+        return points
+
+    lower = []
+    for point in points:
+        while len(lower) >= 2 and calculate_cross_product(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+
+    upper = []
+    for point in points[::-1]:
+        while len(upper) >= 2 and calculate_cross_product(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+
+    return np.array(lower[:-1] + upper[:-1])
+
+
+def calculate_cross_product(origin: np.ndarray, a: np.ndarray, b: np.ndarray):
+    return (a[0] - origin[0]) * (b[1] - origin[1]) - (a[1] - origin[1]) * (b[0] - origin[0])
+
+
+def calculate_distances_to_polygon_edges(points: np.ndarray, polygon: np.ndarray):
+    # Calculate for each 2D point its distance to the closest edge of the polygon
+    a = polygon[np.newaxis]
+    edges = np.roll(polygon, -1, axis=0)[np.newaxis] - a
+    vectors = points[:, np.newaxis, :2] - a
+    edge_lengths = np.maximum((edges ** 2).sum(axis=2), 1e-18)
+    factors = np.clip((vectors * edges).sum(axis=2) / edge_lengths, 0.0, 1.0)
+
+    return np.linalg.norm(vectors - edges * factors[..., np.newaxis], axis=2).min(axis=1)
+
+
+def calculate_polygon_area(polygon: np.ndarray):
+    if len(polygon) < 3:
+        return 0.0
+
+    x, y = polygon[:, 0], polygon[:, 1]
+
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def clip_polygon_by_half_plane(polygon: np.ndarray, a: np.ndarray, b: np.ndarray, keep_left: bool = True):
+    # Keep the part of the polygon on the left (or right) side of the line through a and b (Sutherland-Hodgman)
+    if len(polygon) == 0:
+        return polygon
+
+    sides = (b[0] - a[0]) * (polygon[:, 1] - a[1]) - (b[1] - a[1]) * (polygon[:, 0] - a[0])
+
+    if not keep_left:
+        sides = -sides
+
+    clipped_polygon = []
+    for i in range(len(polygon)):
+        j = (i + 1) % len(polygon)
+
+        if sides[i] >= 0:
+            clipped_polygon.append(polygon[i])
+
+        # Add the intersection with the line if the edge crosses it
+        if (sides[i] >= 0) != (sides[j] >= 0):
+            factor = sides[i] / (sides[i] - sides[j])
+            clipped_polygon.append(polygon[i] + (polygon[j] - polygon[i]) * factor)
+
+    return np.array(clipped_polygon).reshape(-1, 2)
@@ -0,0 +1,69 @@
+import bpy
+
+from contextlib import contextmanager
+
+from roadGen.profiler import RG_Profiler
+
+
+# The profiler of the current generation run (None if no run is profiled)
+# and the profiler of the last finished run (e.g. to show its summary in the panel)
+profiler = None
+last_profiler = None
+
+
+def call_operator(operator, *args, **kwargs):
+    # Call an operator of Blender (e.g. bpy.ops.object.delete) and count the call as expensive call
+    count("bpy.ops calls")
+
+    return operator(*args, **kwargs)
+
+
+def count(name: str, number: int = 1):
+    # Count e.g. expensive calls of Blender (without an effect if no run is profiled)
+    if profiler is not None:
+        profiler.count(name, number)
+
+
+def count_depsgraph_update(scene: bpy.types.Scene, depsgraph: bpy.types.Depsgraph = None):
+    count("Depsgraph updates")
+
+
+def get_last_profiler():
+    return last_profiler
+
+
+@contextmanager
+def profile(name: str, category: str = "stage", **args):
+    # Measure a span of the current run (a span outside of a profiled run is only timed)
+    with (profiler if profiler is not None else RG_Profiler()).span(name, category, **args) as span:
+        yield span
+
+
+def start_profiler():
+    global profiler
+
+    profiler = RG_Profiler()
+
+    if count_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(count_depsgraph_update)
+
+    return profiler
+
+
+def stop_profiler(filepath: str = None):
+    global last_profiler, profiler
+
+    if profiler is None:
+        return None
+
+    if count_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(count_depsgraph_update)
+
+    profiler.stop()
+
+    if filepath:
+        profiler.export_chrome_trace(filepath)
+
+    last_profiler, profiler = profiler, None
+
+    return last_profiler
@@ -0,0 +1,138 @@
+import bpy
+import hashlib
+import numpy as np
+
+from roadGen.snapshot import RG_SplineSnapshot
+
+
+# Names of the custom properties that are used to find out which generated objects have to be regenerated
+FINGERPRINT_PROPERTY_NAME = "Fingerprint"
+SOURCE_CURVES_PROPERTY_NAME = "Source Curves"
+
+# Custom properties written by the RG_DataGenerator (and the graph) that influence the generated geometry
+ROAD_DATA_PROPERTY_NAMES = [
+    "Lane Width", "Left Lanes", "Right Lanes", "Left Turning Lane Distance", "Right Turning Lane Distance",
+    "Lamp Distance", "Left Dropped Kerbs", "Right Dropped Kerbs", "Major"]
+
+GENERATED_COLLECTION_NAMES = [
+    "Buildings", "Crossroad Curves", "Crossroads", "Curves", "Kerbs", "Line Meshes", "Lots", "Road Lanes", "Sidewalks",
+    "Street Lamps", "Street Name Signs", "Traffic Lights", "Traffic Signs"]
+
+
+def calculate_curve_fingerprint(curve: bpy.types.Object):
+    m = np.array(curve.matrix_world)
+    values = []
+
+    # Use the global coordinates of all points and handles so that applying the transform does not change the fingerprint
+    for spline in curve.data.splines:
+        snapshot = RG_SplineSnapshot(spline).transform(m)
+        coordinates = np.stack([snapshot.points, snapshot.handles_left, snapshot.handles_right], axis=1).reshape(-1, 3)
+        values.extend(tuple(co) for co in np.round(coordinates, 4).tolist())
+
+    for property_name in ROAD_DATA_PROPERTY_NAMES:
+        values.append((property_name, curve.get(property_name)))
+
+    return hashlib.sha1(repr(values).encode()).hexdigest()
+
+
+def delete_objects_with_source_curves(curve_names: set, collection_names: list = GENERATED_COLLECTION_NAMES):
+    for collection_name in collection_names:
+        collection = bpy.data.collections.get(collection_name)
+
+        if collection:
+            delete_objects_with_source_curves_in_collection(collection, curve_names)
+
+
+def delete_objects_with_source_curves_in_collection(collection: bpy.types.Collection, curve_names: set):
+    for subcollection in list(collection.children):
+        delete_objects_with_source_curves_in_collection(subcollection, curve_names)
+
+        # Delete subcollections (e.g. of the sidewalks) that are empty now
+        if not subcollection.objects and not subcollection.children:
+            bpy.data.collections.remove(subcollection)
+
+    for obj in list(collection.objects):
+        if get_source_curve_names(obj) & curve_names:
+            data = obj.data
+            bpy.data.objects.remove(obj, do_unlink=True)
+
+            # Delete also the mesh or curve data if nothing else uses it
+            if data and data.users == 0:
+                if isinstance(data, bpy.types.Mesh):
+                    bpy.data.meshes.remove(data)
+                elif isinstance(data, bpy.types.Curve):
+                    bpy.data.curves.remove(data)
+
+
+def get_changed_curves(curves: list):
+    changed_curves = []
+
+    for curve in curves:
+        # A curve has changed if its fingerprint differs or if its road has not been generated (or has been deleted)
+        road_exists = bpy.data.objects.get(f"{curve.name}_Left") and bpy.data.objects.get(f"{curve.name}_Right")
+
+        if not road_exists or curve.get(FINGERPRINT_PROPERTY_NAME) != calculate_curve_fingerprint(curve):
+            changed_curves.append(curve)
+
+    return changed_curves
+
+
+def get_source_curve_names(obj: bpy.types.Object):
+    source_curve_names = obj.get(SOURCE_CURVES_PROPERTY_NAME)
+
+    return set(source_curve_names.split(",")) if source_curve_names else set()
+
+
+def get_source_curve_names_in_collections(collection_names: list = GENERATED_COLLECTION_NAMES):
+    curve_names = set()
+
+    for collection_name in collection_names:
+        collection = bpy.data.collections.get(collection_name)
+
+        if collection:
+            for obj in collection.all_objects:
+                curve_names |= get_source_curve_names(obj)
+
+    return curve_names
+
+
+def get_removed_curve_dependencies(curve_names: set, collection_names: list = GENERATED_COLLECTION_NAMES):
+    # Find the curves that were generated together with curves that no longer exist (e.g. at the same crossroad)
+    removed_curve_names = get_source_curve_names_in_collections(collection_names) - curve_names
+    dependent_curve_names = set()
+
+    if removed_curve_names:
+        for collection_name in collection_names:
+            collection = bpy.data.collections.get(collection_name)
+
+            if collection:
+                for obj in collection.all_objects:
+                    source_curve_names = get_source_curve_names(obj)
+
+                    if source_curve_names & removed_curve_names:
+                        dependent_curve_names |= source_curve_names
+
+    return removed_curve_names, dependent_curve_names & curve_names
+
+
+def is_generated(obj: bpy.types.Object):
+    return SOURCE_CURVES_PROPERTY_NAME in obj
+
+
+def store_curve_fingerprints(curves: list):
+    for curve in curves:
+        curve[FINGERPRINT_PROPERTY_NAME] = calculate_curve_fingerprint(curve)
+
+
+def tag_object(obj: bpy.types.Object, curve_names: set):
+    # Remember the (source) curves the generated object depends on
+    if obj:
+        obj[SOURCE_CURVES_PROPERTY_NAME] = ",".join(sorted(curve_names))
+
+
+def tag_objects_like(objects: list, reference_object: bpy.types.Object):
+    curve_names = get_source_curve_names(reference_object)
+
+    if curve_names:
+        for obj in objects:
+            tag_object(obj, curve_names)